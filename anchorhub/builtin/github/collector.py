@@ -7,10 +7,11 @@ from anchorhub.collector import Collector
 from anchorhub.builtin.github.cstrategies import \
     MarkdownATXCollectorStrategy, MarkdownSetextCollectorStrategy
 import anchorhub.builtin.github.converter as converter
-import anchorhub.builtin.github.switches as ghswitches
+from anchorhub.builtin.github.regions import MarkdownRegionScanner
+import anchorhub.settings.default_settings as ds
 
 
-def make_github_markdown_collector(opts):
+def make_github_markdown_collector(opts, slug_cache_size=ds.SLUG_CACHE_SIZE):
     """
     Creates a Collector object used for parsing Markdown files with a GitHub
     style anchor transformation
@@ -18,16 +19,24 @@ def make_github_markdown_collector(opts):
     :param opts: Namespace object of options for the AnchorHub program.
     Usually created from command-line arguments. It must contain a
     'wrapper_regex' attribute
+    :param slug_cache_size: Number of header texts whose anchors are
+    remembered by the converter. If 0 or None, every header is converted
+    from scratch
     :return: a Collector object designed for collecting tag/anchor pairs from
     Markdown files using GitHub style anchors
     """
     assert hasattr(opts, 'wrapper_regex')
     atx = MarkdownATXCollectorStrategy(opts)
     setext = MarkdownSetextCollectorStrategy(opts)
-    code_block_switch = ghswitches.code_block_switch
+    # Finds code blocks, HTML comments, and front matter
+    scanner = MarkdownRegionScanner()
 
     strategies = [atx, setext]
-    switches = [code_block_switch]
 
-    return Collector(converter.create_anchor_from_header, strategies,
-                     switches=switches)
+    if slug_cache_size:
+        convert = converter.SlugConverter(slug_cache_size)
+    else:
+        convert = converter.create_anchor_from_header
+
+    return Collector(convert, strategies, scanner=scanner,
+                     encoding=getattr(opts, 'encoding', None))
@@ -3,28 +3,119 @@ File for GitHub style anchor generation
 """
 import re
 
+from anchorhub.lib.lrucache import LRUCache
+from anchorhub.lib.slugregistry import SlugRegistry
+import anchorhub.settings.default_settings as ds
+
+# Characters that aren't alphanumeric, underscores, hyphens, or spaces
+_invalid_regex = re.compile(r"[^\w\- ]+", re.UNICODE)
+
+# The same characters, restricted to ASCII, where \w is [a-zA-Z0-9_]
+_ascii_invalid = ''.join(chr(c) for c in range(128)
+                         if not (chr(c).isalnum() or chr(c) in '_- '))
+_ascii_invalid_table = dict((ord(c), None) for c in _ascii_invalid)
+
 
 def create_anchor_from_header(header, existing_anchors=None):
     """
     Creates GitHub style auto-generated anchor tags from header line strings
 
+    If the anchor has already been used, '-1', '-2', etc. is appended to it,
+    as GitHub does for duplicate headers.
+
     :param header: The portion of the line that should be converted
-    :param existing_anchors: A dictionary of AnchorHub tags to auto-generated
-        anchors
+    :param existing_anchors: A SlugRegistry of the anchors already used in
+        the file, which the new anchor is registered with. A dictionary of
+        AnchorHub tags to auto-generated anchors is also accepted, but has
+        to be scanned on every call
     :return: A string auto-generated anchor in the GitHub format
     """
-    # Strip white space on the left/right and make lower case
-    out = header.strip().lower()
+    return _register(create_slug(header), existing_anchors)
+
+
+def create_slug(header):
+    """
+    Converts header text into a GitHub style slug, without any suffix for
+    duplicate headers.
 
-    # Replace groups of white space with hyphens
-    out = re.sub(r"\s+", lambda x: "-", out, flags=re.UNICODE)
+    :param header: The portion of the line that should be converted
+    :return: A string slug in the GitHub format
+    """
+    # Strip white space, make lower case, and replace groups of white space
+    # with hyphens
+    out = '-'.join(header.lower().split())
 
     # Remove characters that aren't alphanumeric, hyphens, or spaces
-    out = re.sub(r"[^\w\- ]+", lambda x: "", out, flags=re.UNICODE)
-    if existing_anchors and out in existing_anchors.values():
-        i = 1
-        while (out + "-" + str(i)) in existing_anchors:
-            i += 1
-        return out + "-" + str(i)
+    if not _is_ascii(out):
+        return _invalid_regex.sub('', out)
+    elif isinstance(out, bytes):
+        # Python 2 str
+        return out.translate(None, _ascii_invalid)
     else:
-        return out
+        return out.translate(_ascii_invalid_table)
+
+
+class SlugConverter(object):
+    """
+    SlugConverter is a converter for the Collector that produces the same
+    anchors as create_anchor_from_header(), but remembers the slugs of
+    recently converted header text. Header text such as "Overview" or
+    "Parameters" often repeats thousands of times across a set of files.
+
+    The memo stores slugs before any suffix for duplicate headers is added,
+    so it can be shared between files.
+    """
+    def __init__(self, cache_size=ds.SLUG_CACHE_SIZE):
+        """
+        Initializer for SlugConverter.
+
+        :param cache_size: Maximum number of header texts to remember
+        """
+        self._memo = LRUCache(cache_size)
+
+    def __call__(self, header, existing_anchors=None):
+        """
+        Creates a GitHub style anchor from header. See
+        create_anchor_from_header().
+
+        :param header: The portion of the line that should be converted
+        :param existing_anchors: A SlugRegistry (or dictionary of tags to
+            anchors) of the anchors already used in the file
+        :return: A string auto-generated anchor in the GitHub format
+        """
+        slug = self._memo.get(header)
+        if slug is None:
+            slug = create_slug(header)
+            self._memo.put(header, slug)
+        return _register(slug, existing_anchors)
+
+
+def _register(slug, existing_anchors):
+    """
+    Registers slug with existing_anchors, and returns the unique anchor to
+    use for it.
+
+    :param slug: string slug created from a header
+    :param existing_anchors: A SlugRegistry, dictionary of tags to anchors,
+        or None
+    :return: string anchor
+    """
+    if existing_anchors is None:
+        return slug
+    if isinstance(existing_anchors, dict):
+        existing_anchors = SlugRegistry(existing_anchors.values())
+    return existing_anchors.register(slug)
+
+
+def _is_ascii(text):
+    """
+    Returns True if text only contains ASCII characters.
+
+    :param text: string to check
+    :return: True if every character in text is ASCII
+    """
+    try:
+        text.encode('ascii')
+    except UnicodeError:
+        return False
+    return True
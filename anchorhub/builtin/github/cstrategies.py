@@ -4,6 +4,7 @@ Concrete CollectorStrategy classes for the GitHub built-in module
 import re
 
 from anchorhub.collector import CollectorStrategy
+from anchorhub.builtin.github.headertags import HeaderTagParser
 import anchorhub.builtin.regex.markdown as mdrx
 
 
@@ -28,8 +29,7 @@ class MarkdownATXCollectorStrategy(CollectorStrategy):
         """
         self._open = opts.open
         self._close = opts.close
-        self._header_pattern = r"^#+ .+" + opts.wrapper_regex + r"\s*$"
-        self._regex = re.compile(self._header_pattern, re.UNICODE)
+        self._parser = HeaderTagParser(opts)
 
     def test(self, file_lines, index):
         """
@@ -41,7 +41,16 @@ class MarkdownATXCollectorStrategy(CollectorStrategy):
         :return: True if the line in file_lines at index is an ATX header
             with an AnchorHub tag declared. False otherwise
         """
-        return self._regex.match(file_lines[index])
+        return self._parser.find_atx_tag(file_lines[index]) is not None
+
+    def get_prefilter(self):
+        """
+        Every ATX header with an AnchorHub tag contains the wrapper's opening
+        pattern.
+
+        :return: The opening pattern of the AnchorHub tag wrapper
+        """
+        return self._open
 
     def get(self, file_lines, index):
         """
@@ -94,8 +103,7 @@ class MarkdownSetextCollectorStrategy(CollectorStrategy):
         """
         self._open = opts.open
         self._close = opts.close
-        self._header_pattern = opts.wrapper_regex + r"\s*$"
-        self._header_regex = re.compile(self._header_pattern, re.UNICODE)
+        self._parser = HeaderTagParser(opts)
         self._underline_regex = re.compile(mdrx.setext_underline)
 
     def test(self, file_lines, index):
@@ -123,12 +131,22 @@ class MarkdownSetextCollectorStrategy(CollectorStrategy):
         # Since it needs an underline, cannot be a header
         index_in_bounds = index < len(file_lines) - 1
 
-        if (index_in_bounds and self._header_regex.search(file_lines[index]) and
-                self._underline_regex.match(file_lines[index+1])):
+        if (index_in_bounds and
+                self._underline_regex.match(file_lines[index+1]) and
+                self._parser.find_tag(file_lines[index])):
             return True
         else:
             return False
 
+    def get_prefilter(self):
+        """
+        Every Setext header with an AnchorHub tag contains the wrapper's
+        opening pattern on its first line.
+
+        :return: The opening pattern of the AnchorHub tag wrapper
+        """
+        return self._open
+
     def get(self, file_lines, index):
         """
         Extract the specified AnchorHub tag, as well as the portion of the
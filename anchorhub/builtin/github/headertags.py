@@ -0,0 +1,99 @@
+"""
+Class file for HeaderTagParser
+"""
+import re
+
+
+class HeaderTagParser(object):
+    """
+    HeaderTagParser finds the AnchorHub tag at the end of a header line,
+    such as the '{#tag}' in:
+
+        # My awesome header {#tag}
+
+    A tag is described by opts.wrapper_regex (see
+    normalize_opts.add_wrapper_regex()), and only white space may come after
+    it. Rather than searching the line with a regular expression like
+    '^#+ .+' followed by the wrapper regex, which tries the wrapper at every
+    index of the line, the line is read from the right: first the closing
+    pattern at the end, then the opening patterns before it. The wrapper
+    regex is only tried at those opening patterns. Unless the opening
+    pattern contains a hash '#' character, only the last one can start a
+    tag, as a tag's name can't contain the opening pattern.
+
+    It is shared by the header CollectorStrategy and WriterStrategy classes.
+    """
+    def __init__(self, opts):
+        """
+        Initializer for HeaderTagParser.
+
+        :param opts: Namespace with the attributes 'open', 'close', and
+            'wrapper_regex', typically obtained through command-line argument
+            parsing
+        """
+        self._open = opts.open
+        self._close = opts.close
+        # Matches a tag at the end of a line, at a given index
+        self._tag_regex = re.compile(opts.wrapper_regex + r"\s*$", re.UNICODE)
+        self._one_start = '#' not in opts.open
+
+    def find_atx_tag(self, line):
+        """
+        Finds the tag in an ATX style header: a line starting with one or
+        more hash '#' characters and a space, followed by at least one
+        character of header text before the tag. If more than one tag could
+        end the line, the one that starts last is found.
+
+        :param line: string line of text
+        :return: A tuple (start, end) of the indices of the tag in line, or
+            None if the line isn't an ATX header with a tag
+        """
+        hashes = len(line) - len(line.lstrip('#'))
+        if not hashes or line[hashes:hashes + 1] != ' ':
+            return None
+        # The header text can't run onto another line
+        newline = line.find('\n', hashes)
+        return self._find(line, hashes + 2,
+                          newline if newline != -1 else len(line), False)
+
+    def find_tag(self, line):
+        """
+        Finds a tag that ends line, anywhere in the line. If more than one
+        tag could end the line, the one that starts first is found.
+
+        :param line: string line of text
+        :return: A tuple (start, end) of the indices of the tag in line, or
+            None if it doesn't end with a tag
+        """
+        return self._find(line, 0, len(line), True)
+
+    def _find(self, line, start, stop, first):
+        """
+        Finds a tag that ends line and starts between start and stop.
+
+        :param line: string line of text
+        :param start: Smallest index that the tag may start at
+        :param stop: Largest index that the tag may start at
+        :param first: If True, find the tag that starts first. Otherwise,
+            find the one that starts last
+        :return: A tuple (start, end) of the indices of the tag, or None
+        """
+        opn = self._open
+        close = self._close
+        end = len(line.rstrip())
+        close_start = end - len(close)
+        if close_start <= start or not line.startswith(close, close_start):
+            return None
+        match = self._tag_regex.match
+        tag = None
+        open_start = line.rfind(opn, start, close_start)
+        while open_start != -1:
+            if open_start <= stop and match(line, open_start):
+                tag = (open_start, end)
+                if not first:
+                    break
+            if self._one_start:
+                break
+            # The next opening pattern to the left, which may overlap
+            open_start = line.rfind(opn, start, open_start + len(opn) - 1)
+        return tag
@@ -0,0 +1,121 @@
+"""
+File for finding inline Markdown links that use an anchor tag
+"""
+import string
+
+# Characters that may be in a URL, and don't need a closer look
+_PLAIN = frozenset(string.ascii_letters + string.digits + '!"$%&\'*+,-./:;'
+                   '<=>?@\\^_`{|}~')
+
+
+def iter_inline_links(line):
+    """
+    Finds the inline links in line that use an anchor tag, such as:
+
+        [This is the link text](file.md#tag)
+
+    Finds the same links as the regular expression
+    anchorhub.builtin.regex.markdown.anchor_link, searched from left to
+    right, but reads line with a hand-written scanner instead. The link
+    text is found with str.find(), and the URL is read one character at a
+    time, keeping track of the first hash '#' character and the last '['
+    and '](' in it. Each character of line is read a fixed number of times,
+    however many brackets and parentheses the line has.
+
+    If the URL itself contains '](', the link text is taken to end at the
+    last one, so the URL starts after it. A link is skipped if there is no
+    tag left in the URL after that.
+
+    :param line: string line of text
+    :return: Generator of (text_span, url_span, hash_index) tuples, one for
+        each link. text_span is the (start, end) indices of the link text
+        inside of the square brackets. url_span is the (start, end) indices
+        of the URL, without the white space around it. hash_index is the
+        index of the first hash '#' character in the URL, which is followed
+        by the tag
+    """
+    length = len(line)
+    find = line.find
+    opening = find('[')
+    closing = -1
+    while opening != -1:
+        # The link text runs from the '[' to the next bracket, which must be
+        # a ']', and can't be empty
+        if closing <= opening:
+            closing = find(']', opening + 1)
+            if closing == -1:
+                return
+        next_opening = find('[', opening + 1)
+        if closing == opening + 1 or opening < next_opening < closing:
+            opening = next_opening
+            continue
+
+        # Then any white space, and an opening parenthesis '('
+        i = closing + 1
+        while i < length and line[i].isspace():
+            i += 1
+        if i == length or line[i] != '(':
+            opening = next_opening
+            continue
+        i += 1
+        while i < length and line[i].isspace():
+            i += 1
+
+        # The URL runs until white space or a closing parenthesis ')'
+        url_start = i
+        first_hash = -1  # First '#' in the URL
+        tag_hash = -1  # First '#' after the last '](' in the URL
+        inner_start = -1  # Index after the last '](' in the URL
+        last_open = -1  # Last '[' in the URL
+        next_close = -1  # First ']' after last_open
+        plain = _PLAIN
+        while i < length:
+            c = line[i]
+            if c in plain:
+                pass
+            elif c == ')' or c.isspace():
+                break
+            elif c == '#':
+                if first_hash == -1:
+                    first_hash = i
+                if tag_hash == -1:
+                    tag_hash = i
+            elif c == '[':
+                last_open = i
+                next_close = -1
+            elif c == ']':
+                if next_close == -1:
+                    next_close = i
+            elif c == '(' and i > url_start and line[i - 1] == ']':
+                inner_start = i + 1
+                tag_hash = -1
+            i += 1
+        url_end = i
+
+        # Then any white space, and a closing parenthesis ')'
+        while i < length and line[i].isspace():
+            i += 1
+        if i < length and line[i] == ')' and \
+                first_hash != -1 and first_hash < url_end - 1:
+            # A link, which needs at least one character after the '#'
+            if tag_hash != -1 and tag_hash < url_end - 1:
+                if inner_start != -1:
+                    url_start = inner_start
+                yield (opening + 1, closing), (url_start, url_end), tag_hash
+            if next_opening != -1 and next_opening <= i:
+                next_opening = find('[', i + 1)
+            opening = next_opening
+            continue
+
+        # Not a link. Any link that starts at a '[' inside of the URL fails
+        # the same way, as its URL ends where this one does, unless its text
+        # runs past the end of the URL: only the last '[' can start such a
+        # link, if the URL has no ']' after it that is followed by more than
+        # a '('
+        if last_open != -1 and (next_close == -1 or
+                                next_close >= url_end - 2):
+            opening = last_open
+        else:
+            if next_opening != -1 and next_opening < url_end:
+                next_opening = find('[', url_end)
+            opening = next_opening
@@ -0,0 +1,199 @@
+"""
+Class file for MarkdownRegionScanner
+"""
+import re
+from itertools import chain, islice
+
+import anchorhub.builtin.regex.markdown as mdrx
+from anchorhub.lib.linewindow import LineWindow
+from anchorhub.lib.rangeset import RangeSet
+
+# First characters of lines that may do more than continue the text: white
+# space, code fences, HTML comments, list items, and the end of a file
+# without a final newline. Any other line is handled without regexes
+_SPECIAL = frozenset(' \t\r\n`~<*+-0123456789') | frozenset([''])
+
+_fence_regex = re.compile(mdrx.code_fence)
+_list_item_regex = re.compile(mdrx.list_item)
+_front_matter_key_regex = re.compile(mdrx.front_matter_key, re.UNICODE)
+
+
+class MarkdownRegionScanner(object):
+    """
+    MarkdownRegionScanner finds the lines of a Markdown file that AnchorHub
+    should leave alone, in a single pass over the file:
+
+    * Fenced code blocks, opened by three or more backticks '`' or tildes
+    '~', and closed by a line of at least as many of the same character,
+    indented by less than four columns (or, inside of a list, less than
+    four columns more than the opening fence). Both fence lines are
+    ignored. A block that is never closed runs to the end of the file
+    * Indented code blocks: lines indented by four or more spaces (or a tab)
+    after a blank line. Lines indented inside of a list continue the list
+    instead, so nested list items aren't mistaken for code
+    * HTML comments that start a line, up to the line containing '-->'
+    * YAML front matter: a first line of '---' followed by 'key:' lines and
+    indented lines, up to a closing '---' or '...' line. Without a closing
+    line, the lines are scanned as Markdown
+
+    Each line is classified as it is read, so the scanner works with files
+    that are streamed through a LineWindow. It keeps no state between
+    calls to scan(), and can be shared.
+    """
+    def scan(self, lines):
+        """
+        Pairs each line with whether it should be ignored.
+
+        :param lines: List of strings (or a LineWindow), with each entry
+            corresponding to a single line in a text file. Only iterated
+            over once
+        :return: Generator of (line, is_ignored) tuples, one for each line
+        """
+        special = _SPECIAL
+        after_blank = True  # Whether an indented code block may start
+        in_list = False
+        in_code = False  # In an indented code block
+
+        # Each kind of region is read by an inner loop, which takes lines
+        # from the same iterator as the main loop
+        it = iter(lines)
+        for line in it:
+            length = line.rstrip() == '---' and _front_matter_length(lines)
+            if length:
+                yield line, True
+                for line in islice(it, length - 1):
+                    yield line, True
+            else:
+                it = chain([line], it)
+            break
+
+        for line in it:
+            if line[:1] not in special:
+                # Plain text at the start of the line
+                if after_blank:
+                    # A paragraph after a blank line ends any list
+                    in_list = False
+                    after_blank = False
+                in_code = False
+                yield line, False
+                # The lines after it only need their first character
+                # checked, until one may do more than continue the text
+                for line in it:
+                    if line[:1] in special:
+                        break
+                    yield line, False
+                else:
+                    return
+            if line == '\n' or not line.strip():
+                # Blank line
+                after_blank = True
+                yield line, in_code
+                continue
+            body = line.lstrip(' \t')
+            indent = len(line) - len(body)
+            if indent and '\t' in line[:indent]:
+                indent = _get_indent(line, indent)
+            if indent >= 4:
+                if in_code or (after_blank and not in_list):
+                    in_code = True
+                    yield line, True
+                    continue
+            else:
+                in_code = False
+            c = body[0]
+            if c in '`~' and (indent < 4 or in_list):
+                m = _fence_regex.match(body)
+                if m and not (c == '`' and '`' in m.group('info')):
+                    # Fenced code block
+                    fence = m.group('fence')
+                    limit = indent + 4 if in_list else 4  # Closing indent
+                    yield line, True
+                    for line in it:
+                        yield line, True
+                        body = line.lstrip(' \t')
+                        tail = body.rstrip()
+                        if tail.startswith(fence) and \
+                                not tail.strip(fence[0]):
+                            width = len(line) - len(body)
+                            if _get_indent(line, width) < limit:
+                                break
+                    after_blank = True
+                    continue
+            elif c == '<' and indent < 4 and body.startswith('<!--'):
+                # HTML comment
+                yield line, True
+                if '-->' not in body[4:]:
+                    for line in it:
+                        yield line, True
+                        if '-->' in line:
+                            break
+                after_blank = True
+                continue
+            if c in '*+-':
+                # A bullet must be followed by white space
+                is_item = len(body) == 1 or body[1].isspace()
+            else:
+                is_item = c.isdigit() and _list_item_regex.match(body)
+            if is_item:
+                in_list = True
+            elif indent == 0 and after_blank:
+                in_list = False
+            after_blank = False
+            yield line, False
+
+    def find_ignored(self, lines):
+        """
+        Finds the lines that should be ignored.
+
+        :param lines: List of strings, usually the lines in a text file
+        :return: A RangeSet of the ignored line indices
+        """
+        ignored = RangeSet()
+        for i, (line, is_ignored) in enumerate(self.scan(lines)):
+            if is_ignored:
+                ignored.add(i)
+        return ignored
+
+
+def _get_indent(line, length):
+    """
+    Returns the width of the indentation at the start of line, with tabs
+    stopping every four columns.
+
+    :param line: string line of text
+    :param length: number of white space characters at the start of line
+    :return: Number of columns of indentation
+    """
+    prefix = line[:length]
+    if '\t' in prefix:
+        return len(prefix.expandtabs(4))
+    return length
+
+
+def _front_matter_length(lines):
+    """
+    Finds the YAML front matter that starts at the first line of lines, which
+    must be '---'. Only called while the first line is being scanned, and
+    reads ahead until the front matter is closed, so a LineWindow holds the
+    front matter in memory.
+
+    :param lines: List of strings (or a LineWindow)
+    :return: Number of lines in the front matter, including both of its
+        delimiters, or 0 if it is never closed, or a line that is neither a
+        YAML key nor indented comes before the closing delimiter
+    """
+    is_window = isinstance(lines, LineWindow)
+    i = 1
+    while True:
+        if is_window:
+            lines.fill(i)
+        try:
+            line = lines[i]
+        except IndexError:
+            return 0
+        if line.rstrip() in ('---', '...'):
+            return i + 1
+        if not (line[:1] in ' \t' and line.strip() or
+                _front_matter_key_regex.match(line)):
+            return 0
+        i += 1
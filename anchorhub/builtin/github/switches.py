@@ -38,5 +38,14 @@ def code_block_end_test(lines, index):
     return code_end.match(lines[index])
 
 
-code_block_switch = ArmedCheckSwitch(on_check=code_block_start_test,
-                                     off_check=code_block_end_test)
+def make_code_block_switch():
+    """
+    Creates a switch that is on for the lines inside of Markdown code blocks.
+    Switches keep the state of the file being parsed, so every Collector and
+    Writer needs a switch of its own.
+
+    :return: A new ArmedCheckSwitch for code blocks
+    """
+    return ArmedCheckSwitch(on_check=code_block_start_test,
+                            off_check=code_block_end_test,
+                            prefix='```')
@@ -1,8 +1,11 @@
+# -*- coding: utf-8 -*-
 """
 Tests for GitHub style anchor generator
 """
 
-from anchorhub.builtin.github.converter import create_anchor_from_header
+from anchorhub.builtin.github.converter import create_anchor_from_header, \
+    SlugConverter
+from anchorhub.lib.slugregistry import SlugRegistry
 
 
 def test_github_converter():
@@ -33,3 +36,33 @@ def test_github_converter():
 
     g = create_anchor_from_header("THIS HEADER## HAS ## HASHTAG###SS")
     assert g == "this-header-has--hashtagss"
+
+
+def test_github_converter_duplicates():
+    """
+    Built-in: Test GitHub anchor generator with duplicate headers
+    """
+    slugs = SlugRegistry()
+    anchors = [create_anchor_from_header("Header", slugs) for i in range(4)]
+    assert anchors == ["header", "header-1", "header-2", "header-3"]
+
+    # Dictionaries of tags to anchors are still accepted
+    existing = {"a": "header", "b": "header-1"}
+    assert create_anchor_from_header("Header", existing) == "header-2"
+
+
+def test_slug_converter():
+    """
+    Built-in: Test that SlugConverter matches create_anchor_from_header
+    """
+    convert = SlugConverter(2)
+    headers = ["Overview", u"Café & Crème", "Overview",
+               "  Tabs\tand   spaces!  ", "Overview", u"Über été"]
+    slugs = SlugRegistry()
+    expected_slugs = SlugRegistry()
+    for h in headers:
+        assert convert(h, slugs) == create_anchor_from_header(h,
+                                                              expected_slugs)
+    assert convert("Overview") == "overview"
+    assert create_anchor_from_header(u"Café & Crème") == \
+        u"café--crème"
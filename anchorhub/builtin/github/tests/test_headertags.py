@@ -0,0 +1,79 @@
+"""
+Tests for the GitHub builtin HeaderTagParser
+"""
+import random
+import re
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.builtin.github.headertags import HeaderTagParser
+
+
+def _get_opts(wrapper):
+    """
+    :param wrapper: string wrapper, such as '{ }'
+    :return: Normalized options that use wrapper
+    """
+    return normalize_opts.normalize(cmdparse.parse_args(['.', '-w', wrapper]))
+
+
+def _regex_spans(opts, line):
+    """
+    Finds the tag in line with the regular expressions the header strategies
+    used before HeaderTagParser.
+
+    :return: A tuple of the (start, end) spans of the tag in line, as an ATX
+        header and as the first line of a Setext header. Either may be None
+    """
+    atx = re.match(r"^#+ .+(?P<tag>" + opts.wrapper_regex + r")\s*$", line,
+                   re.UNICODE)
+    setext = re.search(r"(?P<tag>" + opts.wrapper_regex + r")\s*$", line,
+                       re.UNICODE)
+    return (atx.span('tag') if atx else None,
+            setext.span('tag') if setext else None)
+
+
+def test_find_atx_tag():
+    """
+    GitHub Built-in: Test HeaderTagParser.find_atx_tag()
+    """
+    parser = HeaderTagParser(_get_opts('{ }'))
+    assert parser.find_atx_tag("# Header {#tag}\n") == (9, 15)
+    assert parser.find_atx_tag("### Header {  #tag }  \n") == (11, 20)
+    # The last tag in the line is found
+    assert parser.find_atx_tag("# A {#a} B {#b}\n") == (11, 15)
+    assert parser.find_atx_tag("# {#tag}\n") is None
+    assert parser.find_atx_tag("#Header {#tag}\n") is None
+    assert parser.find_atx_tag("# Header {#tag} text\n") is None
+    assert parser.find_atx_tag("# Header {#} {#a{b}\n") is None
+
+
+def test_find_tag():
+    """
+    GitHub Built-in: Test HeaderTagParser.find_tag()
+    """
+    parser = HeaderTagParser(_get_opts('[[ ]]'))
+    assert parser.find_tag("Header [[#tag]]\n") == (7, 15)
+    assert parser.find_tag("[[#tag]]") == (0, 8)
+    assert parser.find_tag("Header [[#ta]]g]]\n") is None
+    assert parser.find_tag("Header [[ # tag ]]\n") is None
+
+
+def test_header_tag_parser_matches_regex():
+    """
+    GitHub Built-in: Test that HeaderTagParser finds the same tags as the
+    wrapper regular expression, in random lines made of pieces of headers
+    and tags
+    """
+    rand = random.Random(25)
+    for wrapper in ['{ }', '[[ ]]', '<!-- -->', '{# #}', '## ##', '( )']:
+        opts = _get_opts(wrapper)
+        parser = HeaderTagParser(opts)
+        pieces = [opts.open, opts.close, '#', '# ', ' ', '\t', 'a', 'tag',
+                  '{', '}', '-', '\n']
+        for n in range(2000):
+            line = ''.join(rand.choice(pieces)
+                           for k in range(rand.randint(0, 12)))
+            atx, setext = _regex_spans(opts, line)
+            assert parser.find_atx_tag(line) == atx, (wrapper, line)
+            assert parser.find_tag(line) == setext, (wrapper, line)
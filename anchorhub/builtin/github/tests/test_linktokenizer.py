@@ -0,0 +1,188 @@
+"""
+Tests for the GitHub builtin inline link tokenizer
+"""
+import io
+import os
+import random
+import re
+
+import anchorhub.builtin.regex.markdown as mdrx
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.builtin.github.linktokenizer import iter_inline_links
+from anchorhub.builtin.github.wstrategies import \
+    MarkdownInlineLinkWriterStrategy
+from anchorhub.compatibility import get_path_separator
+from anchorhub.util.getanchorhubpath import get_anchorhub_path
+
+sep = get_path_separator()
+
+# Pieces that are inserted into lines to make them harder to read
+_pieces = ['[', ']', '(', ')', '#', ' ', '\t', '](', '[a]', '(#b)', 'x.md',
+           '%20', u'\xe9', 'tag', '\n']
+
+
+class _BaselineInlineLinkWriterStrategy(MarkdownInlineLinkWriterStrategy):
+    """
+    A frozen copy of MarkdownInlineLinkWriterStrategy as it was before it
+    used iter_inline_links(), which searched lines with the anchor_link
+    regular expression. Only the file keys still come from the LinkResolver
+    of the current strategy.
+    """
+    def __init__(self, opts, label=None, resolver=None):
+        super(_BaselineInlineLinkWriterStrategy, self).__init__(
+            opts, label, resolver)
+        self._link_regex = re.compile(mdrx.anchor_link, re.UNICODE)
+
+    def test(self, current_modified_line, file_lines=None, index=None):
+        return list(self._link_regex.finditer(current_modified_line))
+
+    def modify(self, current_modified_line, anchors, file_path,
+               file_lines=None, index=None, match=None):
+        changed_line = []  # Will be built up piece by piece as we find links
+
+        # Used to keep track of what we've parsed in current_modified_line
+        last_index = 0
+
+        for tag_start, tag_end, file_key, tag in \
+                self._parse_links(current_modified_line, file_path, match):
+            if self._file_has_tag_anchor_keypair(anchors, file_key, tag):
+                # The tag used on this link was specified as an AnchorHub tag
+                # Add existing text up to (and including) the # mark
+                changed_line.append(current_modified_line[last_index:
+                                                          tag_start])
+                # Add the the generated anchor in place of the tag
+                changed_line.append(anchors[file_key][tag])
+                last_index = tag_end
+        # Add the end of the line back on
+        changed_line.append(current_modified_line[last_index:])
+        return ''.join(changed_line)
+
+    def _parse_links(self, current_modified_line, file_path, matches=None):
+        if matches is None:
+            matches = self._link_regex.finditer(current_modified_line)
+        links = []
+        for m in matches:
+            url_start, url_end = m.span('url')
+            # If the URL itself contains '](', the link text is taken to end
+            # at the last one
+            inner_start = current_modified_line.rfind('](', url_start, url_end)
+            if inner_start != -1:
+                url_start = inner_start + 2
+            hash_index = current_modified_line.find('#', url_start, url_end)
+            link_path = current_modified_line[url_start:hash_index].strip()
+            tag = current_modified_line[hash_index + 1:url_end].rstrip()
+            if link_path == "":
+                # Link points to tag in this file
+                file_key = file_path
+            else:
+                file_key = self._get_file_key(file_path, link_path)
+            links.append((hash_index + 1, hash_index + 1 + len(tag),
+                          file_key, tag))
+        return links
+
+
+def _tokenized_links(line):
+    """
+    :param line: string line of text
+    :return: List of (text, link_path, tag, hash_index) tuples found with
+        iter_inline_links()
+    """
+    return [(line[text_start:text_end], line[url_start:hash_index],
+             line[hash_index + 1:url_end], hash_index)
+            for (text_start, text_end), (url_start, url_end), hash_index
+            in iter_inline_links(line)]
+
+
+def _get_sample_lines():
+    """
+    :return: List of the lines of every Markdown file in sample/
+    """
+    sample = get_anchorhub_path() + sep + '..' + sep + 'sample'
+    lines = []
+    for root, dirs, files in os.walk(sample):
+        for name in sorted(files):
+            if name.endswith('.md'):
+                with io.open(os.path.join(root, name),
+                             encoding='utf-8') as f:
+                    lines.extend(f.readlines())
+    return lines
+
+
+def test_iter_inline_links():
+    """
+    GitHub Built-in: Test iter_inline_links()
+    """
+    line = "See [a](#x) and [b c]  ( file.md#y-z ) [no](tag) [d](#)"
+    assert list(iter_inline_links(line)) == [
+        ((5, 6), (8, 10), 8), ((17, 20), (25, 36), 32)]
+    assert _tokenized_links(line) == [('a', '', 'x', 8),
+                                      ('b c', 'file.md', 'y-z', 32)]
+    # The URL starts after the last '](' in it
+    assert _tokenized_links("[a](x[b](#t)") == [('a', '', 't', 9)]
+    assert _tokenized_links("[](#t) [[a]](#t) [a](#t") == []
+    # Links can start inside of the URL of something that isn't a link
+    assert _tokenized_links("[a](x[b c](#t)") == [('b c', '', 't', 11)]
+    assert _tokenized_links("[x)]([a](\t(#b)") == [('a', '(', 'b', 11)]
+    # A URL that ends with its only '#' has no tag, so it isn't a link
+    assert _tokenized_links("[a](x[b#) ](#t)") == [('b#) ', '', 't', 12)]
+
+
+def _check_same_output(baseline, strategy, line, file_path, rand):
+    """
+    Checks that strategy finds the same links in line as baseline, and
+    modifies the line the same way, with anchors for a random subset of the
+    links.
+
+    :param baseline: _BaselineInlineLinkWriterStrategy
+    :param strategy: MarkdownInlineLinkWriterStrategy
+    :param line: string line of text
+    :param file_path: string file path of the file containing the line
+    :param rand: random.Random used to pick the links that have anchors
+    """
+    # The baseline made up a tag for links with no tag left after the last
+    # '](' in the URL, which now are skipped
+    links = [[file_key, tag] for tag_start, tag_end, file_key, tag
+             in baseline._parse_links(line, file_path)
+             if tag and line[tag_start - 1:tag_start] == '#']
+    assert strategy.get_links(line, file_path) == links, line
+    anchors = {}
+    for file_key, tag in links:
+        if rand.random() < 0.7:
+            anchors.setdefault(file_key, {})[tag] = 'anchor-%d' % len(anchors)
+    expected = baseline.modify(line, anchors, file_path,
+                               match=baseline.test(line))
+    assert strategy.modify(line, anchors, file_path) == expected, line
+    match = strategy.test(line)
+    if match:
+        assert strategy.modify(line, anchors, file_path,
+                               match=match) == expected, line
+
+
+def test_inline_link_strategy_matches_baseline():
+    """
+    GitHub Built-in: Test that MarkdownInlineLinkWriterStrategy, which uses
+    iter_inline_links(), gives the same output as it did with the
+    anchor_link regular expression, on lines from sample/, on those lines
+    with random brackets, parentheses, and hashes added to them, and on
+    random lines
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.']))
+    baseline = _BaselineInlineLinkWriterStrategy(opts)
+    strategy = MarkdownInlineLinkWriterStrategy(opts)
+    file_path = os.path.abspath('file.md')
+    rand = random.Random(24)
+    lines = _get_sample_lines()
+    assert lines
+    for line in lines:
+        _check_same_output(baseline, strategy, line, file_path, rand)
+    for n in range(3000):
+        line = list(rand.choice(lines))
+        for k in range(rand.randint(1, 8)):
+            line.insert(rand.randint(0, len(line)), rand.choice(_pieces))
+        line = ''.join(line)
+        _check_same_output(baseline, strategy, line, file_path, rand)
+    for n in range(3000):
+        line = ''.join(rand.choice(_pieces)
+                       for k in range(rand.randint(0, 20)))
+        _check_same_output(baseline, strategy, line, file_path, rand)
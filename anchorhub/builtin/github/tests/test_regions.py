@@ -0,0 +1,106 @@
+"""
+Tests for the GitHub builtin MarkdownRegionScanner
+"""
+from anchorhub.builtin.github.regions import MarkdownRegionScanner
+from anchorhub.lib.linewindow import LineWindow
+
+
+def _ignored(text):
+    """
+    Scans text with a MarkdownRegionScanner
+
+    :param text: string Markdown text
+    :return: List of the 1-based numbers of the ignored lines
+    """
+    lines = text.splitlines(True)
+    ignored = MarkdownRegionScanner().find_ignored(lines)
+    numbers = [i + 1 for i in range(len(lines)) if i in ignored]
+    # Streaming the lines must give the same result
+    streamed = [i + 1 for i, (line, is_ignored) in enumerate(
+        MarkdownRegionScanner().scan(LineWindow(iter(lines))))
+        if is_ignored]
+    assert streamed == numbers
+    return numbers
+
+
+def test_fenced_code_blocks():
+    """
+    GitHub Built-in: Test MarkdownRegionScanner with backtick and tilde
+    fences
+    """
+    assert _ignored("a\n```python\n# x {#t}\n```\nb\n") == [2, 3, 4]
+    assert _ignored("a\n~~~\n[x](#t)\n~~~\nb\n") == [2, 3, 4]
+    # Fences may be indented by up to three spaces
+    assert _ignored("a\n   ```\nx\n   ```\nb\n") == [2, 3, 4]
+    # A block that is never closed runs to the end of the file
+    assert _ignored("a\n```\nx\ny") == [2, 3, 4]
+
+
+def test_fence_matching():
+    """
+    GitHub Built-in: Test that a fence is only closed by a line of the same
+    character that is at least as long
+    """
+    text = "````\n```\n~~~~\n``` not a close\n`````\nb\n"
+    assert _ignored(text) == [1, 2, 3, 4, 5]
+    assert _ignored("~~~\n```\n~~\n~~~~\nb\n") == [1, 2, 3, 4]
+    # Backticks in the info string mean the line is inline code
+    assert _ignored("```inline``` code\nb\n") == []
+    # A fence indented by four or more columns is code inside of the block
+    text = "```\ncode\n        ```\n# Real {#real}\n```\nb\n"
+    assert _ignored(text) == [1, 2, 3, 4, 5]
+    assert _ignored("~~~\n\t~~~\n~~~\nb\n") == [1, 2, 3]
+    # Inside of a list, the closing fence is indented like the opening one
+    text = "* a\n\n    ```\n    # x {#t}\n    ```\nb\n"
+    assert _ignored(text) == [3, 4, 5]
+
+
+def test_indented_code_blocks():
+    """
+    GitHub Built-in: Test MarkdownRegionScanner with indented code blocks
+    """
+    text = "a\n\n    # x {#t}\n\tcode\n\n    more\nb\n"
+    assert _ignored(text) == [3, 4, 5, 6]
+    # Indented lines can't interrupt a paragraph
+    assert _ignored("a\n    b\n") == []
+
+
+def test_indented_lists():
+    """
+    GitHub Built-in: Test that lines indented inside of a list aren't
+    mistaken for code
+    """
+    text = "* a\n\t* [b](#t)\n\n    * [c](#t)\n1. d\n\n    e\n"
+    assert _ignored(text) == []
+    # A paragraph after a blank line ends the list
+    assert _ignored("* a\n\ntext\n\n    code\n") == [5]
+
+
+def test_html_comments():
+    """
+    GitHub Built-in: Test MarkdownRegionScanner with HTML comments
+    """
+    assert _ignored("a\n<!-- [x](#t) -->\nb\n") == [2]
+    assert _ignored("a\n<!--\n# x {#t}\n-->\nb\n") == [2, 3, 4]
+    # Comments in the middle of a line don't hide the rest of it
+    assert _ignored("a <!-- x -->\n[b](#t)\n") == []
+
+
+def test_front_matter():
+    """
+    GitHub Built-in: Test MarkdownRegionScanner with YAML front matter
+    """
+    assert _ignored("---\ntitle: x\n---\n# a {#t}\n") == [1, 2, 3]
+    assert _ignored("---\n---\na\n") == [1, 2]
+    # A horizontal rule at the start of a file isn't front matter
+    assert _ignored("---\n# a {#t}\n---\n") == []
+    # Front matter is only found at the start of a file
+    assert _ignored("a\n---\ntitle: x\n---\n") == []
+    text = "---\ntitle: x\ntags:\n  - a\n...\n# a {#t}\n"
+    assert _ignored(text) == [1, 2, 3, 4, 5]
+    # Without a closing delimiter, the lines are scanned as Markdown
+    text = ("---\nNote: this guide is a draft\n\n# Intro {#intro}\n\n"
+            "See [intro](#intro)\n")
+    assert _ignored(text) == []
+    assert _ignored("---\ntitle: x\n") == []
+    assert _ignored("---\ntitle: x\n```\n---\n```\n") == [3, 4, 5]
@@ -0,0 +1,105 @@
+"""
+Tests for GitHub builtin writer strategies
+"""
+
+import anchorhub.builtin.github.wstrategies as wstrategies
+import anchorhub.cmdparse as cmdparse
+from anchorhub.lib.linkresolver import LinkResolver
+import anchorhub.normalization.normalize_opts as normalize_opts
+
+
+def _modify_both_ways(s, line, anchors, file_path, lines=None, index=None):
+    """
+    Runs s.modify() on line with and without the match returned by s.test(),
+    and checks that both give the same result
+
+    :return: The modified line
+    """
+    match = s.test(line, lines, index)
+    assert match
+    with_match = s.modify(line, anchors, file_path, match=match)
+    assert with_match == s.modify(line, anchors, file_path)
+    return with_match
+
+
+def test_atx_writer_strategy():
+    """
+    GitHub Built-in: Test MarkdownATXWriterStrategy
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.']))
+    s = wstrategies.MarkdownATXWriterStrategy(opts)
+
+    assert not s.test("# No tag here\n")
+    assert _modify_both_ways(s, "## A {header} {#tag}\n", {}, '/a.md') == \
+        "## A {header}\n"
+
+
+def test_setext_writer_strategy():
+    """
+    GitHub Built-in: Test MarkdownSetextWriterStrategy
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.']))
+    s = wstrategies.MarkdownSetextWriterStrategy(opts)
+
+    lines = ["Header {#tag}\n", "======\n", "Last line {#tag}\n"]
+    assert _modify_both_ways(s, lines[0], {}, '/a.md', lines, 0) == \
+        "Header\n"
+    assert not s.test(lines[1], lines, 1)
+    assert not s.test(lines[2], lines, 2)
+
+
+def test_inline_link_writer_strategy():
+    """
+    GitHub Built-in: Test MarkdownInlineLinkWriterStrategy
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.']))
+    s = wstrategies.MarkdownInlineLinkWriterStrategy(opts)
+    anchors = {'/a.md': {'tag': 'anchor'}, '/b.md': {'other': 'b-anchor'}}
+
+    assert not s.test("No [links](file.md) here\n")
+    assert _modify_both_ways(
+        s, "[x](#tag), [y](b.md#other) and [z](#nope)\n", anchors,
+        '/a.md') == "[x](#anchor), [y](b.md#b-anchor) and [z](#nope)\n"
+    # White space inside of the parentheses is kept
+    assert _modify_both_ways(s, "[x](  #tag  )\n", anchors, '/a.md') == \
+        "[x](  #anchor  )\n"
+    assert s.get_links("[x](#tag) [y](b.md#other)\n", '/a.md') == \
+        [['/a.md', 'tag'], ['/b.md', 'other']]
+
+
+def test_reference_link_writer_strategy():
+    """
+    GitHub Built-in: Test MarkdownReferenceLinkWriterStrategy
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.']))
+    s = wstrategies.MarkdownReferenceLinkWriterStrategy(opts)
+    anchors = {'/a.md': {'tag': 'anchor'}}
+
+    assert _modify_both_ways(s, '[ref]: #tag "Title"\n', anchors,
+                             '/a.md') == '[ref]: #anchor "Title"\n'
+    # Labels may contain spaces, or look like the URL
+    assert _modify_both_ways(s, '[my ref]: #tag\n', anchors, '/a.md') == \
+        '[my ref]: #anchor\n'
+    assert _modify_both_ways(s, '[#tag]: #tag\n', anchors, '/a.md') == \
+        '[#tag]: #anchor\n'
+
+
+def test_link_strategies_share_resolver():
+    """
+    GitHub Built-in: Test that the link writer strategies resolve encoded
+    and relative links with a shared LinkResolver
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.']))
+    resolver = LinkResolver()
+    inline = wstrategies.MarkdownInlineLinkWriterStrategy(
+        opts, resolver=resolver)
+    ref = wstrategies.MarkdownReferenceLinkWriterStrategy(
+        opts, resolver=resolver)
+    anchors = {'/docs/my file.md': {'tag': 'anchor'}}
+
+    assert _modify_both_ways(inline, "[x](./my%20file.md#tag)\n", anchors,
+                             '/docs/a.md') == "[x](./my%20file.md#anchor)\n"
+    assert _modify_both_ways(ref, "[r]: ../docs/my%20file.md#tag\n",
+                             anchors, '/docs/b.md') == \
+        "[r]: ../docs/my%20file.md#anchor\n"
+    assert len(resolver._memo) == 2
@@ -6,7 +6,8 @@ from anchorhub.writer import Writer
 from anchorhub.builtin.github.wstrategies import MarkdownATXWriterStrategy, \
     MarkdownSetextWriterStrategy, MarkdownInlineLinkWriterStrategy, \
     MarkdownReferenceLinkWriterStrategy
-import anchorhub.builtin.github.switches as ghswitches
+from anchorhub.builtin.github.regions import MarkdownRegionScanner
+from anchorhub.lib.linkresolver import LinkResolver
 
 
 def make_github_markdown_writer(opts):
@@ -34,11 +35,15 @@ def make_github_markdown_writer(opts):
     assert hasattr(opts, 'wrapper_regex')
     atx = MarkdownATXWriterStrategy(opts, 'ATX headers')
     setext = MarkdownSetextWriterStrategy(opts, 'Setext headers')
-    inline = MarkdownInlineLinkWriterStrategy(opts, 'inline links')
-    ref = MarkdownReferenceLinkWriterStrategy(opts, 'reference links')
-    code_block_switch = ghswitches.code_block_switch
+    # Both link strategies share resolved link paths
+    resolver = LinkResolver()
+    inline = MarkdownInlineLinkWriterStrategy(opts, 'inline links',
+                                              resolver=resolver)
+    ref = MarkdownReferenceLinkWriterStrategy(opts, 'reference links',
+                                              resolver=resolver)
+    # Finds code blocks, HTML comments, and front matter
+    scanner = MarkdownRegionScanner()
 
     strategies = [atx, setext, inline, ref]
-    switches = [code_block_switch]
 
-    return Writer(strategies, switches=switches)
\ No newline at end of file
+    return Writer(strategies, scanner=scanner)
\ No newline at end of file
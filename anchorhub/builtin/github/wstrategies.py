@@ -2,10 +2,11 @@
 Concrete WriteStrategy classes for the GitHub built-in module
 """
 import re
-import os
-import os.path
 
 import anchorhub.builtin.regex.markdown as mdrx
+from anchorhub.builtin.github.headertags import HeaderTagParser
+from anchorhub.builtin.github.linktokenizer import iter_inline_links
+from anchorhub.lib.linkresolver import LinkResolver
 from anchorhub.writer import WriterStrategy
 
 
@@ -25,6 +26,10 @@ What this strategy does is convert a header from this:
     Into this:
         # My awesome header
     """
+    accepts_match = True
+    # Only headers that MarkdownATXCollectorStrategy found a tag on change
+    collected_lines_only = True
+
     def __init__(self, opts, label=None):
         """
         Initializes the object to utilize the AnchorHub tag wrapper
@@ -36,8 +41,7 @@ What this strategy does is convert a header from this:
         super(MarkdownATXWriterStrategy, self).__init__(opts, label)
         self._open = opts.open
         self._close = opts.close
-        self._header_pattern = r"^#+ .+" + opts.wrapper_regex + r"\s*$"
-        self._regex = re.compile(self._header_pattern, re.UNICODE)
+        self._parser = HeaderTagParser(opts)
         self._label = label
 
     def test(self, current_modified_line, file_lines=None, index=None):
@@ -50,13 +54,23 @@ What this strategy does is convert a header from this:
             WriterStrategy objects
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the current line
-        :return: True if current_modified_line is an ATX header with an
-        AnchorHub tag declared. False otherwise
+        :return: A tuple (start, end) of the indices of the AnchorHub tag if
+        current_modified_line is an ATX header with a tag declared, which can
+        be passed to modify(). None otherwise
+        """
+        return self._parser.find_atx_tag(current_modified_line)
+
+    def get_prefilter(self):
+        """
+        Every ATX header with an AnchorHub tag contains the wrapper's opening
+        pattern.
+
+        :return: The opening pattern of the AnchorHub tag wrapper
         """
-        return self._regex.match(current_modified_line)
+        return self._open
 
     def modify(self, current_modified_line, anchors, file_path, file_lines=None,
-               index=None):
+               index=None, match=None):
         """
         Removes the trailing AnchorHub tag from the end of the line being
         examined.
@@ -71,10 +85,15 @@ What this strategy does is convert a header from this:
             file being examined by this WriterStrategy
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the current line
+        :param match: Optional tag indices returned by test() for
+            current_modified_line
         :return: string. A version of current_modified_line that has the
             AnchorHub tag removed from the end of it
         """
-        open_wrapper_index = current_modified_line.rfind(self._open)
+        if match is not None:
+            open_wrapper_index = match[0]
+        else:
+            open_wrapper_index = current_modified_line.rfind(self._open)
         # '- 1' removes trailing space. May want to modify to completely
         # strip whitespace at the end, instead of only working for a single
         # space
@@ -109,6 +128,10 @@ class MarkdownSetextWriterStrategy(WriterStrategy):
 
         This header has an AnchorHub tag!
     """
+    accepts_match = True
+    # Only headers that MarkdownSetextCollectorStrategy found a tag on change
+    collected_lines_only = True
+
     def __init__(self, opts, label=None):
         """
         Initializes the WriterStrategy to utilize the AnchorHub tag wrapper
@@ -120,8 +143,7 @@ class MarkdownSetextWriterStrategy(WriterStrategy):
         super(MarkdownSetextWriterStrategy, self).__init__(opts, label)
         self._open = opts.open
         self._close = opts.close
-        self._header_pattern = opts.wrapper_regex + r"\s*$"
-        self._header_regex = re.compile(self._header_pattern, re.UNICODE)
+        self._parser = HeaderTagParser(opts)
         self._underline_regex = re.compile(mdrx.setext_underline, re.UNICODE)
 
     def test(self, current_modified_line, file_lines=None, index=None):
@@ -137,8 +159,9 @@ class MarkdownSetextWriterStrategy(WriterStrategy):
             WriterStrategy objects
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the current line:
-        :return: True if current_modified_line is a Setext header with an
-        AnchorHub tag declared. False otherwise
+        :return: A tuple (start, end) of the indices of the AnchorHub tag if
+        current_modified_line is a Setext header with a tag declared, which
+        can be passed to modify(). False otherwise
         """
         if file_lines is None:
             raise ValueError("file_lines list must be provided to test() method"
@@ -151,15 +174,22 @@ class MarkdownSetextWriterStrategy(WriterStrategy):
         # Since it needs an underline, cannot be a header
         index_in_bounds = index < len(file_lines) - 1
 
-        if (self._header_regex.search(current_modified_line) and
-                self._underline_regex.match(file_lines[index+1]) and
-                index_in_bounds):
-            return True
-        else:
+        if not index_in_bounds or \
+                not self._underline_regex.match(file_lines[index+1]):
             return False
+        return self._parser.find_tag(current_modified_line) or False
+
+    def get_prefilter(self):
+        """
+        Every Setext header with an AnchorHub tag contains the wrapper's
+        opening pattern.
+
+        :return: The opening pattern of the AnchorHub tag wrapper
+        """
+        return self._open
 
     def modify(self, current_modified_line, anchors, file_path, file_lines=None,
-               index=None):
+               index=None, match=None):
         """
 
         :param current_modified_line: string representing the the line at
@@ -172,10 +202,15 @@ class MarkdownSetextWriterStrategy(WriterStrategy):
             file being examined by this WriterStrategy
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the current line
+        :param match: Optional tag indices returned by test() for
+            current_modified_line
         :return: string. A version of current_modified_line that has the
             AnchorHub tag removed from the end of it
         """
-        open_wrapper_index = current_modified_line.rfind(self._open)
+        if match is not None:
+            open_wrapper_index = match[0]
+        else:
+            open_wrapper_index = current_modified_line.rfind(self._open)
         # '- 1' removes trailing space. May want to modify to completely
         # strip whitespace at the end, instead of only working for a single
         # space
@@ -194,16 +229,19 @@ class MarkdownInlineLinkWriterStrategy(WriterStrategy):
     then the above would be converted to this:
         [This is the visible text](url#this-is-my-header)
     """
-    def __init__(self, opts, label=None):
+    accepts_match = True
+
+    def __init__(self, opts, label=None, resolver=None):
         """
         Initializes object regex objects.
 
         :param opts: AnchorHub options namespace, usually created from
             command-line arguments
+        :param resolver: Optional LinkResolver used to find the files that
+            links point to. It can be shared with other strategies
         """
         super(MarkdownInlineLinkWriterStrategy, self).__init__(opts, label)
-        self._link_regex = re.compile(mdrx.anchor_link, re.UNICODE)
-        self._link_start_regex = re.compile(mdrx.anchor_link_start, re.UNICODE)
+        self._resolver = resolver if resolver is not None else LinkResolver()
 
     def test(self, current_modified_line, file_lines=None, index=None):
         """
@@ -215,13 +253,23 @@ class MarkdownInlineLinkWriterStrategy(WriterStrategy):
             WriterStrategy objects
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the current line
-        :return: True if the current_modified_line contains one or more
-            inline anchor links. False otherwise
+        :return: A list of link tuples from iter_inline_links(), one for each
+            inline anchor link in current_modified_line, which can be passed
+            to modify(). The list is empty (and therefore False) if there are
+            no links
         """
-        return self._link_regex.search(current_modified_line)
+        return list(iter_inline_links(current_modified_line))
+
+    def get_prefilter(self):
+        """
+        Every inline link that uses an anchor contains a hash '#' character.
+
+        :return: The hash '#' character
+        """
+        return '#'
 
     def modify(self, current_modified_line, anchors, file_path, file_lines=None,
-               index=None):
+               index=None, match=None):
         """
         Replace all AnchorHub tag-using inline links in this line and edit
         them to use
@@ -236,52 +284,73 @@ class MarkdownInlineLinkWriterStrategy(WriterStrategy):
             file being examined by this WriterStrategy
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the current line
+        :param match: Optional list of link tuples returned by test() for
+            current_modified_line
         :return: string. current_modified_line with all inline links that use
             AnchorHub tags replaced with their associated generated anchors
         """
-        changed_line = ""  # Will be built up piece by piece as we find links
-        links = self._get_link_indices(current_modified_line)
+        changed_line = []  # Will be built up piece by piece as we find links
 
         # Used to keep track of what we've parsed in current_modified_line
         last_index = 0
 
-        for link in links:
-            # These indices are relative to current_modified_line
-            link_start_index = link[0]  # Start index in current_modified_line
-            link_end_index = link[1]  # End index in current_modified_line
-            link_text = current_modified_line[link_start_index:link_end_index]
+        for tag_start, tag_end, file_key, tag in \
+                self._parse_links(current_modified_line, file_path, match):
+            if self._file_has_tag_anchor_keypair(anchors, file_key, tag):
+                # The tag used on this link was specified as an AnchorHub tag
+                # Add existing text up to (and including) the # mark
+                changed_line.append(current_modified_line[last_index:
+                                                          tag_start])
+                # Add the the generated anchor in place of the tag
+                changed_line.append(anchors[file_key][tag])
+                last_index = tag_end
+        # Add the end of the line back on
+        changed_line.append(current_modified_line[last_index:])
+        return ''.join(changed_line)
+
+    def get_links(self, current_modified_line, file_path, match=None):
+        """
+        Returns the file and tag that each inline anchor link in
+        current_modified_line points to.
 
-            # This index is relative to link_text
-            url_start = self._link_start_regex.search(link_text).end()
-            url_text = link_text[url_start:len(link_text) - 1].strip()
+        :param current_modified_line: string representing the the line at
+            file_lines[index] _after_ any previous modifications from other
+            WriterStrategy objects
+        :param file_path: string representing the file_path of the current
+            file being examined by this WriterStrategy
+        :param match: Optional list of link tuples returned by test()
+        :return: List of [file_key, tag] pairs, one for each link
+        """
+        return [[link[2], link[3]] for link in
+                self._parse_links(current_modified_line, file_path, match)]
 
-            # This index is relative to url_text
-            hash_index = url_text.find('#')  # index of '#' in url_text
+    def _parse_links(self, current_modified_line, file_path, links=None):
+        """
+        Splits each inline anchor link in current_modified_line into its
+        parts.
 
-            link_path = url_text[:hash_index]
-            tag = url_text[hash_index + 1:]
+        :param current_modified_line: The line being examined for links
+        :param file_path: string file path of the file containing the line
+        :param links: Optional list of link tuples for current_modified_line,
+            from iter_inline_links(). If None, the line is searched again
+        :return: A list containing a tuple for each link, of the form
+            (tag_start, tag_end, file_key, tag). tag_start and tag_end are
+            the indices of the tag (after the '#') in current_modified_line
+        """
+        if links is None:
+            links = iter_inline_links(current_modified_line)
+        parts = []
+        for text_span, (url_start, url_end), hash_index in links:
+            link_path = current_modified_line[url_start:hash_index]
+            tag = current_modified_line[hash_index + 1:url_end]
 
             if link_path == "":
                 # Link points to tag in this file
                 file_key = file_path
             else:
                 file_key = self._get_file_key(file_path, link_path)
-
-            if self._file_has_tag_anchor_keypair(anchors, file_key, tag):
-                # The tag used on this link was specified as an AnchorHub tag
-                # Add existing text up to (and including) the # mark
-                changed_line += current_modified_line[last_index:
-                                                      link_start_index +
-                                                      url_start + hash_index+1]
-                # Add the the generated anchor, plus a closing parenthesis
-                changed_line += anchors[file_key][tag] + ')'
-            else:
-                # The tag used is a normal anchor tag: don't change it
-                changed_line += current_modified_line[last_index:link_end_index]
-            last_index = link_end_index
-        # Add the end of the line back on
-        changed_line += current_modified_line[last_index:]
-        return changed_line
+            parts.append((hash_index + 1, url_end, file_key, tag))
+        return parts
 
     def _get_file_key(self, file_path, link_path):
         """
@@ -295,28 +364,7 @@ class MarkdownInlineLinkWriterStrategy(WriterStrategy):
             absolute path for
         :return: the absolute path of link_path relative to file_path
         """
-        if os.path.isabs(link_path):
-            return link_path
-        else:
-            file_dir = os.path.dirname(file_path)
-            joined_path = os.path.join(file_dir, link_path)
-            return os.path.abspath(joined_path)
-
-
-    def _get_link_indices(self, current_modified_line):
-        """
-        Get a list of tuples containing start and end indices of inline
-        anchor links
-
-        :param current_modified_line: The line being examined for links
-        :return: A list containing tuples of the form (start, end),
-        the starting and ending indices of inline anchors links.
-        """
-        # List of (start_index, end_index) tuples for each link in the line
-        links = []
-        for m in self._link_regex.finditer(current_modified_line):
-            links.append(m.span())
-        return links
+        return self._resolver.resolve(file_path, link_path)
 
     def _file_has_tag_anchor_keypair(self, anchors, file_key, tag):
         """
@@ -354,14 +402,19 @@ class MarkdownReferenceLinkWriterStrategy(WriterStrategy):
     see whether or not the optional title line is valid Markdown (i.e. is
     enclosed in one of double-quotes, single-quotes, or parentheses)
     """
-    def __init__(self, opts, label=None):
+    accepts_match = True
+
+    def __init__(self, opts, label=None, resolver=None):
         """
 
         :param opts:
+        :param resolver: Optional LinkResolver used to find the files that
+            links point to. It can be shared with other strategies
         :return:
         """
         super(MarkdownReferenceLinkWriterStrategy, self).__init__(opts, label)
         self._ref_regex = re.compile(mdrx.ref_link, re.UNICODE)
+        self._resolver = resolver if resolver is not None else LinkResolver()
 
     def test(self, current_modified_line, file_lines=None, index=None):
         """
@@ -373,8 +426,16 @@ class MarkdownReferenceLinkWriterStrategy(WriterStrategy):
         """
         return self._ref_regex.match(current_modified_line)
 
+    def get_prefilter(self):
+        """
+        Every reference link that uses an anchor contains a hash '#' character.
+
+        :return: The hash '#' character
+        """
+        return '#'
+
     def modify(self, current_modified_line, anchors, file_path,
-               file_lines=None, index=None):
+               file_lines=None, index=None, match=None):
         """
 
         :param current_modified_line:
@@ -382,20 +443,11 @@ class MarkdownReferenceLinkWriterStrategy(WriterStrategy):
         :param file_path:
         :param file_lines:
         :param index:
+        :param match: Optional match object returned by test()
         :return:
         """
-        url_text = current_modified_line.split()[1]
-        url_start_index = current_modified_line.find(url_text)
-        url_end_index = url_start_index + len(url_text)
-        hash_index = url_text.find('#')  # index of '#' in url_text
-        link_path = url_text[:hash_index]
-        tag = url_text[hash_index + 1:]
-
-        if link_path == "":
-            # Link points to tag in this file
-            file_key = file_path
-        else:
-            file_key = self._get_file_key(file_path, link_path)
+        url_start_index, url_end_index, hash_index, file_key, tag = \
+            self._parse_link(current_modified_line, file_path, match)
 
         if self._file_has_tag_anchor_keypair(anchors, file_key, tag):
             # The tag used on this link was specified as an AnchorHub tag
@@ -412,6 +464,46 @@ class MarkdownReferenceLinkWriterStrategy(WriterStrategy):
             # The tag used is not an AnchorHub tag: don't change it
             return current_modified_line
 
+    def get_links(self, current_modified_line, file_path, match=None):
+        """
+        Returns the file and tag that the reference link in
+        current_modified_line points to.
+
+        :param current_modified_line: The reference link line
+        :param file_path: string file path of the file containing the line
+        :param match: Optional match object returned by test()
+        :return: List containing a single [file_key, tag] pair
+        """
+        link = self._parse_link(current_modified_line, file_path, match)
+        return [[link[3], link[4]]]
+
+    def _parse_link(self, current_modified_line, file_path, match=None):
+        """
+        Splits the reference link in current_modified_line into its parts.
+
+        :param current_modified_line: The reference link line
+        :param file_path: string file path of the file containing the line
+        :param match: Optional match object for current_modified_line. If
+            None, the line is matched again
+        :return: A tuple of the form (url_start, url_end, hash_index,
+            file_key, tag). url_start and url_end are indices in
+            current_modified_line, and hash_index is relative to url_start
+        """
+        if match is None:
+            match = self._ref_regex.match(current_modified_line)
+        url_start_index, url_end_index = match.span('url')
+        url_text = current_modified_line[url_start_index:url_end_index]
+        hash_index = url_text.find('#')  # index of '#' in url_text
+        link_path = url_text[:hash_index]
+        tag = url_text[hash_index + 1:]
+
+        if link_path == "":
+            # Link points to tag in this file
+            file_key = file_path
+        else:
+            file_key = self._get_file_key(file_path, link_path)
+        return url_start_index, url_end_index, hash_index, file_key, tag
+
     def _get_file_key(self, file_path, link_path):
         """
 
@@ -419,12 +511,7 @@ class MarkdownReferenceLinkWriterStrategy(WriterStrategy):
         :param link_path:
         :return:
         """
-        if os.path.isabs(link_path):
-            return link_path
-        else:
-            file_dir = os.path.dirname(file_path)
-            joined_path = os.path.join(file_dir, link_path)
-            return os.path.abspath(joined_path)
+        return self._resolver.resolve(file_path, link_path)
 
     def _file_has_tag_anchor_keypair(self, anchors, file_key, tag):
         """
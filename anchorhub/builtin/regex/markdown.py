@@ -7,6 +7,9 @@ ref_link
 setext_underline
 code_block_start
 code_block_end
+code_fence
+list_item
+front_matter_key
 
 Markdown:
 https://daringfireball.net/projects/markdown/syntax
@@ -38,6 +41,9 @@ Examples of matching patterns:
     [White space in the middle works]     (#tag)
     [Also white space inside the parenthesis will work](    #likethis    )
 
+Everything inside of the parentheses (numbers 4-8) is captured in the group
+named 'url', so that the URL can be found without searching the link again.
+
 Note: while the repeated 'any white space' commands may make the final regex
 pattern more obnoxious, it makes its use more flexible. AnchorHub strives to
 not enforce an opinion on syntax- if it renders as Markdown, it should work
@@ -48,11 +54,13 @@ anchor_link += r"[^\[\]]+"  # at least one non-square bracket char
 anchor_link += r"\]"        # closing square bracket
 anchor_link += r"\s*"       # any amount of whitespace
 anchor_link += r"\("        # an opening parenthesis '('
+anchor_link += r"(?P<url>"  # Start of 'url' group
 anchor_link += r"\s*"       # any amount of whitespace
 anchor_link += r"[^\s\)]*"  # Optional string of non-whitespace, non-')' chars
 anchor_link += r"#"         # A hash '#' character
 anchor_link += r"[^\s\)]+"  # A string of non-whitespace, non-')' chars
 anchor_link += r"\s*"       # any amount of whitespace
+anchor_link += r")"         # End of 'url' group
 anchor_link += r"\)"        # A closing parenthesis ')'
 
 
@@ -81,7 +89,8 @@ Has the following specification:
 
 Number 5 above corresponds to the URL/path portion of the link, such as
 'anotherfile.md'. Number 7 above corresponds to the anchor tag, which may or
-may not be an AnchorHub tag.
+may not be an AnchorHub tag. Numbers 5-7 are captured in the group named
+'url'.
 
 Examples of matching patterns:
 
@@ -92,9 +101,11 @@ ref_link = r"^[ \t]{0,3}"   # Start of line, followed by up to 3 spaces/tabs
 ref_link += r"\[.+\]"       # square brackets containing at least one char
 ref_link += r":"            # A colon ':' character
 ref_link += r"\s+"          # One or more whitespace characters
+ref_link += r"(?P<url>"     # Start of 'url' group
 ref_link += r"\S*"          # Optional string of non-whitespace characters
 ref_link += r"#"            # Hash '#' character
 ref_link += r"\S+"          # One or more non-whitespace characters
+ref_link += r")"            # End of 'url' group
 
 
 """
@@ -154,3 +165,71 @@ code_block_end += r"```"    # Series of 3 backticks
 code_block_end += r"\s*"    # Any amount of whitespace
 code_block_end += r"$"      # End of line
 
+
+"""
+code_fence: Opening line of a fenced code block
+
+Fenced code blocks start with a line of at least three backticks '`' or at
+least three tildes '~', and end with a line of the same character that is at
+least as long. This pattern is matched against a line after its indentation
+has been removed.
+
+1. A start of line
+2. Followed by a series of 3 or more backticks XOR 3 or more tildes,
+        captured in the group named 'fence'
+3. Followed by anything (the 'info string', usually the name of the
+        language), captured in the group named 'info'
+
+For example, both of these start a code block:
+
+    ```python
+    ~~~~
+
+Note: an info string after backticks may not contain a backtick, as
+"```code```" is inline code. That check is left to the caller.
+"""
+code_fence = r"^"                         # Start of line
+code_fence += r"(?P<fence>`{3,}|~{3,})"   # 3 or more backticks XOR tildes
+code_fence += r"(?P<info>.*)"             # Anything, such as a language
+
+
+"""
+list_item: First line of a Markdown list item
+
+This pattern is matched against a line after its indentation has been
+removed.
+
+1. A start of line
+2. Followed by a bullet: an asterisk '*', plus sign '+', or hyphen '-', XOR
+        1-9 digits followed by a period '.' or closing parenthesis ')'
+3. Followed by white space or an end of line
+
+It will match these:
+    * An item
+    2. Another item
+"""
+list_item = r"^"                          # Start of line
+list_item += r"(?:[*+-]|\d{1,9}[.)])"     # Bullet or number
+list_item += r"(?:\s|$)"                  # White space or end of line
+
+
+"""
+front_matter_key: A line of YAML front matter that sets a key
+
+Used to tell YAML front matter at the start of a file (between two lines of
+three hyphens '---') apart from a file that starts with a horizontal rule.
+
+1. A start of line
+2. Followed by a word character, quote, or hyphen
+3. Followed by any characters except a colon ':'
+4. Followed by a colon ':'
+5. Followed by white space or an end of line
+
+For example:
+    title: My page
+"""
+front_matter_key = r"^"                   # Start of line
+front_matter_key += r"[\w\"'-]"           # Word character, quote, or hyphen
+front_matter_key += r"[^:]*"              # Anything except a colon
+front_matter_key += r":"                  # A colon ':' character
+front_matter_key += r"(?:\s|$)"           # White space or end of line
@@ -0,0 +1,156 @@
+"""
+Class file for the AnchorHub AnchorCache
+"""
+import json
+import os
+
+from anchorhub.lib.outputfile import OutputFile, sync_directories
+from anchorhub.util.hashfile import hash_file
+
+# Version of the cached entries, part of the settings that a cache file must
+# match. Bump it whenever the way tags and anchors are collected changes, so
+# entries collected the old way are thrown away
+CACHE_FORMAT = 1
+
+
+class AnchorCache(object):
+    """
+    AnchorCache stores the AnchorHub tags, generated anchors, and duplicate
+    tags collected from each file in a JSON file on disk, so that files that
+    have not changed since the previous run do not need to be parsed again.
+
+    Entries are keyed by file path, and are only reused if the file's size
+    matches and either its modification time or the hash of its contents
+    match as well. The whole cache is thrown away if it was created by a
+    different version of AnchorHub or with different settings.
+
+    Entries may also record the anchors each file links to, and whether the
+    file was modified when it was last written. These are used to decide
+    which files need to be written again (see anchorhub.dependencies).
+    """
+    def __init__(self, cache_path, settings=None):
+        """
+        Initializer for AnchorCache.
+
+        :param cache_path: string file path of the cache file
+        :param settings: Dictionary of values (such as CACHE_FORMAT, the
+            AnchorHub version, the wrapper, and the encoding) that change the
+            collected anchors. A cache file created with different settings
+            is ignored
+        """
+        self._cache_path = cache_path
+        self._settings = settings if settings is not None else {}
+        self._entries = {}      # Entries loaded from the cache file
+        self._new_entries = {}  # Entries for files seen during this run
+        self._unchanged = set()  # Files whose entries were reused
+        self.hits = 0
+
+    def load(self):
+        """
+        Loads the cache file from disk. Missing, unreadable, or outdated
+        cache files are treated as empty caches.
+        """
+        self._entries = {}
+        try:
+            with open(self._cache_path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+        if isinstance(data, dict) and \
+                data.get('settings') == self._settings and \
+                isinstance(data.get('files'), dict):
+            self._entries = data['files']
+
+    def save(self, fsync=False):
+        """
+        Writes the entries for every file seen during this run to the cache
+        file. Entries for files that were not seen are dropped. The cache
+        file is replaced in a single step, so an interrupted save leaves the
+        previous cache in place.
+
+        :param fsync: If True, flush the cache file to disk before replacing
+            the previous one
+        """
+        data = {'settings': self._settings, 'files': self._new_entries}
+        output = OutputFile(self._cache_path, fsync=fsync)
+        output.write(json.dumps(data))
+        output.commit()
+        if fsync:
+            sync_directories([self._cache_path])
+
+    def get(self, file_path):
+        """
+        Returns the cached anchors and duplicate tags for file_path, if the
+        file has not changed since they were cached.
+
+        :param file_path: string file path of the file to look up
+        :return: A tuple of (file_anchors, file_duplicates), or None if
+            there is no up-to-date entry for the file
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        stat = os.stat(file_path)
+        if entry['size'] != stat.st_size:
+            return None
+        if entry['mtime'] != stat.st_mtime:
+            # Modification time changed, but the contents may not have
+            if entry['hash'] != hash_file(file_path):
+                return None
+            entry = dict(entry, mtime=stat.st_mtime)
+        self._new_entries[file_path] = entry
+        self._unchanged.add(file_path)
+        self.hits += 1
+        return entry['anchors'], [tuple(d) for d in entry['duplicates']]
+
+    def put(self, file_path, file_anchors, file_duplicates):
+        """
+        Stores the anchors and duplicate tags collected from file_path.
+
+        :param file_path: string file path the values were collected from
+        :param file_anchors: Dictionary mapping AnchorHub tags to generated
+            anchors for the file
+        :param file_duplicates: List containing an entry for each duplicate
+            tag found in the file
+        """
+        stat = os.stat(file_path)
+        self._new_entries[file_path] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'hash': hash_file(file_path),
+            'anchors': file_anchors,
+            'duplicates': file_duplicates
+        }
+
+    def set_links(self, file_path, links, modified):
+        """
+        Records the links used by file_path after it has been written.
+        put() or get() must have been called for file_path first.
+
+        :param file_path: string file path of the written file
+        :param links: List of [file_key, tag] pairs for the anchors that
+            file_path links to
+        :param modified: True if file_path had modifications and was
+            written out
+        """
+        self._new_entries[file_path] = dict(self._new_entries[file_path],
+                                            links=links, modified=modified)
+
+    def get_previous(self, file_path):
+        """
+        Returns the entry for file_path from the cache file as it was loaded,
+        whether or not the file has changed since.
+
+        :param file_path: string file path to look up
+        :return: Dictionary entry for the file, or None if it had no entry
+        """
+        return self._entries.get(file_path)
+
+    def is_unchanged(self, file_path):
+        """
+        Returns True if file_path had an up-to-date entry during this run.
+
+        :param file_path: string file path to look up
+        :return: True if get() returned the cached values for file_path
+        """
+        return file_path in self._unchanged
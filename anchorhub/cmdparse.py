@@ -46,6 +46,43 @@ def parse_args(args=None):
                         help=ds.ARGPARSE_RECURSIVE['help'],
                         action='store_true',
                         dest='recursive')
+    parser.add_argument('--exclude',
+                        help=ds.ARGPARSE_EXCLUDE['help'],
+                        action='append',
+                        metavar='PATTERN')
+    parser.add_argument('--gitignore',
+                        help=ds.ARGPARSE_GITIGNORE['help'],
+                        action='store_true')
+    parser.add_argument('-j', '--jobs',
+                        help=ds.ARGPARSE_JOBS['help'],
+                        type=int,
+                        default=ds.ARGPARSE_JOBS['default'])
+    parser.add_argument('--read-once',
+                        help=ds.ARGPARSE_READ_ONCE['help'],
+                        action='store_true')
+    parser.add_argument('--encoding',
+                        help=ds.ARGPARSE_ENCODING['help'])
+    parser.add_argument('--fsync',
+                        help=ds.ARGPARSE_FSYNC['help'],
+                        action='store_true')
+    parser.add_argument('--skip-unchanged',
+                        help=ds.ARGPARSE_SKIP_UNCHANGED['help'],
+                        action='store_true')
+    parser.add_argument('--mirror',
+                        help=ds.ARGPARSE_MIRROR['help'],
+                        nargs='?',
+                        const='copy',
+                        choices=ds.ARGPARSE_MIRROR['choices'],
+                        metavar='MODE')
+    parser.add_argument('--stream',
+                        help=ds.ARGPARSE_STREAM['help'],
+                        action='store_true')
+    parser.add_argument('--cache',
+                        help=ds.ARGPARSE_CACHE['help'],
+                        action='store_true')
+    parser.add_argument('--incremental',
+                        help=ds.ARGPARSE_INCREMENTAL['help'],
+                        action='store_true')
     parser.add_argument('--version',
                         action='version',
                         version=ah.__version__)
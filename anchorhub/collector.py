@@ -1,9 +1,21 @@
 """
 Class file for the AnchorHub Collector
 """
+import multiprocessing
 from abc import ABCMeta, abstractmethod
+from itertools import repeat
 
+try:
+    from itertools import izip as zip
+except ImportError:
+    # Python 3, where zip() is already lazy
+    pass
+
+from anchorhub.document import Document
+from anchorhub.lib.armedcheckswitch import get_switch_prefixes
 from anchorhub.lib.filetolist import FileToList
+from anchorhub.lib.linewindow import LineWindow
+from anchorhub.lib.slugregistry import SlugRegistry
 
 
 class Collector(object):
@@ -14,9 +26,8 @@ class Collector(object):
     tag/anchor key-value pairs. It accomplishes this using three types of
     user-defined concrete objects:
 
-    * A converter, which takes in a string input and list of
-    existing tag/generated anchor key-value pairs, and outputs a converted
-    anchor.
+    * A converter, which takes in a string input and a SlugRegistry of the
+    anchors already generated for the file, and outputs a converted anchor.
     * An ordered list of collection strategies that take in a list of
     strings, containing each line in a text file, and an index pointing to
     the line currently being examined. The strategy uses that information for
@@ -28,30 +39,89 @@ class Collector(object):
     * An ordered list of ArmedCheckSwitches, which detect whether a line
     marks a section of text that should not be parsed and whether a line
     marks the end of such a section.
+    * Optionally, a region scanner, which finds all of the lines that should
+    not be parsed in a single pass. See MarkdownRegionScanner.
     """
-    def __init__(self, converter, strategies, switches=None):
+    def __init__(self, converter, strategies, switches=None, encoding=None,
+                 scanner=None):
         """
         The initializer for Collector. Takes in concrete classes in order to
         collect AnchorHub tag/anchor key-value pairs.
 
         :param converter: function that takes in a string line of text and
-        list of existing tag/anchor pairs, and outputs a generated anchor string
+        a SlugRegistry of the anchors already generated for the file,
+        and outputs a generated anchor string
         :param strategies: a list of concrete CollectorStrategy objects
         :param switches: a list of ArmedCheckSwitches
+        :param encoding: Name of the encoding to read files with. Defaults to
+        the system's encoding
+        :param scanner: Optional object with a scan(lines) method, which
+        yields a (line, is_ignored) tuple for each line. Lines are ignored if
+        the scanner or any switch says so
         """
         self._converter = converter
         self._strategies = strategies
-        self._switches = switches
+        self._switches = switches if switches is not None else []
+        self._scanner = scanner
+        self._encoding = encoding
         self._anchors = {}
         self._duplicate_tags = {}
+        self._documents = {}
+        self._ignored = {}  # Maps file paths to RangeSets of ignored lines
+        self._file_paths = []
+        self._line_count = 0  # Lines examined by collect_document()
+        self._screened_count = 0  # Lines skipped by the strategy prefilters
         self.has_duplicates = False
 
-    def collect(self, file_paths):
+        # Substrings a line must contain for each strategy to match it
+        self._prefilters = [s.get_prefilter() for s in strategies]
+        self._literals = tuple(set(p for p in self._prefilters
+                                   if p is not None))
+        # If every strategy has a prefilter, lines containing none of them
+        # can skip the strategies entirely
+        self._all_prefiltered = None not in self._prefilters
+
+        # Prefixes a line must start with to change any switch
+        self._switch_prefixes = get_switch_prefixes(self._switches)
+
+    def collect(self, file_paths, workers=1, keep_documents=False,
+                cache=None):
         """
         Takes in a list of string file_paths, and parses through them using
         the converter, strategies, and switches defined at object
         initialization.
 
+        If workers is greater than 1, the files are spread across a pool of
+        worker processes. Each file is still parsed independently, and the
+        results are merged back in the same order as file_paths, so the
+        output is identical to a serial run.
+
+        If keep_documents is True, a Document is kept for every file so that
+        it can be written without reading it again. The Documents
+        are available from get_documents() after collection.
+
+        If an AnchorCache is provided, files that have not changed since they
+        were cached are not parsed again, and every parsed file is added to
+        the cache. No Document is kept for files taken from the cache.
+
+        The ranges of lines ignored by the switches in every parsed file are
+        available from get_ignored_ranges(), so that the Writer doesn't need
+        to run the switches again.
+
+        file_paths may be any iterable, such as a generator that is still
+        discovering files. It is only iterated over once, and each file is
+        handed to the workers as soon as it is produced, so parsing can
+        overlap with finding the rest of the files. The paths collected are
+        available from get_file_paths() afterwards.
+
+        Each call collects from scratch: the results of earlier calls are
+        not included, and are left untouched. The switches are reset after
+        every file, so a Collector can be used for any number of runs.
+        However, they do hold the state of the file being parsed, so two
+        threads must not use the same Collector at the same time. Separate
+        Collectors (such as those created by make_github_markdown_collector)
+        share nothing and can run concurrently.
+
         It returns two dictionaries- the first maps from
         file_path strings to inner dictionaries, and those inner dictionaries
         map from AnchorHub tag to converted anchors.
@@ -61,19 +131,190 @@ class Collector(object):
         are lists with the following information: [tag, line_number,
         previous-anchor-used]
 
-        :param file_paths:
+        :param file_paths: Iterable of string file paths to collect from
+        :param workers: Number of worker processes to use. Defaults to 1,
+            which collects every file in the current process
+        :param keep_documents: When True, keep a Document for each file
+        :param cache: Optional AnchorCache used to skip unchanged files
         :return: Two dictionaries. The first maps string file paths to
             dictionaries. These inner dictionaries map AnchorHub tags to
             generated anchors. The second dictionary maps file paths to lists
             containing information about duplicate tags found on each page.
         """
-        for file_path in file_paths:
-            self._anchors[file_path], d = self.collect_single_file(file_path)
+        paths = []
+        results = []
+        misses = []  # Indices of files that need to be parsed
+
+        def find_misses():
+            # Yields the files that aren't in the cache. Every miss is
+            # recorded before it is yielded, so it is always known by the
+            # time its result comes back
+            for file_path in file_paths:
+                cached = cache.get(file_path) if cache is not None else None
+                if cached is None:
+                    misses.append(len(paths))
+                    results.append(None)
+                else:
+                    results.append((cached[0], cached[1], None, None))
+                paths.append(file_path)
+                if cached is None:
+                    yield file_path
+
+        chunk_size = 1
+        if hasattr(file_paths, '__len__'):
+            workers = min(workers, len(file_paths))
+            # Hand out files in the same size chunks as Pool.map() would
+            chunk_size = max(1, len(file_paths) // (max(workers, 1) * 4))
+        collected = self._collect_files(find_misses(), workers,
+                                        keep_documents, chunk_size)
+        for k, (file_anchors, d, doc, ignored, stats) in \
+                enumerate(collected):
+            n = misses[k]
+            results[n] = (file_anchors, d, doc, ignored)
+            self._line_count += stats[0]
+            self._screened_count += stats[1]
+            if cache is not None:
+                cache.put(paths[n], file_anchors, d)
+
+        # Each call starts from scratch, so dictionaries returned by an
+        # earlier call are never changed by a later one
+        anchors = {}
+        duplicate_tags = {}
+        documents = {}
+        ignored_ranges = {}
+        for file_path, (file_anchors, d, doc, ignored) in zip(paths,
+                                                               results):
+            anchors[file_path] = file_anchors
             if len(d) > 0:
                 # There were duplicates found in the file
-                self._duplicate_tags[file_path] = d
+                duplicate_tags[file_path] = d
+            if doc is not None:
+                documents[file_path] = doc
+            if ignored is not None:
+                ignored_ranges[file_path] = ignored
+        self._file_paths = paths
+        self._anchors = anchors
+        self._duplicate_tags = duplicate_tags
+        self._documents = documents
+        self._ignored = ignored_ranges
+        return anchors, duplicate_tags
+
+    def get_file_paths(self):
+        """
+        Returns the file paths handled by the last call to collect(), in the
+        order they were collected.
+
+        :return: List of string file paths
+        """
+        return self._file_paths
+
+    def get_documents(self):
+        """
+        Returns the Documents kept during collect(keep_documents=True)
+
+        :return: Dictionary mapping string file paths to Document objects
+        """
+        return self._documents
+
+    def get_ignored_ranges(self):
+        """
+        Returns the lines ignored by the switches in each file parsed by
+        collect(), such as the lines inside of code blocks. Files taken from
+        a cache are not included.
+
+        :return: Dictionary mapping string file paths to RangeSets of
+            ignored line indices
+        """
+        return self._ignored
+
+    def get_screened_lines(self):
+        """
+        Returns how many of the lines examined so far were skipped by the
+        strategies' prefilters, without running any strategy on them. Lines
+        inside of switched-off sections and files taken from a cache are not
+        counted.
+
+        :return: A tuple of (screened_lines, total_lines)
+        """
+        return self._screened_count, self._line_count
+
+    def _collect_files(self, file_paths, workers, keep_documents,
+                       chunk_size=1):
+        """
+        Parses every file in file_paths, using a pool of worker processes if
+        more than one worker is requested.
+
+        :param file_paths: Iterable of string file paths to collect from
+        :param workers: Number of worker processes to use
+        :param keep_documents: When True, return a Document for each file
+        :param chunk_size: Number of files sent to a worker at a time
+        :return: An iterator of (file_anchors, file_duplicates, document,
+            ignored, line_stats) results, in the same order as file_paths
+        """
+        if workers > 1:
+            return self._collect_parallel(file_paths, workers,
+                                          keep_documents, chunk_size)
+        else:
+            return (self._collect_and_reset(f, keep_documents)
+                    for f in file_paths)
+
+    def _collect_parallel(self, file_paths, workers, keep_documents,
+                          chunk_size=1):
+        """
+        Collects each file in file_paths using a pool of worker processes.
+        Every worker gets its own copy of this Collector (and therefore its
+        own switches), so files never share parsing state.
+
+        Files are handed to the workers as they are produced by file_paths,
+        and results are yielded as soon as they are ready.
+
+        :param file_paths: Iterable of string file paths to collect from
+        :param workers: Number of worker processes to start
+        :param keep_documents: When True, workers send back a Document for
+            each file
+        :param chunk_size: Number of files sent to a worker at a time
+        :return: A generator of (file_anchors, file_duplicates, document,
+            ignored, line_stats) results, in the same order as file_paths
+        """
+        pool = multiprocessing.Pool(workers, _init_worker,
+                                    (self, keep_documents))
+        try:
+            for result in pool.imap(_collect_worker, file_paths,
+                                     chunk_size):
+                yield result
+        finally:
+            pool.close()
+            pool.join()
+
+    def _collect_and_reset(self, file_path, keep_document=False):
+        """
+        Collects a single file and resets the switches afterwards, so that
+        the next file starts from a clean state. Unless the Document is
+        kept, the file is streamed through a LineWindow instead of being
+        read into memory all at once.
+
+        :param file_path: string file path of file to examine
+        :param keep_document: When True, return the file's Document
+        :return: A tuple of (file_anchors, file_duplicates, document,
+            ignored, line_stats). document is None unless keep_document is
+            True. ignored is a RangeSet of the lines ignored by the switches.
+            line_stats is a (total_lines, screened_lines) tuple
+        """
+        if keep_document:
+            lines = FileToList.to_list(file_path, self._encoding)
+        else:
+            lines = LineWindow(FileToList.iter_lines(file_path,
+                                                     self._encoding))
+        document = Document(file_path, lines)
+        try:
+            file_anchors, file_duplicates = self.collect_document(document)
+        finally:
             self._reset_switches()
-        return self._anchors, self._duplicate_tags
+        stats = (len(document.lines), document.screened_lines)
+        ignored = document.ignored
+        if not keep_document:
+            document = None
+        return file_anchors, file_duplicates, document, ignored, stats
 
     def collect_single_file(self, file_path):
         """
@@ -86,27 +327,117 @@ class Collector(object):
             anchors, and a list of containing an entry for each duplicate tag
             found on the page.
         """
-        lines = FileToList.to_list(file_path)
+        document = Document(file_path, LineWindow(
+            FileToList.iter_lines(file_path, self._encoding)))
+        try:
+            result = self.collect_document(document)
+        finally:
+            self._reset_switches()
+        self._line_count += len(document.lines)
+        self._screened_count += document.screened_lines
+        return result
+
+    def collect_document(self, document):
+        """
+        Collects the AnchorHub tags and auto-generated anchors from the lines
+        of a Document, and records the lines ignored by the Collector's
+        scanner and switches, and the lines its strategies found tags on, on
+        the Document.
+
+        Each line is checked once for each distinct prefilter substring of
+        the strategies (see CollectorStrategy.get_prefilter()), and only the
+        strategies that could match it are tested. Lines that no strategy
+        could match are skipped, and the number of skipped lines is recorded
+        on the Document as screened_lines.
+
+        :param document: Document containing the lines of the file to
+            examine. Its lines may be a list or a LineWindow, and are only
+            iterated over once
+        :return: A dictionary mapping AnchorHub tags to auto-generated
+            anchors, and a list of containing an entry for each duplicate tag
+            found on the page.
+        """
+        lines = document.lines
         file_anchors = {}
         file_duplicates = []
-        for i in range(len(lines)):
-            # Flip any switches that are triggered by this line
-            self._try_switches(lines, i)
-            if self._no_switches_on():
-                for s in self._strategies:
-                    if s.test(lines, i):
-                        # This strategy found an anchor and knows how to parse
-                        tag, convert_me = s.get(lines, i)
-                        if tag in file_anchors:
-                            # Duplicate tag
-                            file_duplicates.append((tag, i + 1,
-                                                    file_anchors[tag]))
-                        else:
-                            anchor = self._converter(convert_me, file_anchors)
-                            file_anchors[tag] = anchor
-            self._arm_switches()
+        slugs = SlugRegistry()  # Anchors generated so far in this file
+        literals = self._literals
+        all_prefiltered = self._all_prefiltered
+        screened = 0
+        for i, (line, is_ignored) in enumerate(self._iter_regions(lines)):
+            if is_ignored:
+                document.add_ignored(i)
+                continue
+            present = [l for l in literals if l in line]
+            if not present and all_prefiltered:
+                # No strategy can match this line
+                screened += 1
+                continue
+            for s, p in zip(self._strategies, self._prefilters):
+                if p is not None and p not in present:
+                    continue
+                if s.test(lines, i):
+                    # This strategy found an anchor and knows how to parse it
+                    document.add_header_line(i)
+                    tag, convert_me = s.get(lines, i)
+                    if tag in file_anchors:
+                        # Duplicate tag
+                        file_duplicates.append((tag, i + 1,
+                                                file_anchors[tag]))
+                    else:
+                        anchor = self._converter(convert_me, slugs)
+                        file_anchors[tag] = anchor
+        document.screened_lines = screened
         return file_anchors, file_duplicates
 
+    def _iter_regions(self, lines):
+        """
+        Pairs each line with whether it is ignored by the scanner or the
+        switches. The switches are only tried on lines that start with one
+        of their prefixes (see ArmedCheckSwitch.get_prefix()).
+
+        :param lines: List of strings (or a LineWindow), usually the lines
+            in a text file
+        :return: An iterator of (line, is_ignored) tuples
+        """
+        if self._scanner is not None:
+            pairs = self._scanner.scan(lines)
+        else:
+            pairs = zip(lines, repeat(False))
+        if not self._switches:
+            return pairs
+        return self._iter_switched(lines, pairs)
+
+    def _iter_switched(self, lines, pairs):
+        """
+        Runs the switches on each line of pairs.
+
+        :param lines: List of strings (or a LineWindow) that pairs comes from
+        :param pairs: Iterator of (line, is_ignored) tuples
+        :return: A generator of (line, is_ignored) tuples, where lines are
+            also ignored while any switch is on
+        """
+        prefixes = self._switch_prefixes
+        is_switched = not self._no_switches_on()
+        for i, (line, is_ignored) in enumerate(pairs):
+            if prefixes is None or line.startswith(prefixes):
+                # Flip any switches that are triggered by this line
+                is_switched = self._update_switches(lines, i)
+            yield line, is_ignored or is_switched
+
+    def _update_switches(self, lines, index):
+        """
+        Tries to flip the switches on the line at index, then re-arms them
+        for the next line.
+
+        :param lines: List of strings, usually the lines in a text file
+        :param index: Number index pointing to the current line
+        :return: True if any switch is on, meaning the line is ignored
+        """
+        self._try_switches(lines, index)
+        self._arm_switches()
+        return not self._no_switches_on()
+
     def _try_switches(self, lines, index):
         """
         For each switch in the Collector object, pass a list of string,
@@ -145,6 +476,35 @@ class Collector(object):
             s.force(False)
 
 
+# Collector and keep_documents flag used by a worker process during
+# Collector._collect_parallel()
+_worker_state = None
+
+
+def _init_worker(collector, keep_documents):
+    """
+    Initializer for worker processes. Stores the Collector that the worker
+    should use for all of the files it is handed.
+
+    :param collector: The Collector object to collect files with
+    :param keep_documents: When True, send back a Document for each file
+    """
+    global _worker_state
+    _worker_state = (collector, keep_documents)
+
+
+def _collect_worker(file_path):
+    """
+    Collects a single file inside of a worker process.
+
+    :param file_path: string file path of file to examine
+    :return: A tuple of (file_anchors, file_duplicates, document,
+        ignored, line_stats) for the file
+    """
+    collector, keep_documents = _worker_state
+    return collector._collect_and_reset(file_path, keep_documents)
+
+
 class CollectorStrategy(object):
     __metaclass__ = ABCMeta
 
@@ -179,3 +539,14 @@ class CollectorStrategy(object):
             the portion of the line that should be converted into an anchor
         """
         pass
+
+    def get_prefilter(self):
+        """
+        Returns a substring that file_lines[index] must contain for test()
+        to return True, or None if there is no such substring. The Collector
+        checks lines for this substring before calling test(), which is
+        much cheaper than running a regular expression on every line.
+
+        :return: string that every matching line contains, or None
+        """
+        return None
@@ -0,0 +1,56 @@
+"""
+Functions for finding the files that need to be written again after some of
+the files in a tree have changed.
+
+Each written file records the [file_key, tag] pairs its links point to (see
+Writer.get_links()) in the AnchorCache. Turned around, these form a reverse
+link graph: for every file, the files that link into it and the tags they
+use. A file only needs to be written again if:
+
+* The file itself changed (or has no usable cache entry)
+* A tag it links to now maps to a different anchor, or was added or removed
+* It was written out last time, but its output file is missing
+"""
+
+
+def get_dirty_files(file_paths, anchors, cache, output_exists=None):
+    """
+    Returns the files in file_paths that need to be written again.
+
+    :param file_paths: List of string file paths that were collected
+    :param anchors: Dictionary mapping string file paths to inner
+        dictionaries of AnchorHub tags to generated anchors, as returned by
+        Collector.collect()
+    :param cache: The AnchorCache that was loaded and used for collection
+    :param output_exists: Optional function taking a file path and
+        returning True if its output file exists. If None, output files are
+        not checked
+    :return: List of string file paths, in the same order as file_paths
+    """
+    dirty = set()
+    reverse_links = {}  # Maps target files to [source file, tag] pairs
+    for file_path in file_paths:
+        entry = cache.get_previous(file_path)
+        if (not cache.is_unchanged(file_path) or entry is None or
+                entry.get('links') is None):
+            # New or changed file, or its links were never recorded
+            dirty.add(file_path)
+            continue
+        if entry.get('modified') and output_exists is not None and \
+                not output_exists(file_path):
+            dirty.add(file_path)
+            continue
+        for target, tag in entry['links']:
+            reverse_links.setdefault(target, []).append([file_path, tag])
+
+    for target, sources in reverse_links.items():
+        if cache.is_unchanged(target):
+            # Same contents, so the same anchors
+            continue
+        entry = cache.get_previous(target)
+        old_anchors = entry['anchors'] if entry is not None else {}
+        new_anchors = anchors.get(target, {})
+        for source, tag in sources:
+            if old_anchors.get(tag) != new_anchors.get(tag):
+                dirty.add(source)
+    return [f for f in file_paths if f in dirty]
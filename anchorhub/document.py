@@ -0,0 +1,66 @@
+"""
+Class file for the AnchorHub Document
+"""
+from anchorhub.lib.rangeset import RangeSet
+
+
+class Document(object):
+    """
+    A Document holds the lines of a single file, as read by the Collector,
+    along with what the Collector found in them, so that the file does not
+    need to be read again when it is written. It stores:
+
+    * The lines of the file, as a list of strings
+    * The ranges of lines that were ignored by the Collector's switches (for
+    example, lines inside of code blocks), as a RangeSet of [start, end)
+    pairs
+    * The indices of the lines that a Collector strategy found an AnchorHub
+    tag on (for example, headers). The Writer only runs strategies that
+    remove those tags on these lines. Other strategies, such as the ones
+    for links, still search every line that isn't ignored
+    * The number of lines the Collector skipped with its strategy prefilters
+    """
+    def __init__(self, file_path, lines):
+        """
+        Initializer for Document.
+
+        :param file_path: string file path of the file the lines came from
+        :param lines: List of strings, with each entry corresponding to a
+            single line in the file. A LineWindow may be used instead while
+            a file is being streamed, in which case the Document can't be
+            used to write the file afterwards
+        """
+        self.file_path = file_path
+        self.lines = lines
+        self.ignored = RangeSet()
+        self.header_lines = set()
+        self.screened_lines = 0
+
+    def add_ignored(self, index):
+        """
+        Marks the line at index as ignored. Lines must be added in
+        increasing order; consecutive lines are merged into a single range.
+
+        :param index: index of the ignored line in lines
+        """
+        self.ignored.add(index)
+
+    def add_header_line(self, index):
+        """
+        Marks the line at index as one that a Collector strategy found an
+        AnchorHub tag on.
+
+        :param index: index of the line in lines
+        """
+        self.header_lines.add(index)
+
+    def get_ignored_lines(self):
+        """
+        Returns the indices of every ignored line.
+
+        :return: A set of integer line indices
+        """
+        ignored_lines = set()
+        for start, end in self.ignored:
+            ignored_lines.update(range(start, end))
+        return ignored_lines
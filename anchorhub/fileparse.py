@@ -4,7 +4,7 @@ to input options
 """
 import os.path
 
-from anchorhub.util.getfiles import get_files
+from anchorhub.util.getfiles import iter_files
 
 
 def get_file_list(opts):
@@ -17,13 +17,47 @@ def get_file_list(opts):
     :return: a list of absolute string file paths of files that should be
         parsed
     """
+    return list(iter_file_list(opts))
+
+
+def iter_file_list(opts):
+    """
+    Generator version of get_file_list(). Yields the path of each file as
+    soon as it is found.
+
+    :param opts: Namespace containing AnchorHub options, usually created from
+        command line arguments
+    :return: a generator of absolute string file paths of files that should
+        be parsed
+    """
     if opts.is_dir:
-        # Input is a directory, get a list of files
-        return get_files(opts.abs_input, opts.extensions, exclude=[
-            opts.abs_output], recursive=opts.recursive)
+        # Input is a directory, search it for files
+        return iter_files(opts.abs_input, opts.extensions, exclude=[
+            opts.abs_output], recursive=opts.recursive,
+            exclude_patterns=getattr(opts, 'exclude', None),
+            gitignore=getattr(opts, 'gitignore', False))
     elif os.path.isfile(opts.input):
         # Input is a file, should only parse that one file
-        return [opts.abs_input]
+        return iter([opts.abs_input])
     else:
         # Input is non-existent
-        return []
+        return iter([])
+
+
+def iter_mirror_list(opts):
+    """
+    Yields every file in the input directory that should be mirrored into
+    the output directory, whatever its extension. The same directories and
+    patterns are excluded as in iter_file_list(), and hidden files are
+    skipped.
+
+    :param opts: Namespace containing AnchorHub options, usually created from
+        command line arguments
+    :return: a generator of absolute string file paths
+    """
+    if not opts.is_dir:
+        return iter([])
+    return iter_files(opts.abs_input, [''], exclude=[opts.abs_output],
+                      recursive=opts.recursive,
+                      exclude_patterns=getattr(opts, 'exclude', None),
+                      gitignore=getattr(opts, 'gitignore', False))
@@ -16,7 +16,7 @@ class ArmedCheckSwitch(object):
     """
 
     def __init__(self, switched=False, armed=True, on_check=lambda: True,
-                 off_check=lambda: True):
+                 off_check=lambda: True, prefix=None):
         """
         Initialization for the ArmedCheckSwitcher class. Instantiates the
         local ArmedSwitch object. Assigns user defined functions on_check and
@@ -31,10 +31,13 @@ class ArmedCheckSwitch(object):
             state unless this function returns True.
         :param off_check: Callback function. Similar to on_check(), prevents
             the switch from changing to False unless the this returns True
+        :param prefix: Optional string that every line passing on_check()
+            or off_check() starts with. See get_prefix()
         """
         self._switch = ArmedSwitch(switched=switched, armed=armed)
         self.on_check = on_check
         self.off_check = off_check
+        self._prefix = prefix
 
     def switch(self, *args):
         """
@@ -113,3 +116,30 @@ class ArmedCheckSwitch(object):
         :param state: Boolean value to set the switch to
         """
         self._switch.force(state)
+
+    def get_prefix(self):
+        """
+        Returns a string that a line must start with for on_check() or
+        off_check() to pass, or None if there is no such string. Lines that
+        don't start with it can't change the state of the switch, so they
+        don't need to be checked at all.
+
+        :return: string that every line changing the switch starts with, or
+            None
+        """
+        return self._prefix
+
+
+def get_switch_prefixes(switches):
+    """
+    Returns the prefixes that a line must start with to change any of
+    switches. See ArmedCheckSwitch.get_prefix().
+
+    :param switches: List of ArmedCheckSwitches
+    :return: A tuple of string prefixes, or None if some switch can be
+        changed by any line
+    """
+    prefixes = [s.get_prefix() for s in switches]
+    if None in prefixes:
+        return None
+    return tuple(set(prefixes))
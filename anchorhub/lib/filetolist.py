@@ -1,6 +1,7 @@
 """
 Class for FileToList
 """
+import io
 
 
 class FileToList(object):
@@ -10,17 +11,51 @@ class FileToList(object):
     text file.
     """
     @staticmethod
-    def to_list(file_path):
+    def to_list(file_path, encoding=None):
         """
         Static method. Takes in a file path, and outputs a list of stings.
         Each element in the list corresponds to a line in the file.
         :param file_path: string file path
+        :param encoding: Optional name of the encoding to read the file
+            with. Defaults to the system's encoding
         :return: A list of strings, with elements in the list corresponding
         to lines in the file pointed to in file_path
         """
         l = []
-        f = open(file_path, 'r')
+        f = _open(file_path, encoding)
         for line in f:
             l.append(line)
         f.close()
         return l
+
+    @staticmethod
+    def iter_lines(file_path, encoding=None):
+        """
+        Static method. Generator version of to_list(), which reads the file
+        one line at a time instead of holding every line in memory. The file
+        is closed once the last line is read, or when the generator is
+        closed.
+
+        :param file_path: string file path
+        :param encoding: Optional name of the encoding to read the file
+            with. Defaults to the system's encoding
+        :return: A generator of strings, one for each line in the file
+            pointed to in file_path
+        """
+        with _open(file_path, encoding) as f:
+            for line in f:
+                yield line
+
+
+def _open(file_path, encoding):
+    """
+    Opens a text file for reading.
+
+    :param file_path: string file path
+    :param encoding: Name of the encoding to read the file with, or None to
+        use the system's encoding
+    :return: The open file
+    """
+    if encoding is None:
+        return open(file_path, 'r')
+    return io.open(file_path, 'r', encoding=encoding)
@@ -0,0 +1,223 @@
+"""
+Class file for IgnoreRules, a parser for .gitignore style files
+"""
+import os
+import re
+
+from anchorhub.lib.filetolist import FileToList
+
+# Files read for ignore rules, in increasing order of precedence
+IGNORE_FILES = ('.gitignore', '.ignore')
+
+
+class IgnoreRules(object):
+    """
+    IgnoreRules holds the compiled rules from the .gitignore (and .ignore)
+    files of a single directory. It understands the same pattern syntax as
+    git, without needing git itself:
+
+    * Blank lines and lines starting with '#' are skipped
+    * A leading '!' re-includes paths that an earlier rule excluded
+    * A trailing '/' only matches directories
+    * Patterns with a '/' at the start or in the middle are matched against
+    the path relative to the directory of the ignore file. Other patterns
+    match names at any depth below it
+    * '*', '?', and '[...]' don't match '/'. A leading '**/' matches any
+    number of directories, '/**/' matches zero or more directories, and a
+    trailing '/**' matches everything inside of a directory
+
+    As in git, the last rule that matches a path decides whether it is
+    ignored.
+    """
+    def __init__(self, lines):
+        """
+        Initializer for IgnoreRules.
+
+        :param lines: List of strings, each a line from an ignore file
+        """
+        self._rules = []  # List of (regex, negated, dir_only, match_path)
+        for line in lines:
+            rule = _parse_line(line)
+            if rule is not None:
+                self._rules.append(rule)
+
+    @classmethod
+    def from_dir(cls, dir, names=None):
+        """
+        Reads the ignore files in dir.
+
+        :param dir: String path of the directory, ending with a separator
+        :param names: Optional collection of the file names in dir. If
+            provided, only ignore files that are listed are read
+        :return: An IgnoreRules object, or None if dir has no rules
+        """
+        lines = []
+        for ignore_file in IGNORE_FILES:
+            if names is not None and ignore_file not in names:
+                continue
+            try:
+                lines.extend(FileToList.to_list(dir + ignore_file))
+            except (IOError, OSError, UnicodeError):
+                continue
+        rules = cls(lines)
+        return rules if rules else None
+
+    def match(self, rel_path, is_dir):
+        """
+        Checks whether the rules ignore rel_path.
+
+        :param rel_path: string path relative to the directory of the ignore
+            files, using '/' as the path separator and without a trailing '/'
+        :param is_dir: True if rel_path is a directory
+        :return: True if rel_path is ignored, False if a negated rule
+            re-includes it, and None if no rule matches it
+        """
+        name = rel_path.rsplit('/', 1)[-1]
+        for regex, negated, dir_only, match_path in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if match_path else name):
+                return not negated
+        return None
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    __nonzero__ = __bool__  # Python 2
+
+
+def is_ignored(chain, rel_path, is_dir):
+    """
+    Checks a path against the rules of every directory above it. Rules in
+    deeper directories take precedence over rules in their parents.
+
+    :param chain: Sequence of (prefix, IgnoreRules) pairs, from the top
+        directory down. prefix is the '/' separated path of the directory
+        holding the rules, ending with a '/' (or '' for the top directory)
+    :param rel_path: '/' separated path relative to the top directory
+    :param is_dir: True if rel_path is a directory
+    :return: True if the path is ignored
+    """
+    for prefix, rules in reversed(chain):
+        ignored = rules.match(rel_path[len(prefix):], is_dir)
+        if ignored is not None:
+            return ignored
+    return False
+
+
+def get_parent_rules(dir):
+    """
+    Finds the ignore rules that apply to dir from the directories above it,
+    up to the root of the git repository that contains dir. If dir is not
+    inside of a git repository, no parent rules apply.
+
+    :param dir: String absolute path of a directory, ending with a separator
+    :return: A tuple (dir_prefix, chain). dir_prefix is the '/' separated
+        path of dir relative to the repository root (ending with a '/'), and
+        chain is a tuple of (prefix, IgnoreRules) pairs for the directories
+        above dir, from the repository root down. See is_ignored()
+    """
+    names = []  # Names of the directories below the repository root
+    current = os.path.abspath(dir)
+    while not os.path.exists(os.path.join(current, '.git')):
+        parent = os.path.dirname(current)
+        if parent == current:
+            # Reached the file system root without finding a repository
+            return '', ()
+        names.append(os.path.basename(current))
+        current = parent
+    names.reverse()
+
+    chain = []
+    prefix = ''
+    for name in names:
+        rules = IgnoreRules.from_dir(os.path.join(current, ''))
+        if rules is not None:
+            chain.append((prefix, rules))
+        prefix += name + '/'
+        current = os.path.join(current, name)
+    return prefix, tuple(chain)
+
+
+def _parse_line(line):
+    """
+    Parses a single line of an ignore file.
+
+    :param line: string line from an ignore file
+    :return: A tuple (regex, negated, dir_only, match_path), or None if the
+        line doesn't contain a rule
+    """
+    line = line.rstrip('\r\n')
+    # Trailing spaces are ignored unless they are escaped with a backslash
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    if not line or line.startswith('#'):
+        return None
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    match_path = '/' in line
+    line = line.lstrip('/')
+    regex = re.compile('^' + _translate(line) + '$', re.DOTALL)
+    return regex, negated, dir_only, match_path
+
+
+def _translate(pattern):
+    """
+    Translates a gitignore glob pattern into a regular expression.
+
+    :param pattern: string glob pattern, without a leading '!' or a trailing
+        '/'
+    :return: string regular expression pattern
+    """
+    i = 0
+    n = len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 2] == '**' and (i == 0 or pattern[i - 1] == '/'):
+                if i + 2 == n:
+                    # Trailing '/**': everything inside
+                    out.append('.*')
+                    i += 2
+                    continue
+                elif pattern[i + 2] == '/':
+                    # '**/': zero or more directories
+                    out.append('(?:.*/)?')
+                    i += 3
+                    continue
+            # Any other '*' (or run of them) stays within one path component
+            while i < n and pattern[i] == '*':
+                i += 1
+            out.append('[^/]*')
+            continue
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                out.append('\\[')
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                elif body.startswith('^'):
+                    body = '\\' + body
+                out.append('[' + body + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
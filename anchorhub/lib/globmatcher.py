@@ -0,0 +1,104 @@
+"""
+Class file for GlobMatcher
+"""
+import fnmatch
+import re
+
+
+class GlobMatcher(object):
+    """
+    GlobMatcher checks paths against a list of glob-style patterns (as used
+    by the fnmatch module) with a single compiled regular expression.
+
+    Patterns that contain a '/' are matched against the whole relative path,
+    such as 'docs/vendor'. Other patterns are matched against the last part
+    of the path only, so 'node_modules' matches a directory of that name at
+    any depth. A trailing '/' on a pattern is ignored. Patterns without any
+    wildcards are checked with a set lookup instead of the regex.
+    """
+    def __init__(self, patterns):
+        """
+        Initializer for GlobMatcher.
+
+        :param patterns: List of string glob patterns
+        """
+        self._names = set()  # Literal names
+        self._paths = set()  # Literal relative paths
+        name_patterns = []
+        path_patterns = []
+        for pattern in patterns:
+            pattern = pattern.rstrip('/')
+            if not pattern:
+                continue
+            is_path = '/' in pattern
+            if not _has_wildcards(pattern):
+                (self._paths if is_path else self._names).add(pattern)
+            elif is_path:
+                path_patterns.append(_translate(pattern))
+            else:
+                name_patterns.append(_translate(pattern))
+        self._name_regex = _compile(name_patterns)
+        self._path_regex = _compile(path_patterns)
+
+    def match(self, rel_path, name=None):
+        """
+        Returns True if rel_path matches any of the patterns.
+
+        :param rel_path: string path relative to the search root, using '/'
+            as the path separator and without a trailing '/'
+        :param name: Optional last part of rel_path, if already known
+        :return: True if rel_path or its name matches a pattern
+        """
+        if name is None:
+            name = rel_path.rsplit('/', 1)[-1]
+        if name in self._names or rel_path in self._paths:
+            return True
+        if self._name_regex is not None and self._name_regex.match(name):
+            return True
+        if self._path_regex is not None and self._path_regex.match(rel_path):
+            return True
+        return False
+
+    def __bool__(self):
+        return bool(self._names or self._paths or self._name_regex or
+                    self._path_regex)
+
+    __nonzero__ = __bool__  # Python 2
+
+
+def _has_wildcards(pattern):
+    """
+    Returns True if pattern uses any fnmatch wildcard characters.
+
+    :param pattern: string glob pattern
+    :return: True if pattern contains '*', '?', or '['
+    """
+    return any(c in pattern for c in '*?[')
+
+
+def _translate(pattern):
+    """
+    Translates a glob pattern into a regular expression that can be
+    combined with others using '|'.
+
+    :param pattern: string glob pattern
+    :return: string regular expression pattern
+    """
+    regex = fnmatch.translate(pattern)
+    if regex.endswith('\\Z(?ms)'):
+        # Python versions before 3.7 put the flags at the end, which isn't
+        # allowed in the middle of a combined pattern
+        regex = regex[:-len('\\Z(?ms)')] + '\\Z'
+    return '(?:' + regex + ')'
+
+
+def _compile(regexes):
+    """
+    Combines a list of regular expressions into a single compiled regex.
+
+    :param regexes: List of string regular expression patterns
+    :return: Compiled regular expression, or None if regexes is empty
+    """
+    if not regexes:
+        return None
+    return re.compile('|'.join(regexes), re.DOTALL)
@@ -0,0 +1,82 @@
+"""
+Class file for LineWindow
+"""
+from collections import deque
+
+
+class LineWindow(object):
+    """
+    LineWindow wraps an iterator of lines, such as the lines of an open
+    file, so that it can be used in place of a list of lines by code that
+    takes (file_lines, index) arguments. Only a small window of lines is
+    held in memory at a time, so files of any size can be read with
+    constant memory.
+
+    Iterating over a LineWindow yields each line in order, like a list.
+    While line i is being examined, file_lines[i] and the next 'lookahead'
+    lines can be accessed by index. Earlier lines have been dropped, and
+    raise an IndexError.
+
+    Lines further ahead can be read into the window with fill(), and stay
+    in memory until iteration reaches them.
+
+    len() returns the number of lines read so far. Since the window is
+    always filled 'lookahead' lines past the current line, checks such as
+    'index < len(file_lines) - 1' work the same as with a list. Once
+    iteration finishes, len() is the number of lines in the file.
+    """
+    def __init__(self, lines, lookahead=1):
+        """
+        Initializer for LineWindow.
+
+        :param lines: Iterable of string lines. It is only iterated over
+            once
+        :param lookahead: Number of lines after the current line that must
+            be available by index
+        """
+        self._lines = iter(lines)
+        self._lookahead = lookahead
+        self._window = deque()  # The lines held in memory
+        self._start = 0  # The index of the first line in _window
+        self._exhausted = False
+
+    def __iter__(self):
+        window = self._window
+        lookahead = self._lookahead
+        self.fill(self._start + lookahead)
+        while window:
+            yield window[0]
+            # Move on to the next line, reading one more line ahead unless
+            # fill() already has
+            window.popleft()
+            self._start += 1
+            if not self._exhausted and len(window) <= lookahead:
+                line = next(self._lines, None)
+                if line is None:
+                    self._exhausted = True
+                else:
+                    window.append(line)
+
+    def __getitem__(self, index):
+        offset = index - self._start
+        if index < 0 or not 0 <= offset < len(self._window):
+            raise IndexError("line " + str(index) + " is outside of the "
+                             "window of lines in memory")
+        return self._window[offset]
+
+    def __len__(self):
+        return self._start + len(self._window)
+
+    def fill(self, index):
+        """
+        Reads lines until the line at index is in the window, or there are
+        no more lines. Lines past the current line's lookahead stay in the
+        window until iteration reaches them.
+
+        :param index: index of the last line that should be in the window
+        """
+        while not self._exhausted and self._start + len(self._window) <= index:
+            try:
+                self._window.append(next(self._lines))
+            except StopIteration:
+                self._exhausted = True
@@ -0,0 +1,73 @@
+"""
+Class file for LinkResolver
+"""
+import os.path
+
+from anchorhub.lib.lrucache import LRUCache
+import anchorhub.settings.default_settings as ds
+
+try:
+    from urllib.parse import unquote
+except ImportError:
+    # Python 2
+    from urllib import unquote as _unquote_bytes
+
+    def unquote(text):
+        if not isinstance(text, bytes):
+            text = text.encode('utf-8')
+        # Percent-encoded bytes are UTF-8, and are decoded to text, as in
+        # Python 3
+        return _unquote_bytes(text).decode('utf-8', 'replace')
+
+
+def resolve_link(file_dir, link_path):
+    """
+    Finds the absolute path that a link points to. Percent-encoded characters
+    (such as '%20') are decoded, and './' and '..' segments are removed, so
+    that every spelling of a link to a file gives the same path.
+
+    :param file_dir: string absolute path of the directory containing the
+        file with the link
+    :param link_path: string path part of the link URL, without any '#' tag.
+        Relative paths are resolved from file_dir
+    :return: string normalized absolute path of the link target
+    """
+    if '%' in link_path:
+        link_path = unquote(link_path)
+    return os.path.abspath(os.path.join(file_dir, link_path))
+
+
+class LinkResolver(object):
+    """
+    LinkResolver turns the path of a link into the absolute file path used
+    as a key to the anchors dictionary. See resolve_link().
+
+    Documents tend to link to the same few files over and over, so resolved
+    paths are remembered for each pair of source directory and link path.
+    A single LinkResolver can be shared by all of the WriterStrategy objects
+    that handle links.
+    """
+    def __init__(self, cache_size=ds.LINK_CACHE_SIZE):
+        """
+        Initializer for LinkResolver.
+
+        :param cache_size: Maximum number of resolved links to remember
+        """
+        self._memo = LRUCache(cache_size)
+
+    def resolve(self, file_path, link_path):
+        """
+        Finds the absolute path of link_path relative to file_path.
+
+        :param file_path: string absolute path of the file that contains the
+            link
+        :param link_path: string path part of the link URL
+        :return: string normalized absolute path of the link target
+        """
+        file_dir = os.path.dirname(file_path)
+        key = (file_dir, link_path)
+        file_key = self._memo.get(key)
+        if file_key is None:
+            file_key = resolve_link(file_dir, link_path)
+            self._memo.put(key, file_key)
+        return file_key
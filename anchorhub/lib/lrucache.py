@@ -0,0 +1,56 @@
+"""
+Class file for LRUCache
+"""
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    LRUCache is a dictionary-like object holding at most max_size entries.
+    When it is full, adding a new key evicts the least recently used entry.
+    """
+    def __init__(self, max_size):
+        """
+        Initializer for LRUCache.
+
+        :param max_size: Maximum number of entries to keep. Must be at least 1
+        """
+        if max_size < 1:
+            raise ValueError("LRUCache max_size must be at least 1")
+        self._max_size = max_size
+        self._entries = OrderedDict()  # Least recently used entries first
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for key, and marks it as most recently used.
+
+        :param key: The key to look up
+        :param default: Value to return if key is not in the cache
+        :return: The value stored for key, or default
+        """
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            return default
+        self._entries[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        Stores value for key as the most recently used entry, evicting the
+        least recently used entry if the cache is full.
+
+        :param key: The key to store value under
+        :param value: The value to store
+        """
+        if key in self._entries:
+            del self._entries[key]
+        elif len(self._entries) >= self._max_size:
+            self._entries.popitem(last=False)
+        self._entries[key] = value
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
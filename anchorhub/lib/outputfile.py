@@ -0,0 +1,170 @@
+"""
+Class file for OutputFile
+"""
+import io
+import os
+import os.path
+import shutil
+
+import anchorhub.settings.default_settings as ds
+from anchorhub.util.hashfile import hash_file, new_hash
+from anchorhub.util.replacefile import replace_file
+
+
+class OutputFile(object):
+    """
+    OutputFile writes lines of text to a temporary file next to its
+    destination, and moves the temporary file into place when commit() is
+    called. Until then, the destination is left untouched, so it can still
+    be read while its replacement is being written. Since the move replaces
+    the destination in a single step, a run that is interrupted or killed
+    never leaves a half-written file behind.
+
+    If fsync is True, the contents of the file are flushed to disk before
+    it is moved into place. The move itself is only guaranteed to survive a
+    crash once its directory has been synced as well. See
+    sync_directories(), which lets many files share a single directory
+    sync.
+
+    Lines are held until about buffer_size characters are waiting, and are
+    then joined and encoded with a single call, rather than being encoded
+    and written one line at a time.
+
+    If skip_unchanged is True, commit() leaves the destination alone when
+    it already has exactly the bytes that were written, so that its
+    modification time doesn't change. The sizes are compared first, and the
+    destination is only read and hashed when they match.
+    """
+    def __init__(self, path, encoding=None,
+                 buffer_size=ds.WRITE_BUFFER_SIZE, fsync=False,
+                 skip_unchanged=False):
+        """
+        Initializer for OutputFile. Creates the temporary file.
+
+        :param path: string path of the file to write
+        :param encoding: Name of the encoding to write text with. Defaults
+            to UTF-8. Byte strings are written as they are
+        :param buffer_size: Number of characters to collect before encoding
+            and writing them
+        :param fsync: If True, flush the file to disk before committing it
+        :param skip_unchanged: If True, don't replace the destination if its
+            contents are identical to the new file
+        """
+        directory, name = os.path.split(path)
+        self.path = path
+        # The process ID keeps separate runs from sharing a temporary file
+        self.temp_path = os.path.join(directory, '.' + name + '.' +
+                                      str(os.getpid()) + '.anchorhub-tmp')
+        self.bytes_written = 0
+        self._encoding = encoding or 'utf-8'
+        self._buffer_size = buffer_size
+        self._fsync = fsync
+        self._hash = new_hash() if skip_unchanged else None
+        self._pending = []
+        self._pending_size = 0
+        self._file = io.open(self.temp_path, 'wb')
+        if os.path.exists(path):
+            # Keep the permissions of the file being replaced
+            shutil.copymode(path, self.temp_path)
+
+    def write(self, line):
+        """
+        Writes a line of text.
+
+        :param line: string to write, including its line ending
+        """
+        self._pending.append(line)
+        self._pending_size += len(line)
+        if self._pending_size >= self._buffer_size:
+            self._flush()
+
+    def writelines(self, lines):
+        """
+        Writes each line in lines.
+
+        :param lines: Iterable of strings, including their line endings
+        """
+        for line in lines:
+            self.write(line)
+
+    def commit(self):
+        """
+        Finishes writing, and moves the file into place, replacing any
+        existing file at its path.
+
+        :return: True if the file was moved into place, or False if it was
+            discarded because the destination was already identical
+        """
+        try:
+            self._flush()
+            if self._hash is not None and self._is_unchanged():
+                self.discard()
+                return False
+            if self._fsync:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            replace_file(self.temp_path, self.path)
+        except BaseException:
+            self.discard()
+            raise
+        return True
+
+    def discard(self):
+        """
+        Stops writing, and deletes the temporary file without touching the
+        file at its path.
+        """
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def _flush(self):
+        """
+        Encodes and writes the lines collected so far.
+        """
+        if not self._pending:
+            return
+        data = ''.join(self._pending)
+        if not isinstance(data, bytes):
+            data = data.encode(self._encoding)
+        self._file.write(data)
+        if self._hash is not None:
+            self._hash.update(data)
+        self.bytes_written += len(data)
+        self._pending = []
+        self._pending_size = 0
+
+    def _is_unchanged(self):
+        """
+        Checks whether the destination already has the contents written so
+        far.
+
+        :return: True if the destination exists with identical contents
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+        if size != self.bytes_written:
+            return False
+        return hash_file(self.path) == self._hash.hexdigest()
+
+
+def sync_directories(paths):
+    """
+    Flushes the directory entries of the directories containing paths to
+    disk, so that files moved into them survive a crash. Each directory is
+    synced once, however many of the paths it contains. Does nothing on
+    systems that can't sync directories, such as Windows.
+
+    :param paths: Iterable of string file paths
+    """
+    if os.name == 'nt':
+        return
+    for directory in sorted(set(os.path.dirname(p) for p in paths)):
+        fd = os.open(directory or os.curdir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,87 @@
+"""
+Class file for RangeSet
+"""
+from bisect import bisect_right
+from itertools import chain, repeat
+
+
+class RangeSet(object):
+    """
+    RangeSet is a compact set of integers, such as the indices of the lines
+    in a file that are inside of code blocks. It is stored as a sorted list
+    of [start, end) ranges, so a file with a handful of code blocks only
+    needs a handful of entries, however long the blocks are.
+
+    Integers must be added in increasing order. Consecutive integers are
+    merged into a single range.
+    """
+    def __init__(self, ranges=None):
+        """
+        Initializer for RangeSet.
+
+        :param ranges: Optional iterable of [start, end) pairs, in increasing
+            order and not overlapping
+        """
+        self._ranges = [[start, end] for start, end in ranges or []]
+        self._starts = None  # Range starts for bisect, built when needed
+
+    def add(self, index):
+        """
+        Adds index to the set. index must be greater than or equal to every
+        integer already in the set.
+
+        :param index: integer to add
+        """
+        if self._ranges and self._ranges[-1][1] == index:
+            self._ranges[-1][1] = index + 1
+        elif not self._ranges or self._ranges[-1][1] < index:
+            self._ranges.append([index, index + 1])
+            self._starts = None
+
+    def iter_mask(self):
+        """
+        Returns an iterator of booleans, one for each integer from 0
+        upwards, that are True for the integers in the set. It never ends,
+        so it can be zipped with lines of unknown length. Each step is
+        constant time.
+
+        :return: Infinite iterator of booleans
+        """
+        parts = []
+        previous_end = 0
+        for start, end in self._ranges:
+            parts.append(repeat(False, start - previous_end))
+            parts.append(repeat(True, end - start))
+            previous_end = end
+        parts.append(repeat(False))
+        return chain.from_iterable(parts)
+
+    def __contains__(self, index):
+        if self._starts is None:
+            self._starts = [start for start, end in self._ranges]
+        n = bisect_right(self._starts, index) - 1
+        return n >= 0 and index < self._ranges[n][1]
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self):
+        """
+        :return: The number of ranges (not integers) in the set
+        """
+        return len(self._ranges)
+
+    def __eq__(self, other):
+        try:
+            return self._ranges == [list(r) for r in other]
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'RangeSet(%r)' % self._ranges
@@ -0,0 +1,53 @@
+"""
+slugregistry.py - The SlugRegistry object, which keeps track of the anchor
+slugs used within a single file and hands out unique ones.
+"""
+
+
+class SlugRegistry(object):
+    """
+    SlugRegistry records the slugs (generated anchors) already used in a
+    file, and resolves duplicates the same way GitHub does: the first use of
+    a slug is kept as-is, and later uses get '-1', '-2', ... appended. A
+    suffixed slug that is already taken is skipped over, so every slug
+    handed out is unique.
+
+    For each slug, the registry remembers the last suffix handed out for
+    it, so resolving a duplicate takes O(1) amortized time instead of
+    scanning every slug used so far.
+    """
+    def __init__(self, slugs=None):
+        """
+        Initializer for SlugRegistry.
+
+        :param slugs: Optional iterable of slugs that are already in use
+        """
+        self._counts = {}  # Maps used slugs to the last suffix handed out
+        if slugs is not None:
+            for slug in slugs:
+                self._counts.setdefault(slug, 0)
+
+    def register(self, slug):
+        """
+        Registers slug, and returns the unique slug that should be used
+        for it.
+
+        :param slug: string slug generated from a header
+        :return: slug if it has not been used yet. Otherwise, slug with the
+            next free '-N' suffix appended
+        """
+        unique = slug
+        if slug in self._counts:
+            count = self._counts[slug]
+            while unique in self._counts:
+                count += 1
+                unique = slug + "-" + str(count)
+            self._counts[slug] = count
+        self._counts[unique] = 0
+        return unique
+
+    def __contains__(self, slug):
+        return slug in self._counts
+
+    def __len__(self):
+        return len(self._counts)
@@ -5,7 +5,8 @@ ArmedCheckSwitch:
 http://www.github.com/samjabrahams/anchorhub/lib/armedcheckswitch.py
 """
 
-from anchorhub.lib.armedcheckswitch import ArmedCheckSwitch
+from anchorhub.lib.armedcheckswitch import ArmedCheckSwitch, \
+    get_switch_prefixes
 
 
 def test_init_base():
@@ -137,3 +138,16 @@ def test_force():
     assert s.is_switched() == True
     s.force(False)
     assert s.is_switched() == False
+
+
+def test_get_switch_prefixes():
+    """
+    armedcheckswitch.py: Test get_prefix() and get_switch_prefixes()
+    """
+    s1 = ArmedCheckSwitch(prefix='```')
+    s2 = ArmedCheckSwitch(prefix='~~~')
+    assert s1.get_prefix() == '```'
+    assert sorted(get_switch_prefixes([s1, s2, s1])) == ['```', '~~~']
+    assert get_switch_prefixes([]) == ()
+    # A switch without a prefix has to be tried on every line
+    assert get_switch_prefixes([s1, ArmedCheckSwitch()]) is None
@@ -15,3 +15,10 @@ def test_file_to_list_basic():
            'test_data' + sep + 'filelist'
     assert FileToList.to_list(path) == ['Hello!\n', 'My name\n', 'is\n', \
                                         'AnchorHub']
+
+
+def test_file_iter_lines():
+    sep = get_path_separator()
+    path = get_anchorhub_path() + sep + 'lib' + sep + 'tests' + sep + \
+           'test_data' + sep + 'filelist'
+    assert list(FileToList.iter_lines(path)) == FileToList.to_list(path)
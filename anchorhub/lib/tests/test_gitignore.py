@@ -0,0 +1,75 @@
+"""
+Tests for the IgnoreRules class and gitignore helpers
+
+IgnoreRules:
+http://www.github.com/samjabrahams/anchorhub/lib/gitignore.py
+"""
+
+from anchorhub.lib.gitignore import IgnoreRules, is_ignored
+
+
+def test_match_names_and_paths():
+    """
+    lib/gitignore.py: Test patterns with and without a '/'
+    """
+    r = IgnoreRules(['# comment', '', '*.tmp.md', 'build/', '/TODO.md',
+                     'docs/draft*'])
+    assert r.match('notes.tmp.md', False)
+    assert r.match('a/b/notes.tmp.md', False)
+    assert r.match('build', True)
+    assert r.match('src/build', True)
+    assert r.match('build', False) is None
+    assert r.match('TODO.md', False)
+    assert r.match('sub/TODO.md', False) is None
+    assert r.match('docs/draft-1.md', False)
+    assert r.match('other/docs/draft-1.md', False) is None
+
+
+def test_negation():
+    """
+    lib/gitignore.py: Test that the last matching rule wins
+    """
+    r = IgnoreRules(['*.md', '!README.md'])
+    assert r.match('guide.md', False)
+    assert r.match('README.md', False) is False
+    assert IgnoreRules(['!README.md', '*.md']).match('README.md', False)
+
+
+def test_double_star():
+    """
+    lib/gitignore.py: Test '**' patterns
+    """
+    r = IgnoreRules(['**/gen', 'a/**/b', 'out/**'])
+    assert r.match('gen', True)
+    assert r.match('x/y/gen', True)
+    assert r.match('a/b', True)
+    assert r.match('a/x/y/b', True)
+    assert r.match('out/z.md', False)
+    assert r.match('out', True) is None
+    assert IgnoreRules(['a*b']).match('a/b', False) is None
+
+
+def test_escapes():
+    """
+    lib/gitignore.py: Test escaped special characters and trailing spaces
+    """
+    r = IgnoreRules(['\\#notes.md', '\\!bang.md', 'star\\*.md', 'space\\ '])
+    assert r.match('#notes.md', False)
+    assert r.match('!bang.md', False)
+    assert r.match('star*.md', False)
+    assert r.match('stars.md', False) is None
+    assert r.match('space ', False)
+    assert IgnoreRules(['file.md   ']).match('file.md', False)
+
+
+def test_is_ignored_chain():
+    """
+    lib/gitignore.py: Test that deeper rules take precedence
+    """
+    chain = (('', IgnoreRules(['*.md'])),
+             ('docs/', IgnoreRules(['!keep.md'])))
+    assert is_ignored(chain, 'a.md', False)
+    assert is_ignored(chain, 'docs/a.md', False)
+    assert not is_ignored(chain, 'docs/keep.md', False)
+    assert not is_ignored(chain, 'a.txt', False)
+    assert not IgnoreRules(['# only a comment'])
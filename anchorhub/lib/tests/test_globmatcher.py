@@ -0,0 +1,41 @@
+"""
+Tests for the GlobMatcher class
+
+GlobMatcher:
+http://www.github.com/samjabrahams/anchorhub/lib/globmatcher.py
+"""
+
+from anchorhub.lib.globmatcher import GlobMatcher
+
+
+def test_match_names():
+    """
+    lib/globmatcher.py: Test patterns matched against names
+    """
+    g = GlobMatcher(['node_modules', '.git/', '*.tmp.md'])
+    assert g.match('node_modules')
+    assert g.match('a/b/node_modules')
+    assert g.match('.git')
+    assert g.match('docs/notes.tmp.md')
+    assert not g.match('node_modules_backup')
+    assert not g.match('docs/notes.md')
+
+
+def test_match_paths():
+    """
+    lib/globmatcher.py: Test patterns matched against relative paths
+    """
+    g = GlobMatcher(['docs/vendor', 'third_party/*/docs'])
+    assert g.match('docs/vendor')
+    assert g.match('third_party/lib/docs')
+    assert not g.match('vendor')
+    assert not g.match('other/docs/vendor')
+
+
+def test_empty():
+    """
+    lib/globmatcher.py: Test that a GlobMatcher without patterns is False
+    """
+    assert not GlobMatcher([])
+    assert not GlobMatcher([]).match('anything')
+    assert GlobMatcher(['*.md'])
@@ -0,0 +1,71 @@
+"""
+Tests for the LineWindow class
+
+LineWindow:
+http://www.github.com/samjabrahams/anchorhub/lib/linewindow.py
+"""
+from anchorhub.lib.linewindow import LineWindow
+
+
+def test_iterate():
+    """
+    lib/linewindow.py: Test that iterating yields every line in order
+    """
+    lines = ['a\n', 'b\n', 'c']
+    assert list(LineWindow(lines)) == lines
+    assert list(LineWindow([])) == []
+    assert list(LineWindow(iter(lines), lookahead=5)) == lines
+
+
+def test_lookahead():
+    """
+    lib/linewindow.py: Test indexing into the window while iterating
+    """
+    w = LineWindow(iter(['a', 'b', 'c']))
+    seen = []
+    for i, line in enumerate(w):
+        assert w[i] == line
+        seen.append(i < len(w) - 1 and w[i + 1])
+    assert seen == ['b', 'c', False]
+    assert len(w) == 3
+
+
+def test_outside_window():
+    """
+    lib/linewindow.py: Test that lines outside of the window raise an
+    IndexError
+    """
+    w = LineWindow(iter(['a', 'b', 'c', 'd']))
+    lines = iter(w)
+    next(lines)
+    next(lines)
+    for index in (-1, 0, 3):
+        try:
+            w[index]
+        except IndexError:
+            pass
+        else:
+            assert False, "IndexError was not raised for " + str(index)
+    assert w[1] == 'b'
+    assert w[2] == 'c'
+
+
+def test_fill():
+    """
+    lib/linewindow.py: Test reading lines past the lookahead with fill()
+    """
+    w = LineWindow(iter(['a', 'b', 'c', 'd', 'e']))
+    lines = iter(w)
+    assert next(lines) == 'a'
+    w.fill(3)
+    assert [w[i] for i in range(4)] == ['a', 'b', 'c', 'd']
+    assert len(w) == 4
+    # The lines already read are kept until iteration reaches them
+    assert next(lines) == 'b'
+    assert w[3] == 'd'
+    assert list(lines) == ['c', 'd', 'e']
+    # Filling past the end of the lines stops at the last line
+    w = LineWindow(iter(['a', 'b']))
+    next(iter(w))
+    w.fill(5)
+    assert len(w) == 2
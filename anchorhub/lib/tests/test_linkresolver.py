@@ -0,0 +1,54 @@
+"""
+Tests for the LinkResolver class
+
+LinkResolver:
+http://www.github.com/samjabrahams/anchorhub/lib/linkresolver.py
+"""
+import os.path
+
+from anchorhub.lib.linkresolver import LinkResolver, resolve_link
+
+
+def test_resolve_link():
+    """
+    lib/linkresolver.py: Test resolving relative and absolute links
+    """
+    root = os.path.abspath(os.sep)
+    docs = os.path.join(root, 'docs')
+    assert resolve_link(docs, 'a.md') == os.path.join(docs, 'a.md')
+    assert resolve_link(docs, os.path.join(root, 'b.md')) == \
+        os.path.join(root, 'b.md')
+
+
+def test_resolve_link_normalization():
+    """
+    lib/linkresolver.py: Test that different spellings of a link resolve to
+    the same path
+    """
+    docs = os.path.join(os.path.abspath(os.sep), 'docs')
+    expected = os.path.join(os.path.dirname(docs), 'api', 'My File.md')
+    for link_path in ['../api/My File.md', './../api/My%20File.md',
+                      '../api/./My File.md', '../api//My%20File.md',
+                      '../other/../api/My File.md']:
+        assert resolve_link(docs, link_path) == expected
+    assert resolve_link(docs, 'caf%C3%A9.md') == \
+        os.path.join(docs, u'caf\xe9.md')
+
+
+def test_link_resolver():
+    """
+    lib/linkresolver.py: Test that LinkResolver remembers resolved links
+    for each source directory
+    """
+    docs = os.path.join(os.path.abspath(os.sep), 'docs')
+    r = LinkResolver(cache_size=2)
+    a = r.resolve(os.path.join(docs, 'a.md'), '../b.md')
+    assert a == resolve_link(docs, '../b.md')
+    # Files in the same directory share the entry
+    assert r.resolve(os.path.join(docs, 'c.md'), '../b.md') is a
+    assert len(r._memo) == 1
+    # The same link from another directory is resolved separately
+    sub = os.path.join(docs, 'sub')
+    assert r.resolve(os.path.join(sub, 'a.md'), '../b.md') == \
+        os.path.join(docs, 'b.md')
+    assert len(r._memo) == 2
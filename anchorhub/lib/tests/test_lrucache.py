@@ -0,0 +1,46 @@
+"""
+Tests for the LRUCache class
+
+LRUCache:
+http://www.github.com/samjabrahams/anchorhub/lib/lrucache.py
+"""
+
+from nose.tools import raises
+
+from anchorhub.lib.lrucache import LRUCache
+
+
+def test_get_put():
+    """
+    lib/lrucache.py: Test storing and retrieving values
+    """
+    c = LRUCache(2)
+    assert c.get("a") is None
+    assert c.get("a", 5) == 5
+    c.put("a", 1)
+    assert c.get("a") == 1
+    assert "a" in c
+    assert len(c) == 1
+
+
+def test_eviction():
+    """
+    lib/lrucache.py: Test that the least recently used entry is evicted
+    """
+    c = LRUCache(2)
+    c.put("a", 1)
+    c.put("b", 2)
+    c.get("a")  # "b" is now the least recently used
+    c.put("c", 3)
+    assert "b" not in c
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+    assert len(c) == 2
+
+
+@raises(ValueError)
+def test_max_size():
+    """
+    lib/lrucache.py: Test that an LRUCache must hold at least one entry
+    """
+    LRUCache(0)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the OutputFile class
+
+OutputFile:
+http://www.github.com/samjabrahams/anchorhub/lib/outputfile.py
+"""
+import io
+import os
+import shutil
+import tempfile
+
+from anchorhub.lib.outputfile import OutputFile, sync_directories
+
+
+def _read_bytes(path):
+    """
+    Reads the raw contents of the file at path
+
+    :param path: string file path to read
+    :return: bytes contents of the file
+    """
+    with io.open(path, 'rb') as f:
+        return f.read()
+
+
+def test_commit():
+    """
+    lib/outputfile.py: Test that committed lines replace the file, and that
+    small buffers don't change the output
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'out.md')
+        with open(path, 'w') as f:
+            f.write("Old contents\n")
+        lines = [u'Line ' + str(n) + u'\n' for n in range(100)]
+        output = OutputFile(path, buffer_size=16)
+        output.writelines(lines)
+        # Nothing is replaced until the file is committed
+        assert _read_bytes(path) == b'Old contents\n'
+        output.commit()
+        expected = u''.join(lines).encode('utf-8')
+        assert _read_bytes(path) == expected
+        assert output.bytes_written == len(expected)
+        assert os.listdir(d) == ['out.md']
+    finally:
+        shutil.rmtree(d)
+
+
+def test_encoding():
+    """
+    lib/outputfile.py: Test writing with a given encoding
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'out.md')
+        output = OutputFile(path, encoding='latin-1')
+        output.write(u'# Café\n')
+        output.commit()
+        assert _read_bytes(path) == u'# Café\n'.encode('latin-1')
+        assert output.bytes_written == 7
+    finally:
+        shutil.rmtree(d)
+
+
+def test_discard():
+    """
+    lib/outputfile.py: Test that discarding leaves the file untouched
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'out.md')
+        output = OutputFile(path)
+        output.write(u'Never written\n')
+        output.discard()
+        assert os.listdir(d) == []
+    finally:
+        shutil.rmtree(d)
+
+
+def test_fsync():
+    """
+    lib/outputfile.py: Test committing with fsync, and syncing directories
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'out.md')
+        output = OutputFile(path, fsync=True)
+        output.write(u'Synced\n')
+        output.commit()
+        sync_directories([path, os.path.join(d, 'other.md')])
+        assert _read_bytes(path) == b'Synced\n'
+    finally:
+        shutil.rmtree(d)
+
+
+def test_skip_unchanged():
+    """
+    lib/outputfile.py: Test that identical files aren't replaced, while
+    files of the same size with other contents are
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'out.md')
+        with open(path, 'w') as f:
+            f.write("Same\n")
+        inode = os.stat(path).st_ino
+
+        output = OutputFile(path, skip_unchanged=True)
+        output.write(u'Same\n')
+        assert not output.commit()
+        assert os.stat(path).st_ino == inode
+        assert os.listdir(d) == ['out.md']
+
+        output = OutputFile(path, skip_unchanged=True)
+        output.write(u'Diff\n')
+        assert output.commit()
+        assert _read_bytes(path) == b'Diff\n'
+    finally:
+        shutil.rmtree(d)
@@ -0,0 +1,44 @@
+"""
+Tests for the RangeSet class
+
+RangeSet:
+http://www.github.com/samjabrahams/anchorhub/lib/rangeset.py
+"""
+from itertools import islice
+
+from anchorhub.lib.rangeset import RangeSet
+
+
+def test_add():
+    """
+    lib/rangeset.py: Test that add() merges consecutive integers into ranges
+    """
+    r = RangeSet()
+    for i in [1, 2, 3, 3, 6, 8, 9]:
+        r.add(i)
+    assert r == [[1, 4], [6, 7], [8, 10]]
+    assert len(r) == 3
+    assert r != [[1, 4]]
+    assert RangeSet() == []
+
+
+def test_contains():
+    """
+    lib/rangeset.py: Test membership checks
+    """
+    r = RangeSet([(1, 4), (6, 7)])
+    assert [i for i in range(10) if i in r] == [1, 2, 3, 6]
+    r.add(9)
+    assert 9 in r
+    assert 8 not in r
+
+
+def test_iter_mask():
+    """
+    lib/rangeset.py: Test that iter_mask() matches membership checks, and
+    keeps going past the last range
+    """
+    r = RangeSet([(0, 2), (5, 6)])
+    mask = list(islice(r.iter_mask(), 10))
+    assert mask == [i in r for i in range(10)]
+    assert not any(islice(RangeSet().iter_mask(), 10))
@@ -0,0 +1,42 @@
+"""
+Tests for the SlugRegistry class
+
+SlugRegistry:
+http://www.github.com/samjabrahams/anchorhub/lib/slugregistry.py
+"""
+
+from anchorhub.lib.slugregistry import SlugRegistry
+
+
+def test_register():
+    """
+    lib/slugregistry.py: Test that duplicate slugs get increasing suffixes
+    """
+    s = SlugRegistry()
+    assert s.register("foo") == "foo"
+    assert s.register("foo") == "foo-1"
+    assert s.register("bar") == "bar"
+    assert s.register("foo") == "foo-2"
+    assert "foo-2" in s
+    assert "foo-3" not in s
+    assert len(s) == 4
+
+
+def test_register_taken_suffix():
+    """
+    lib/slugregistry.py: Test that suffixed slugs that are already used are
+    skipped, matching GitHub
+    """
+    s = SlugRegistry()
+    assert s.register("foo-1") == "foo-1"
+    assert s.register("foo") == "foo"
+    assert s.register("foo") == "foo-2"
+    assert s.register("foo-1") == "foo-1-1"
+
+
+def test_init_slugs():
+    """
+    lib/slugregistry.py: Test SlugRegistry initialized with existing slugs
+    """
+    s = SlugRegistry(["foo", "foo-1"])
+    assert s.register("foo") == "foo-2"
@@ -2,15 +2,23 @@
 Command-line entry to AnchorHub, main method is here.
 """
 
+import os.path
+
+import anchorhub as ah
 import anchorhub.cmdparse as cmdparse
+import anchorhub.dependencies as dependencies
 import anchorhub.fileparse as fileparse
 import anchorhub.messages as messages
+import anchorhub.mirror as mirror
 import anchorhub.normalization.normalize_opts as normalize_opts
+import anchorhub.settings.default_settings as ds
 import anchorhub.validation.validate_opts as validate_opts
 import anchorhub.validation.validate_files as validate_files
 import anchorhub.validation.validate_anchors as validate_anchors
+from anchorhub.cache import AnchorCache, CACHE_FORMAT
 from anchorhub.builtin.github.collector import make_github_markdown_collector
 from anchorhub.builtin.github.writer import make_github_markdown_writer
+from anchorhub.util.prefetch import prefetch
 
 
 def main(argv=None):
@@ -30,29 +38,105 @@ def main(argv=None):
         # Update client: print input and output directories
         messages.print_input_output(opts)
 
-    file_paths = fileparse.get_file_list(opts)
-    assert validate_files.validate(file_paths, opts)
-
-    if opts.verbose and opts.is_dir:
-        # Update client: print files that will be parsed
-        messages.print_files(opts, file_paths)
+    if opts.stream:
+        # Search for files in the background, and collect each one as soon
+        # as it is found. The files are validated once they are all found
+        file_paths = prefetch(fileparse.iter_file_list(opts),
+                              ds.STREAM_QUEUE_SIZE)
+    else:
+        file_paths = fileparse.get_file_list(opts)
+        _check_files(file_paths, opts)
 
     # For now, only using default GitHub Markdown for parsing
     # Collect tag/anchor combinations
     collector = make_github_markdown_collector(opts)
-    anchors, duplicate_tags = collector.collect(file_paths)
+    cache = None
+    if opts.cache or opts.incremental:
+        # Reuse tags collected from files that haven't changed
+        cache = AnchorCache(opts.abs_cache, {'format': CACHE_FORMAT,
+                                             'version': ah.__version__,
+                                             'wrapper': opts.wrapper,
+                                             'encoding': opts.encoding})
+        cache.load()
+    anchors, duplicate_tags = collector.collect(
+        file_paths, workers=opts.jobs, keep_documents=opts.read_once,
+        cache=cache)
+    if opts.stream:
+        file_paths = collector.get_file_paths()
+        _check_files(file_paths, opts)
+    if opts.verbose:
+        if cache is not None:
+            # Update client: print how many files were taken from the cache
+            messages.print_cache_stats(cache.hits, len(file_paths))
+        # Update client: print how many lines the strategies could skip
+        messages.print_screened_lines(*collector.get_screened_lines())
     assert validate_anchors.validate(anchors, duplicate_tags, opts)
 
     # Write files using previously found AnchorHub tags and generated anchors
     writer = make_github_markdown_writer(opts)
-    counter = writer.write(file_paths, anchors, opts)
+    write_paths = file_paths
+    if opts.incremental:
+        # Only write files affected by changes since the previous run
+        write_paths = dependencies.get_dirty_files(
+            file_paths, anchors, cache,
+            lambda f: os.path.exists(writer.get_output_path(f, opts)))
+        if opts.verbose:
+            messages.print_incremental_stats(len(write_paths),
+                                             len(file_paths))
+    counter = writer.write(write_paths, anchors, opts, workers=opts.jobs,
+                           documents=collector.get_documents(),
+                           record_links=cache is not None,
+                           ignored=collector.get_ignored_ranges())
+    if cache is not None:
+        # Remember what each written file links to for the next run
+        modified_files = set(writer.get_modified_files())
+        links = writer.get_links()
+        for file_path in write_paths:
+            cache.set_links(file_path, links[file_path],
+                            file_path in modified_files)
+        cache.save(fsync=opts.fsync)
+
+    mirror_counts = None
+    if opts.mirror and opts.is_dir:
+        # Fill in the output directory with the files that weren't written
+        skip = set(writer.get_modified_files())
+        if opts.incremental:
+            # Files that weren't written again keep last run's output
+            written = set(write_paths)
+            skip.update(f for f in file_paths if f not in written and
+                        (cache.get_previous(f) or {}).get('modified'))
+        mirror_counts = mirror.mirror_files(fileparse.iter_mirror_list(opts),
+                                            opts, skip, opts.mirror)
 
     if opts.verbose:
         if opts.is_dir:
             # Update client: print files that had modifications
-            messages.print_modified_files(opts, anchors)
+            messages.print_modified_files(opts,
+                                          writer.get_modified_files(),
+                                          writer.get_bytes_written())
         # Print summary statistics
-        messages.print_summary_stats(counter)
+        if opts.skip_unchanged:
+            messages.print_summary_stats(
+                counter, len(writer.get_bytes_written()),
+                len(writer.get_skipped_files()))
+        else:
+            messages.print_summary_stats(counter)
+        if mirror_counts is not None:
+            messages.print_mirror_stats(mirror_counts)
+
+
+def _check_files(file_paths, opts):
+    """
+    Validates the list of files to parse, and prints it in verbose mode.
+
+    :param file_paths: List of string file paths to be parsed
+    :param opts: Namespace containing AnchorHub options
+    """
+    assert validate_files.validate(file_paths, opts)
+
+    if opts.verbose and opts.is_dir:
+        # Update client: print files that will be parsed
+        messages.print_files(opts, file_paths)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
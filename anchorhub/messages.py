@@ -47,6 +47,58 @@ def print_no_files_found(opts):
     print(msg)
 
 
+def print_cache_stats(hits, total):
+    """
+    Prints how many files had their AnchorHub tags taken from the cache
+    instead of being parsed.
+
+    :param hits: Number of files whose tags were taken from the cache
+    :param total: Total number of files
+    """
+    print("Unchanged files taken from cache: " + str(hits) + " of " +
+          str(total) + "\n")
+
+
+def print_screened_lines(screened, total):
+    """
+    Prints how many lines were skipped by the Collector's prefilters.
+
+    :param screened: Number of lines that no strategy had to examine
+    :param total: Total number of lines examined by the Collector
+    """
+    print("Lines skipped by pre-screening: " + str(screened) + " of " +
+          str(total) + "\n")
+
+
+def print_incremental_stats(written, total):
+    """
+    Prints how many files were written during an incremental run.
+
+    :param written: Number of files that needed to be written again
+    :param total: Total number of files
+    """
+    print("Files rewritten after changes: " + str(written) + " of " +
+          str(total) + "\n")
+
+
+def print_mirror_stats(counts):
+    """
+    Prints how many files were mirrored into the output directory, and how.
+
+    :param counts: Dictionary mapping the method used to mirror files (such
+        as 'link' or 'copy') to the number of files mirrored with it.
+        Files that were already up to date are counted under 'up-to-date'
+    """
+    up_to_date = counts.get('up-to-date', 0)
+    mirrored = sum(counts.values()) - up_to_date
+    methods = ', '.join(method + ": " + str(counts[method])
+                        for method in sorted(counts)
+                        if method != 'up-to-date')
+    print("\nFiles mirrored to output: " + str(mirrored) +
+          (" (" + methods + ")" if methods else ""))
+    print("Mirrored files already up to date: " + str(up_to_date))
+
+
 def print_duplicate_anchor_information(duplicate_tags):
     """
     Prints information about duplicate AnchorHub tags found during collection.
@@ -68,21 +120,32 @@ def print_duplicate_anchor_information(duplicate_tags):
                   " :\t" + line_info[2])            # Previously created anchor
 
 
-def print_modified_files(opts, anchors):
+def print_modified_files(opts, file_paths, bytes_written=None):
     """
     Prints out which files were modified amongst those looked at
 
-    :param anchors: Dictionary mapping file path strings to dictionaries
-        containing AnchorHub tag/generated header key-value pairs
+    :param file_paths: List of string file paths that were modified, in the
+        order they should be printed
+    :param bytes_written: Optional dictionary mapping file paths to the
+        number of bytes written for them. Files missing from it are listed
+        as unchanged
     """
     print("Files with modifications:")
-    for file_path in anchors:
-        print("  " + strip_prefix(file_path, opts.abs_input))
+    for file_path in file_paths:
+        line = "  " + strip_prefix(file_path, opts.abs_input)
+        if bytes_written is not None and file_path in bytes_written:
+            line += " (" + str(bytes_written[file_path]) + " bytes)"
+        elif bytes_written is not None:
+            line += " (unchanged)"
+        print(line)
     print("--------------------")
-    print(str(len(anchors)) + " total\n")
+    total = str(len(file_paths)) + " total"
+    if bytes_written is not None:
+        total += ", " + str(sum(bytes_written.values())) + " bytes written"
+    print(total + "\n")
 
 
-def print_summary_stats(counter):
+def print_summary_stats(counter, written=None, skipped=None):
     """
     Prints summary statistics about which writer strategies were used,
     and how much they were used.
@@ -90,6 +153,10 @@ def print_summary_stats(counter):
     :param counter: A list of lists. The first entry on the inner list is a
         number count of how many times a WriterStrategy was used, and the
         second entry is a string label describing the WriterStrategy
+    :param written: Optional number of files that were written
+    :param skipped: Optional number of modified files that were not written,
+        because their output was unchanged. If provided, the number of
+        written and skipped files is printed
     """
     sum = 0     # Sum of labeled WriterStrategy modifications
     u_sum = 0   # Sum of unlabeled WriterStrategy modifications
@@ -102,3 +169,6 @@ def print_summary_stats(counter):
     if u_sum > 0:
         print("Unlabeled modifications: \t" + str(u_sum))
     print("Total modifications: \t\t" + str(sum + u_sum))
+    if skipped is not None:
+        print("Files written: \t\t\t" + str(written))
+        print("Files skipped (unchanged): \t" + str(skipped))
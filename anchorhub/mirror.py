@@ -0,0 +1,141 @@
+"""
+Functions for mirroring the input directory into the output directory, so
+that the output directory is a complete copy of the input, and not only the
+files that AnchorHub modified.
+
+Files are linked or copied with the cheapest method that works (see
+copy_file()). A copied file keeps the modification time of its source, so
+later runs can tell that a mirrored file is already up to date without
+reading it.
+"""
+import os
+import os.path
+import shutil
+
+from anchorhub.util.copyfile import copy_file
+from anchorhub.util.makedirs import make_dirs
+from anchorhub.util.replacefile import replace_file
+from anchorhub.util.stripprefix import strip_prefix
+
+# Mirror modes accepted by mirror_files()
+MODES = ('copy', 'link')
+
+
+def mirror_files(file_paths, opts, skip=(), mode='copy'):
+    """
+    Mirrors each file in file_paths into the output directory, unless it is
+    in skip or its mirror is already up to date.
+
+    :param file_paths: Iterable of string file paths inside of
+        opts.abs_input
+    :param opts: Namespace containing AnchorHub options. Must contain
+        'abs_input' and 'abs_output'
+    :param skip: Collection of file paths that must not be mirrored, such
+        as the files that the Writer wrote modified versions of
+    :param mode: 'copy' to copy the files, or 'link' to create hard links to
+        them where possible. Hard links share their contents with the input
+        files, so later changes to one also show up in the other. Files that
+        can't be linked (for example, on another file system) are copied
+    :return: Dictionary mapping the method used ('link', or a method
+        returned by copy_file()) to the number of files mirrored with it.
+        Files that were already up to date are counted under 'up-to-date'
+    """
+    counts = {}
+    for file_path in file_paths:
+        if file_path in skip:
+            continue
+        destination = opts.abs_output + strip_prefix(file_path,
+                                                     opts.abs_input)
+        if _is_up_to_date(file_path, destination):
+            method = 'up-to-date'
+        else:
+            method = mirror_file(file_path, destination, mode)
+        counts[method] = counts.get(method, 0) + 1
+    return counts
+
+
+def mirror_file(source, destination, mode='copy'):
+    """
+    Links or copies source to destination. The new file is created next to
+    destination under a temporary name, and then moved into place, so an
+    interrupted mirror never leaves a partial file at destination.
+
+    :param source: string path of the file to mirror
+    :param destination: string path of the mirrored file
+    :param mode: 'copy' or 'link'. See mirror_files()
+    :return: string name of the method used: 'link', or one of the methods
+        returned by copy_file()
+    """
+    directory, name = os.path.split(destination)
+    make_dirs(directory)
+    temp_path = os.path.join(directory, '.' + name + '.' + str(os.getpid()) +
+                             '.anchorhub-tmp')
+    try:
+        method = None
+        if mode == 'link' and hasattr(os, 'link'):
+            try:
+                os.link(source, temp_path)
+                method = 'link'
+            except OSError:
+                pass
+        if method is None:
+            method = copy_file(source, temp_path)
+            # Keep the modification time, to tell when it is up to date
+            shutil.copystat(source, temp_path)
+            _copy_times_ns(source, temp_path)
+        replace_file(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return method
+
+
+def _is_up_to_date(source, destination):
+    """
+    Checks whether destination is already a mirror of source: either the
+    same file (a hard link), or a copy with the same size and modification
+    time.
+
+    :param source: string path of the file to mirror
+    :param destination: string path of the mirrored file
+    :return: True if destination doesn't need to be mirrored again
+    """
+    try:
+        dst = os.stat(destination)
+    except OSError:
+        return False
+    src = os.stat(source)
+    if src.st_ino and (src.st_dev, src.st_ino) == (dst.st_dev, dst.st_ino):
+        return True
+    return src.st_size == dst.st_size and _same_mtime(src, dst)
+
+
+def _copy_times_ns(source, destination):
+    """
+    Copies the access and modification times of source to destination to
+    the nanosecond, where os.utime() supports it. shutil.copystat() goes
+    through floats, which can lose precision.
+
+    :param source: string path of the file to copy the times from
+    :param destination: string path of the file to set the times of
+    """
+    st = os.stat(source)
+    if hasattr(st, 'st_mtime_ns'):
+        # Python 3.3+, which also has os.utime(ns=...)
+        os.utime(destination, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _same_mtime(src, dst):
+    """
+    Compares the modification times of two stat results. Without
+    nanosecond times (Python 2), times within a microsecond are the same,
+    as that is all the precision shutil.copystat() keeps.
+
+    :param src: os.stat() result of the source file
+    :param dst: os.stat() result of the destination file
+    :return: True if the modification times match
+    """
+    if hasattr(src, 'st_mtime_ns'):
+        return src.st_mtime_ns == dst.st_mtime_ns
+    return abs(src.st_mtime - dst.st_mtime) < 1e-6
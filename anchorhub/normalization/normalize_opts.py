@@ -5,6 +5,7 @@ validation and use.
 import os.path as path
 import re
 
+import anchorhub.settings.default_settings as ds
 from anchorhub.lib.bunch import Bunch
 from anchorhub.util.addsuffix import add_suffix
 from anchorhub.compatibility import get_path_separator
@@ -23,6 +24,7 @@ def normalize(opts):
     add_is_dir(opts_dict)
     ensure_directories_end_in_separator(opts_dict)
     add_abs_path_directories(opts_dict)
+    add_abs_cache_path(opts_dict)
     add_open_close_wrappers(opts_dict)
     add_wrapper_regex(opts_dict)
     return Bunch(opts_dict)
@@ -43,6 +45,24 @@ def add_abs_path_directories(opts_dict):
         get_path_separator()
 
 
+def add_abs_cache_path(opts_dict):
+    """
+    Adds 'abs_cache' to opts_dict: the absolute path of the AnchorHub cache
+    file. It is located in the input directory, or in the directory
+    containing the input file. Assumes 'abs_input' and 'is_dir' are already
+    in opts_dict
+
+    :param opts_dict: dictionary that will be modified
+    """
+    assert 'abs_input' in opts_dict
+    assert 'is_dir' in opts_dict
+    if opts_dict['is_dir']:
+        opts_dict['abs_cache'] = opts_dict['abs_input'] + ds.CACHE
+    else:
+        opts_dict['abs_cache'] = path.join(
+            path.dirname(opts_dict['abs_input']), ds.CACHE)
+
+
 def add_open_close_wrappers(opts_dict):
     """
     Adds 'open' and 'close' to opts_dict. 'open' indicates the opening
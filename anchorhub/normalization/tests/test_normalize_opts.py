@@ -58,6 +58,20 @@ def test_abs_path_directories():
     assert a['abs_output'] == path.abspath('anchorhub-out')+get_path_separator()
 
 
+def test_add_abs_cache_path():
+    """
+    normalize_opts.py: Test add_abs_cache_path()
+    """
+    sep = get_path_separator()
+    a = {'abs_input': sep + 'docs' + sep, 'is_dir': True}
+    n.add_abs_cache_path(a)
+    assert a['abs_cache'] == sep + 'docs' + sep + '.anchorhub-cache'
+
+    b = {'abs_input': sep + 'docs' + sep + 'file.md', 'is_dir': False}
+    n.add_abs_cache_path(b)
+    assert b['abs_cache'] == sep + 'docs' + sep + '.anchorhub-cache'
+
+
 def test_add_open_close_wrapper():
     """
     normalize_opts.py: Test add_open_close_wrapper()
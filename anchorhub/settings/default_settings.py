@@ -6,6 +6,11 @@ WRAPPER = '{ }'
 
 INPUT = '.'
 OUTPUT = 'anchorhub-out'
+CACHE = '.anchorhub-cache'
+SLUG_CACHE_SIZE = 4096
+LINK_CACHE_SIZE = 4096
+STREAM_QUEUE_SIZE = 256
+WRITE_BUFFER_SIZE = 65536
 
 ARGPARSER = {
     'description': "anchorhub parses through Markdown files and precompiles "
@@ -35,4 +40,54 @@ ARGPARSE_VERBOSE = {
 ARGPARSE_RECURSIVE = {
     'help': "Perform AnchorHub in the file hierarchy rooted with the input "
             "argument. AnchorHub tags are maintained across the file hierarchy"
-}
\ No newline at end of file
+}
+ARGPARSE_JOBS = {
+    'help': "Number of worker processes used to parse files (default is 1)",
+    'default': 1
+}
+ARGPARSE_READ_ONCE = {
+    'help': "Read each file from disk only once, keeping its lines in memory "
+            "between collecting tags and writing output"
+}
+ARGPARSE_CACHE = {
+    'help': "Cache collected tags in a \"" + CACHE + "\" file in the input "
+            "directory, and only re-parse files that changed since the "
+            "previous run"
+}
+ARGPARSE_EXCLUDE = {
+    'help': "Skip files and directories matching this glob-style pattern. "
+            "Patterns containing a '/' are matched against the path relative "
+            "to the input directory, and other patterns against the file or "
+            "directory name. May be given multiple times"
+}
+ARGPARSE_GITIGNORE = {
+    'help': "Skip files and directories ignored by .gitignore and .ignore "
+            "files"
+}
+ARGPARSE_ENCODING = {
+    'help': "Encoding used to read and write files (default is to read with "
+            "the system's encoding, and write UTF-8)"
+}
+ARGPARSE_FSYNC = {
+    'help': "Flush every written file to disk before it replaces the "
+            "previous version, so that output survives a system crash"
+}
+ARGPARSE_SKIP_UNCHANGED = {
+    'help': "Don't rewrite output files that already have the same "
+            "contents, so that their modification times don't change"
+}
+ARGPARSE_MIRROR = {
+    'help': "Also copy the files that don't need modifications into the "
+            "output directory, so that it mirrors the whole input directory. "
+            "MODE is 'copy' (the default), or 'link' to use hard links "
+            "where possible",
+    'choices': ['copy', 'link']
+}
+ARGPARSE_STREAM = {
+    'help': "Start parsing files while the rest of the input directory is "
+            "still being searched"
+}
+ARGPARSE_INCREMENTAL = {
+    'help': "Only rewrite files that changed since the previous run, "
+            "and files that link to anchors that changed. Implies --cache"
+}
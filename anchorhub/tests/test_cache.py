@@ -0,0 +1,94 @@
+"""
+Tests for cache.py
+
+cache.py:
+http://www.github.com/samjabrahams/anchorhub/anchorhub/cache.py
+"""
+import os
+import shutil
+import tempfile
+
+from anchorhub.cache import AnchorCache, CACHE_FORMAT
+from anchorhub.tests.textfiles import write_text
+
+
+def test_cache_round_trip():
+    """
+    cache.py: Test that saved entries are reused until the file changes
+    """
+    d = tempfile.mkdtemp()
+    try:
+        md = os.path.join(d, 'file.md')
+        cache_path = os.path.join(d, '.anchorhub-cache')
+        write_text(md, '# Header {#tag}\n')
+
+        cache = AnchorCache(cache_path, {'wrapper': '{ }'})
+        cache.load()
+        assert cache.get(md) is None
+        cache.put(md, {'tag': 'header'}, [])
+        cache.save()
+
+        cache = AnchorCache(cache_path, {'wrapper': '{ }'})
+        cache.load()
+        assert cache.get(md) == ({'tag': 'header'}, [])
+        assert cache.hits == 1
+
+        # Same contents with a new modification time is still a hit
+        stat = os.stat(md)
+        os.utime(md, (stat.st_atime, stat.st_mtime + 10))
+        assert cache.get(md) == ({'tag': 'header'}, [])
+
+        # Changed contents is a miss
+        write_text(md, '# Other header {#tag}\n')
+        assert cache.get(md) is None
+    finally:
+        shutil.rmtree(d)
+
+
+def test_cache_settings_mismatch():
+    """
+    cache.py: Test that a cache saved with different settings is ignored
+    """
+    d = tempfile.mkdtemp()
+    try:
+        md = os.path.join(d, 'file.md')
+        cache_path = os.path.join(d, '.anchorhub-cache')
+        write_text(md, '# Header {#tag}\n')
+
+        settings = {'format': CACHE_FORMAT, 'wrapper': '{ }',
+                    'encoding': None}
+        cache = AnchorCache(cache_path, settings)
+        cache.put(md, {'tag': 'header'}, [])
+        cache.save()
+
+        for key, value in [('wrapper', '[ ]'), ('encoding', 'latin-1'),
+                           ('format', CACHE_FORMAT + 1)]:
+            changed = dict(settings)
+            changed[key] = value
+            cache = AnchorCache(cache_path, changed)
+            cache.load()
+            assert cache.get(md) is None, key
+
+        cache = AnchorCache(cache_path, dict(settings))
+        cache.load()
+        assert cache.get(md) == ({'tag': 'header'}, [])
+    finally:
+        shutil.rmtree(d)
+
+
+def test_cache_corrupt_file():
+    """
+    cache.py: Test that an unreadable cache file is treated as empty
+    """
+    d = tempfile.mkdtemp()
+    try:
+        md = os.path.join(d, 'file.md')
+        cache_path = os.path.join(d, '.anchorhub-cache')
+        write_text(md, '# Header {#tag}\n')
+        write_text(cache_path, '{not json')
+
+        cache = AnchorCache(cache_path)
+        cache.load()
+        assert cache.get(md) is None
+    finally:
+        shutil.rmtree(d)
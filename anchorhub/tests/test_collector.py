@@ -0,0 +1,179 @@
+"""
+Tests for collector.py
+
+collector.py:
+http://www.github.com/samjabrahams/anchorhub/anchorhub/collector.py
+"""
+import os
+import shutil
+import tempfile
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.cache import AnchorCache
+from anchorhub.fileparse import get_file_list, iter_file_list
+from anchorhub.collector import Collector
+from anchorhub.builtin.github.collector import make_github_markdown_collector
+from anchorhub.builtin.github.converter import create_anchor_from_header
+from anchorhub.builtin.github.cstrategies import \
+    MarkdownATXCollectorStrategy, MarkdownSetextCollectorStrategy
+from anchorhub.builtin.github.switches import make_code_block_switch
+from anchorhub.util.getanchorhubpath import get_anchorhub_path
+from anchorhub.util.prefetch import prefetch
+from anchorhub.compatibility import get_path_separator
+
+sep = get_path_separator()
+
+
+def _get_sample_opts(sample):
+    """
+    Creates normalized options for one of the directories in sample/
+
+    :param sample: name of the directory inside of sample/
+    :return: namespace of normalized AnchorHub options
+    """
+    d = get_anchorhub_path() + sep + '..' + sep + 'sample' + sep + sample
+    return normalize_opts.normalize(cmdparse.parse_args([d, '-r']))
+
+
+def test_collect_parallel_matches_serial():
+    """
+    collector.py: Test collect() with several workers matches a serial run
+    """
+    opts = _get_sample_opts('larger-test')
+    file_paths = get_file_list(opts)
+
+    serial = make_github_markdown_collector(opts).collect(file_paths)
+    parallel = make_github_markdown_collector(opts).collect(file_paths,
+                                                            workers=3)
+    assert serial == parallel
+    assert list(serial[0].keys()) == list(parallel[0].keys())
+
+
+def test_collect_streamed_matches_list():
+    """
+    collector.py: Test collect() with files streamed from a generator
+    matches collecting from a list
+    """
+    opts = _get_sample_opts('larger-test')
+    file_paths = get_file_list(opts)
+    expected = make_github_markdown_collector(opts).collect(file_paths)
+
+    for workers in (1, 3):
+        collector = make_github_markdown_collector(opts)
+        streamed = prefetch(iter_file_list(opts), 2)
+        assert collector.collect(streamed, workers=workers) == expected
+        assert collector.get_file_paths() == file_paths
+
+
+def test_collect_with_cache():
+    """
+    collector.py: Test collect() with a cache matches an uncached run
+    """
+    opts = _get_sample_opts('larger-test')
+    file_paths = get_file_list(opts)
+    expected = make_github_markdown_collector(opts).collect(file_paths)
+
+    d = tempfile.mkdtemp()
+    try:
+        cache_path = os.path.join(d, '.anchorhub-cache')
+        cold = AnchorCache(cache_path)
+        cold.load()
+        assert make_github_markdown_collector(opts).collect(
+            file_paths, cache=cold) == expected
+        assert cold.hits == 0
+        cold.save()
+
+        warm = AnchorCache(cache_path)
+        warm.load()
+        assert make_github_markdown_collector(opts).collect(
+            file_paths, cache=warm) == expected
+        assert warm.hits == len(file_paths)
+    finally:
+        shutil.rmtree(d)
+
+
+def test_collect_duplicate_headers():
+    """
+    collector.py: Test that repeated headers get unique, increasing anchors
+    """
+    opts = _get_sample_opts('larger-test')
+    file_path = opts.abs_input + 'test-3.md'
+    anchors, duplicates = make_github_markdown_collector(opts).collect(
+        [file_path])
+    file_anchors = anchors[file_path]
+    assert file_anchors['du1'] == 'duplicate-header'
+    for n in range(2, 12):
+        assert file_anchors['du' + str(n)] == \
+            'duplicate-header-' + str(n - 1)
+
+
+def test_collect_screened_lines():
+    """
+    collector.py: Test that lines without a tag wrapper skip the strategies
+    """
+    opts = _get_sample_opts('larger-test')
+    file_path = opts.abs_input + 'test-3.md'
+    collector = make_github_markdown_collector(opts)
+    collector.collect([file_path])
+    screened, total = collector.get_screened_lines()
+
+    with open(file_path) as f:
+        lines = f.readlines()
+    assert total == len(lines)
+    assert screened == len([l for l in lines if opts.open not in l])
+
+
+def test_collect_without_prefilter():
+    """
+    collector.py: Test that no lines are screened if a strategy has no
+    prefilter
+    """
+    opts = _get_sample_opts('larger-test')
+    file_path = opts.abs_input + 'test-3.md'
+    collector = make_github_markdown_collector(opts)
+    expected = collector.collect([file_path])
+
+    atx = MarkdownATXCollectorStrategy(opts)
+    atx.get_prefilter = lambda: None
+    setext = MarkdownSetextCollectorStrategy(opts)
+    unscreened = Collector(create_anchor_from_header, [atx, setext],
+                           [make_code_block_switch()])
+    assert unscreened.collect([file_path]) == expected
+    assert unscreened.get_screened_lines()[0] == 0
+
+
+def test_collect_ignored_ranges():
+    """
+    collector.py: Test that the lines ignored by the switches are recorded
+    for each file, and match the kept Documents
+    """
+    opts = _get_sample_opts('code-block')
+    file_path = opts.abs_input + 'code_block_test.md'
+    collector = make_github_markdown_collector(opts)
+    collector.collect([file_path])
+    ignored = collector.get_ignored_ranges()
+    assert ignored == {file_path: [[4, 15]]}
+
+    kept = make_github_markdown_collector(opts)
+    kept.collect([file_path], keep_documents=True)
+    assert kept.get_documents()[file_path].ignored == ignored[file_path]
+
+
+def test_collect_header_lines():
+    """
+    collector.py: Test that kept Documents record the lines the strategies
+    found tags on, and not tags inside of code blocks or untagged headers
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a.md')
+        with open(path, 'w') as f:
+            f.write("# A {#a}\ntext\nB {#b}\n===\n```\n# C {#c}\n```\n"
+                    "# D\n")
+        opts = normalize_opts.normalize(cmdparse.parse_args([d]))
+        collector = make_github_markdown_collector(opts)
+        collector.collect([path], keep_documents=True)
+        assert collector.get_documents()[path].header_lines == set([0, 2])
+    finally:
+        shutil.rmtree(d)
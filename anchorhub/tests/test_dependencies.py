@@ -0,0 +1,53 @@
+"""
+Tests for dependencies.py
+
+dependencies.py:
+http://www.github.com/samjabrahams/anchorhub/anchorhub/dependencies.py
+"""
+import os
+import shutil
+import tempfile
+
+from anchorhub.main import main
+from anchorhub.tests.textfiles import read_text, write_text
+
+
+def test_incremental_rewrites_dependents():
+    """
+    dependencies.py: Test that an incremental run only rewrites changed
+    files and the files that link to their changed anchors
+    """
+    d = tempfile.mkdtemp()
+    try:
+        src = os.path.join(d, 'src')
+        out = os.path.join(d, 'out')
+        os.mkdir(src)
+        write_text(os.path.join(src, 'a.md'), '# Old header {#head}\n')
+        write_text(os.path.join(src, 'b.md'), '# B {#b}\n[link](a.md#head)\n')
+        write_text(os.path.join(src, 'c.md'), '# C {#c}\n[link](#c)\n')
+        main([src, out, '--incremental'])
+        assert read_text(os.path.join(out, 'b.md')) == \
+            '# B\n[link](a.md#old-header)\n'
+
+        # Mark c.md's output, so we can tell if it is written again
+        write_text(os.path.join(out, 'c.md'), 'untouched\n')
+        write_text(os.path.join(src, 'a.md'), '# Newer header {#head}\n')
+        main([src, out, '--incremental'])
+        assert read_text(os.path.join(out, 'a.md')) == '# Newer header\n'
+        assert read_text(os.path.join(out, 'b.md')) == \
+            '# B\n[link](a.md#newer-header)\n'
+        assert read_text(os.path.join(out, 'c.md')) == 'untouched\n'
+
+        # Removing the linked tag rewrites b.md with the plain tag
+        write_text(os.path.join(src, 'a.md'), '# Newer header\n')
+        main([src, out, '--incremental'])
+        assert read_text(os.path.join(out, 'b.md')) == \
+            '# B\n[link](a.md#head)\n'
+        assert read_text(os.path.join(out, 'c.md')) == 'untouched\n'
+
+        # Missing output files are written again
+        os.remove(os.path.join(out, 'c.md'))
+        main([src, out, '--incremental'])
+        assert read_text(os.path.join(out, 'c.md')) == '# C\n[link](#c)\n'
+    finally:
+        shutil.rmtree(d)
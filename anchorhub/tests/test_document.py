@@ -0,0 +1,38 @@
+"""
+Tests for document.py
+
+document.py:
+http://www.github.com/samjabrahams/anchorhub/anchorhub/document.py
+"""
+from anchorhub.document import Document
+
+
+def test_add_ignored():
+    """
+    document.py: Test add_ignored() merges consecutive lines into ranges
+    """
+    d = Document('file.md', ['a\n'] * 10)
+    for i in [1, 2, 3, 6, 8, 9]:
+        d.add_ignored(i)
+    assert d.ignored == [[1, 4], [6, 7], [8, 10]]
+    assert d.get_ignored_lines() == set([1, 2, 3, 6, 8, 9])
+
+
+def test_no_ignored():
+    """
+    document.py: Test a Document with no ignored lines
+    """
+    d = Document('file.md', ['a\n', 'b\n'])
+    assert d.ignored == []
+    assert d.get_ignored_lines() == set()
+
+
+def test_add_header_line():
+    """
+    document.py: Test add_header_line() records the tagged lines
+    """
+    d = Document('file.md', ['# A {#a}\n', 'b\n', '# C {#c}\n'])
+    assert d.header_lines == set()
+    d.add_header_line(0)
+    d.add_header_line(2)
+    assert d.header_lines == set([0, 2])
@@ -0,0 +1,81 @@
+"""
+Tests for mirror.py
+
+mirror.py:
+http://www.github.com/samjabrahams/anchorhub/anchorhub/mirror.py
+"""
+import os
+import shutil
+import tempfile
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.fileparse import iter_mirror_list
+from anchorhub.main import main
+from anchorhub.mirror import mirror_files
+from anchorhub.tests.textfiles import read_text, write_text
+
+
+def test_mirror_files():
+    """
+    mirror.py: Test copying, linking, and skipping up to date files
+    """
+    d = tempfile.mkdtemp()
+    try:
+        src = os.path.join(d, 'src')
+        os.makedirs(os.path.join(src, 'img'))
+        write_text(os.path.join(src, 'a.md'), "Plain text\n")
+        write_text(os.path.join(src, 'img', 'b.png'), "image")
+        write_text(os.path.join(src, 'skip.md'), "Written by the Writer\n")
+        out = os.path.join(d, 'out')
+        opts = normalize_opts.normalize(cmdparse.parse_args(
+            [src, out, '-r']))
+        skip = set([os.path.join(src, 'skip.md')])
+
+        counts = mirror_files(iter_mirror_list(opts), opts, skip)
+        assert sum(counts.values()) == 2
+        assert read_text(os.path.join(out, 'img', 'b.png')) == "image"
+        assert not os.path.exists(os.path.join(out, 'skip.md'))
+        assert mirror_files(iter_mirror_list(opts), opts, skip) == \
+            {'up-to-date': 2}
+
+        linked = os.path.join(d, 'linked')
+        opts = normalize_opts.normalize(cmdparse.parse_args(
+            [src, linked, '-r']))
+        counts = mirror_files(iter_mirror_list(opts), opts, skip, 'link')
+        if hasattr(os, 'link'):
+            assert counts == {'link': 2}
+            assert os.path.samefile(os.path.join(src, 'a.md'),
+                                    os.path.join(linked, 'a.md'))
+    finally:
+        shutil.rmtree(d)
+
+
+def test_main_mirror():
+    """
+    mirror.py: Test that --mirror leaves a complete output directory, and
+    doesn't replace modified files
+    """
+    d = tempfile.mkdtemp()
+    try:
+        src = os.path.join(d, 'src')
+        out = os.path.join(d, 'out')
+        os.makedirs(src)
+        write_text(os.path.join(src, 'a.md'), "# Header {#head}\n")
+        write_text(os.path.join(src, 'b.md'), "[Link](a.md#head)\n")
+        write_text(os.path.join(src, 'c.md'), "Nothing to change\n")
+        write_text(os.path.join(src, 'notes.txt'), "Not Markdown\n")
+        main([src, out, '--mirror', '--incremental'])
+        assert sorted(os.listdir(out)) == ['a.md', 'b.md', 'c.md',
+                                           'notes.txt']
+        assert read_text(os.path.join(out, 'a.md')) == "# Header\n"
+        assert read_text(os.path.join(out, 'b.md')) == "[Link](a.md#header)\n"
+
+        # Files that aren't written again keep their modified output
+        write_text(os.path.join(src, 'c.md'), "Changed, but still plain\n")
+        main([src, out, '--mirror', '--incremental'])
+        assert read_text(os.path.join(out, 'a.md')) == "# Header\n"
+        assert read_text(os.path.join(out, 'c.md')) == \
+            "Changed, but still plain\n"
+    finally:
+        shutil.rmtree(d)
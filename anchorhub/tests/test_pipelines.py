@@ -0,0 +1,137 @@
+"""
+Tests for running several AnchorHub pipelines in one process
+
+A pipeline is a Collector and a Writer created by
+make_github_markdown_collector() and make_github_markdown_writer().
+"""
+import os
+import shutil
+import tempfile
+import threading
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.fileparse import get_file_list
+from anchorhub.builtin.github.collector import make_github_markdown_collector
+from anchorhub.builtin.github.writer import make_github_markdown_writer
+from anchorhub.compatibility import get_path_separator
+
+sep = get_path_separator()
+
+
+def _write_input(input_dir, blocks):
+    """
+    Writes a Markdown file with alternating prose and code blocks. The code
+    blocks contain tags and links that must not be changed.
+
+    :param input_dir: string path of the directory to write the file to
+    :param blocks: Number of code blocks in the file
+    """
+    with open(os.path.join(input_dir, 'doc.md'), 'w') as f:
+        f.write('# Top {#top}\n')
+        for n in range(blocks):
+            f.write('## Section %d {#s%d}\n' % (n, n))
+            f.write('See [the top](#top) and [this](#s%d)\n' % n)
+            f.write('```\n')
+            for i in range(20):
+                f.write('# Not a header {#code%d}\n' % i)
+                f.write('[Not a link](#top)\n')
+            f.write('```\n')
+
+
+def _run_pipeline(input_dir, output_dir):
+    """
+    Collects and writes every file in input_dir.
+
+    :param input_dir: string path of the input directory
+    :param output_dir: string path of the output directory
+    :return: A tuple of (anchors, counter, output file contents)
+    """
+    opts = normalize_opts.normalize(cmdparse.parse_args([input_dir,
+                                                         output_dir]))
+    file_paths = get_file_list(opts)
+    anchors, _ = make_github_markdown_collector(opts).collect(file_paths)
+    counter = make_github_markdown_writer(opts).write(file_paths, anchors,
+                                                      opts)
+    with open(os.path.join(output_dir, 'doc.md')) as f:
+        contents = f.read()
+    return anchors, counter, contents
+
+
+def test_pipelines_in_threads():
+    """
+    Test that pipelines running at the same time in several threads don't
+    affect each other
+    """
+    tmp = tempfile.mkdtemp()
+    try:
+        input_dir = tmp + sep + 'input'
+        os.mkdir(input_dir)
+        _write_input(input_dir, 200)
+        expected = _run_pipeline(input_dir, tmp + sep + 'expected')
+
+        results = {}
+        errors = []
+
+        def run(n):
+            try:
+                for k in range(3):
+                    output_dir = tmp + sep + 'out-%d-%d' % (n, k)
+                    results[(n, k)] = _run_pipeline(input_dir, output_dir)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(n,))
+                   for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len(results) == 24
+        for result in results.values():
+            assert result == expected
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_repeated_runs_are_independent():
+    """
+    Test that each run of a Collector and Writer starts from scratch, and
+    leaves the results of earlier runs untouched
+    """
+    tmp = tempfile.mkdtemp()
+    try:
+        first_dir = tmp + sep + 'first'
+        second_dir = tmp + sep + 'second'
+        os.mkdir(first_dir)
+        os.mkdir(second_dir)
+        _write_input(first_dir, 2)
+        with open(second_dir + sep + 'other.md', 'w') as f:
+            f.write('# Other header {#other}\n[Link](#other)\n')
+
+        first_opts = normalize_opts.normalize(cmdparse.parse_args(
+            [first_dir, tmp + sep + 'first-out']))
+        second_opts = normalize_opts.normalize(cmdparse.parse_args(
+            [second_dir, tmp + sep + 'second-out']))
+        collector = make_github_markdown_collector(first_opts)
+        writer = make_github_markdown_writer(first_opts)
+
+        first_paths = get_file_list(first_opts)
+        first_anchors, _ = collector.collect(first_paths)
+        first_counter = writer.write(first_paths, first_anchors, first_opts)
+        first_counts = [c[0] for c in first_counter]
+
+        second_paths = get_file_list(second_opts)
+        second_anchors, _ = collector.collect(second_paths)
+        second_counter = writer.write(second_paths, second_anchors,
+                                      second_opts)
+
+        assert list(second_anchors.keys()) == second_paths
+        assert list(first_anchors.keys()) == first_paths
+        assert [c[0] for c in first_counter] == first_counts
+        assert [c[0] for c in second_counter] == [1, 0, 1, 0]
+        assert writer.get_modified_files() == second_paths
+    finally:
+        shutil.rmtree(tmp)
@@ -0,0 +1,357 @@
+"""
+Tests for writer.py
+
+writer.py:
+http://www.github.com/samjabrahams/anchorhub/anchorhub/writer.py
+"""
+import io
+import os
+import shutil
+import tempfile
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.document import Document
+from anchorhub.fileparse import get_file_list
+from anchorhub.builtin.github.collector import make_github_markdown_collector
+from anchorhub.writer import Writer
+from anchorhub.builtin.github.writer import make_github_markdown_writer
+from anchorhub.builtin.github.wstrategies import MarkdownATXWriterStrategy, \
+    MarkdownSetextWriterStrategy, MarkdownInlineLinkWriterStrategy, \
+    MarkdownReferenceLinkWriterStrategy
+from anchorhub.builtin.github.switches import make_code_block_switch
+from anchorhub.util.getanchorhubpath import get_anchorhub_path
+from anchorhub.compatibility import get_path_separator
+
+sep = get_path_separator()
+
+
+def _get_sample_opts(sample, output):
+    """
+    Creates normalized options for one of the directories in sample/
+
+    :param sample: name of the directory inside of sample/
+    :param output: output directory for the Writer
+    :return: namespace of normalized AnchorHub options
+    """
+    d = get_anchorhub_path() + sep + '..' + sep + 'sample' + sep + sample
+    return normalize_opts.normalize(cmdparse.parse_args([d, output, '-r']))
+
+
+def _read_tree(root):
+    """
+    Reads every file underneath root into a dictionary
+
+    :param root: string path of the directory to read
+    :return: Dictionary mapping relative file paths to file contents
+    """
+    contents = {}
+    for dir_path, _, file_names in os.walk(root):
+        for name in file_names:
+            path = os.path.join(dir_path, name)
+            with open(path, 'r') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+
+def test_write_parallel_matches_serial():
+    """
+    writer.py: Test write() with several workers matches a serial run
+    """
+    out = tempfile.mkdtemp()
+    try:
+        serial_opts = _get_sample_opts('larger-test', out + sep + 'serial')
+        parallel_opts = _get_sample_opts('larger-test', out + sep + 'parallel')
+        file_paths = get_file_list(serial_opts)
+        anchors, _ = make_github_markdown_collector(serial_opts).collect(
+            file_paths)
+
+        serial = make_github_markdown_writer(serial_opts)
+        serial_counter = serial.write(file_paths, anchors, serial_opts)
+        parallel = make_github_markdown_writer(parallel_opts)
+        parallel_counter = parallel.write(file_paths, anchors, parallel_opts,
+                                          workers=3)
+
+        assert serial_counter == parallel_counter
+        assert serial.get_modified_files() == parallel.get_modified_files()
+        assert _read_tree(serial_opts.abs_output) == \
+            _read_tree(parallel_opts.abs_output)
+    finally:
+        shutil.rmtree(out)
+
+
+def test_write_documents_matches_files():
+    """
+    writer.py: Test write() using kept Documents matches reading the files,
+    for every directory in sample/
+    """
+    samples = get_anchorhub_path() + sep + '..' + sep + 'sample'
+    out = tempfile.mkdtemp()
+    try:
+        for sample in sorted(os.listdir(samples)):
+            file_opts = _get_sample_opts(sample, out + sep + sample + sep +
+                                         'files')
+            doc_opts = _get_sample_opts(sample, out + sep + sample + sep +
+                                        'documents')
+            file_paths = get_file_list(file_opts)
+            collector = make_github_markdown_collector(file_opts)
+            anchors, _ = collector.collect(file_paths, keep_documents=True)
+            documents = collector.get_documents()
+            assert sorted(documents.keys()) == sorted(file_paths)
+
+            files_counter = make_github_markdown_writer(file_opts).write(
+                file_paths, anchors, file_opts)
+            docs_counter = make_github_markdown_writer(doc_opts).write(
+                file_paths, anchors, doc_opts, documents=documents)
+
+            assert files_counter == docs_counter, sample
+            assert _read_tree(file_opts.abs_output) == \
+                _read_tree(doc_opts.abs_output), sample
+    finally:
+        shutil.rmtree(out)
+
+
+def test_write_documents_header_lines():
+    """
+    writer.py: Test that with a Document, the header strategies only run on
+    the Document's header lines, while the link strategies still search
+    every line
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a.md')
+        lines = ['# A {#a}\n', '# B {#b}\n', '[x](#a)\n']
+        with open(path, 'w') as f:
+            f.writelines(lines)
+        opts = normalize_opts.normalize(cmdparse.parse_args(
+            [d, os.path.join(d, 'out')]))
+        document = Document(path, lines)
+        document.add_header_line(0)
+        anchors = {path: {'a': 'a-anchor'}}
+        make_github_markdown_writer(opts).write(
+            [path], anchors, opts, documents={path: document})
+        with open(os.path.join(d, 'out', 'a.md')) as f:
+            assert f.read() == '# A\n# B {#b}\n[x](#a-anchor)\n'
+    finally:
+        shutil.rmtree(d)
+
+
+def test_write_ignored_ranges_match_switches():
+    """
+    writer.py: Test write() using the Collector's ignored ranges matches
+    running the switches again
+    """
+    out = tempfile.mkdtemp()
+    try:
+        switch_opts = _get_sample_opts('code-block', out + sep + 'switches')
+        range_opts = _get_sample_opts('code-block', out + sep + 'ranges')
+        file_paths = get_file_list(switch_opts)
+        collector = make_github_markdown_collector(switch_opts)
+        anchors, _ = collector.collect(file_paths)
+        ignored = collector.get_ignored_ranges()
+
+        switch_counter = make_github_markdown_writer(switch_opts).write(
+            file_paths, anchors, switch_opts)
+        range_counter = make_github_markdown_writer(range_opts).write(
+            file_paths, anchors, range_opts, ignored=ignored)
+
+        assert switch_counter == range_counter
+        assert _read_tree(switch_opts.abs_output) == \
+            _read_tree(range_opts.abs_output)
+    finally:
+        shutil.rmtree(out)
+
+
+def test_write_prefilters_match_unfiltered():
+    """
+    writer.py: Test that skipping strategies with prefilters doesn't change
+    the output
+    """
+    out = tempfile.mkdtemp()
+    try:
+        filtered_opts = _get_sample_opts('larger-test', out + sep + 'filtered')
+        plain_opts = _get_sample_opts('larger-test', out + sep + 'plain')
+        file_paths = get_file_list(filtered_opts)
+        anchors, _ = make_github_markdown_collector(filtered_opts).collect(
+            file_paths)
+
+        filtered = make_github_markdown_writer(filtered_opts)
+        filtered_counter = filtered.write(file_paths, anchors, filtered_opts)
+
+        strategies = [MarkdownATXWriterStrategy(plain_opts, 'ATX headers'),
+                      MarkdownSetextWriterStrategy(plain_opts,
+                                                   'Setext headers'),
+                      MarkdownInlineLinkWriterStrategy(plain_opts,
+                                                       'inline links'),
+                      MarkdownReferenceLinkWriterStrategy(plain_opts,
+                                                          'reference links')]
+        for s in strategies:
+            s.get_prefilter = lambda: None
+        plain = Writer(strategies, [make_code_block_switch()])
+        plain_counter = plain.write(file_paths, anchors, plain_opts)
+
+        assert filtered_counter == plain_counter
+        assert _read_tree(filtered_opts.abs_output) == \
+            _read_tree(plain_opts.abs_output)
+    finally:
+        shutil.rmtree(out)
+
+
+def test_write_overwrite_streams_output():
+    """
+    writer.py: Test that overwriting files keeps the lines before the first
+    modification, leaves unmodified files alone, and cleans up after itself
+    """
+    d = tempfile.mkdtemp()
+    try:
+        modified = os.path.join(d, 'a.md')
+        unmodified = os.path.join(d, 'b.md')
+        with open(modified, 'w') as f:
+            f.write("Intro\n\nMore intro\n# Header {#head}\n[x](#head)\n")
+        with open(unmodified, 'w') as f:
+            f.write("Nothing to change\n")
+        os.chmod(modified, 0o640)
+        unmodified_inode = os.stat(unmodified).st_ino
+
+        opts = normalize_opts.normalize(cmdparse.parse_args([d, '-X']))
+        file_paths = get_file_list(opts)
+        anchors, _ = make_github_markdown_collector(opts).collect(file_paths)
+        writer = make_github_markdown_writer(opts)
+        writer.write(file_paths, anchors, opts)
+
+        with open(modified, 'r') as f:
+            assert f.read() == "Intro\n\nMore intro\n# Header\n[x](#header)\n"
+        assert os.stat(modified).st_mode & 0o777 == 0o640
+        assert os.stat(unmodified).st_ino == unmodified_inode
+        assert writer.get_modified_files() == [modified]
+        assert sorted(os.listdir(d)) == ['a.md', 'b.md']
+    finally:
+        shutil.rmtree(d)
+
+
+def test_write_skips_scanned_regions():
+    """
+    writer.py: Test that tags and links inside of code blocks, comments,
+    and front matter are left alone, with and without the Collector's
+    ignored ranges
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a.md')
+        text = ("---\ntitle: x\n---\n# Header {#head}\n\n"
+                "~~~\n# Code {#code}\n[x](#head)\n~~~\n\n"
+                "    [x](#head)\n\n<!--\n[x](#head)\n-->\n[y](#head)\n")
+        expected = text.replace(' {#head}', '').replace('[y](#head)',
+                                                         '[y](#header)')
+        with open(path, 'w') as f:
+            f.write(text)
+
+        for use_ranges in [False, True]:
+            out = os.path.join(d, 'out-' + str(use_ranges))
+            opts = normalize_opts.normalize(cmdparse.parse_args([d, out]))
+            collector = make_github_markdown_collector(opts)
+            anchors, _ = collector.collect([path])
+            assert anchors[path] == {'head': 'header'}
+            ignored = collector.get_ignored_ranges() if use_ranges else None
+            make_github_markdown_writer(opts).write([path], anchors, opts,
+                                                    ignored=ignored)
+            with open(os.path.join(out, 'a.md')) as f:
+                assert f.read() == expected
+    finally:
+        shutil.rmtree(d)
+
+
+def test_write_encoding():
+    """
+    writer.py: Test that files are read and written with opts.encoding
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a.md')
+        text = u'# Caf\xe9 {#cafe}\n[Caf\xe9](#cafe)\n'
+        with io.open(path, 'w', encoding='latin-1') as f:
+            f.write(text)
+
+        opts = normalize_opts.normalize(cmdparse.parse_args(
+            [d, '-X', '--encoding', 'latin-1']))
+        anchors, _ = make_github_markdown_collector(opts).collect([path])
+        writer = make_github_markdown_writer(opts)
+        writer.write([path], anchors, opts)
+
+        expected = u'# Caf\xe9\n[Caf\xe9](#caf\xe9)\n'.encode('latin-1')
+        with io.open(path, 'rb') as f:
+            assert f.read() == expected
+        assert writer.get_bytes_written() == {path: len(expected)}
+    finally:
+        shutil.rmtree(d)
+
+
+def test_write_interrupted():
+    """
+    writer.py: Test that an interrupted write leaves the original file and
+    no temporary files behind
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a.md')
+        original = "# Header {#head}\n[x](#head)\n[y](#head)\n"
+        with open(path, 'w') as f:
+            f.write(original)
+        opts = normalize_opts.normalize(cmdparse.parse_args([d, '-X']))
+        anchors, _ = make_github_markdown_collector(opts).collect([path])
+
+        links = MarkdownInlineLinkWriterStrategy(opts, 'inline links')
+        modify = links.modify
+        calls = []
+
+        def interrupting_modify(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise KeyboardInterrupt()
+            return modify(*args, **kwargs)
+
+        links.modify = interrupting_modify
+        writer = Writer([MarkdownATXWriterStrategy(opts, 'ATX headers'),
+                         links], [make_code_block_switch()])
+        try:
+            writer.write([path], anchors, opts)
+        except KeyboardInterrupt:
+            pass
+        else:
+            assert False, "KeyboardInterrupt was not raised"
+
+        with open(path, 'r') as f:
+            assert f.read() == original
+        assert os.listdir(d) == ['a.md']
+    finally:
+        shutil.rmtree(d)
+
+
+def test_write_skip_unchanged():
+    """
+    writer.py: Test that outputs with identical contents aren't rewritten
+    """
+    out = tempfile.mkdtemp()
+    try:
+        opts = _get_sample_opts('larger-test', out)
+        opts.skip_unchanged = True
+        file_paths = get_file_list(opts)
+        anchors, _ = make_github_markdown_collector(opts).collect(file_paths)
+
+        first = make_github_markdown_writer(opts)
+        first.write(file_paths, anchors, opts)
+        assert first.get_skipped_files() == []
+        expected = _read_tree(out)
+
+        changed = first.get_modified_files()[0]
+        with open(first.get_output_path(changed, opts), 'a') as f:
+            f.write("Edited by hand\n")
+        second = make_github_markdown_writer(opts)
+        second.write(file_paths, anchors, opts)
+        assert second.get_modified_files() == first.get_modified_files()
+        assert list(second.get_bytes_written().keys()) == [changed]
+        assert second.get_skipped_files() == \
+            first.get_modified_files()[1:]
+        assert _read_tree(out) == expected
+    finally:
+        shutil.rmtree(out)
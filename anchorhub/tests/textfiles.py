@@ -0,0 +1,25 @@
+"""
+Helpers for reading and writing the text files used by the tests
+"""
+
+
+def write_text(path, text):
+    """
+    Writes text to the file at path
+
+    :param path: string file path to write to
+    :param text: string contents of the file
+    """
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def read_text(path):
+    """
+    Reads the file at path
+
+    :param path: string file path to read
+    :return: string contents of the file
+    """
+    with open(path, 'r') as f:
+        return f.read()
@@ -0,0 +1,117 @@
+"""
+File for helper function copy_file()
+"""
+import os
+import shutil
+import sys
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+
+# Linux ioctl that makes a file share the data of another file on file
+# systems that support it (such as Btrfs and XFS), without copying it
+_FICLONE = 0x40049409
+
+# Number of bytes to copy at a time when falling back to a buffered copy
+_BUFFER_SIZE = 1024 * 1024
+
+
+def copy_file(source, destination):
+    """
+    Copies the contents of source to destination, using the cheapest method
+    that works:
+
+    1. A reflink (copy-on-write clone), which copies no data at all
+    2. os.copy_file_range(), which copies inside of the kernel, and can let
+       the file system share or offload the copy
+    3. os.sendfile(), which copies inside of the kernel
+    4. A buffered copy
+
+    Only the contents are copied. destination is created if it doesn't
+    exist, and truncated if it does.
+
+    :param source: string path of the file to copy
+    :param destination: string path of the file to write
+    :return: string name of the method that copied the file: 'reflink',
+        'copy_file_range', 'sendfile', or 'copy'
+    """
+    with open(source, 'rb') as src:
+        with open(destination, 'wb') as dst:
+            if _reflink(src, dst):
+                return 'reflink'
+            size = os.fstat(src.fileno()).st_size
+            if hasattr(os, 'copy_file_range') and \
+                    _copy_in_kernel(os.copy_file_range, src, dst, size):
+                return 'copy_file_range'
+            if hasattr(os, 'sendfile') and sys.platform.startswith('linux') \
+                    and _copy_in_kernel(_sendfile, src, dst, size):
+                return 'sendfile'
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, _BUFFER_SIZE)
+            return 'copy'
+
+
+def _reflink(src, dst):
+    """
+    Tries to clone src into dst with the FICLONE ioctl.
+
+    :param src: file object open for reading
+    :param dst: empty file object open for writing
+    :return: True if the file was cloned
+    """
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except (IOError, OSError):
+        return False
+    return True
+
+
+def _copy_in_kernel(copy, src, dst, size):
+    """
+    Copies size bytes from src to dst with copy(), which is called with
+    (src_fd, dst_fd, count) and must return the number of bytes copied, like
+    os.copy_file_range(). A copy that fails before copying anything is
+    reported as unsupported.
+
+    :param copy: function used to copy data between file descriptors
+    :param src: file object open for reading, at its start
+    :param dst: empty file object open for writing
+    :param size: number of bytes in src
+    :return: True if all of src was copied, or False if copy() isn't
+        supported for these files
+    """
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+    copied = 0
+    while copied < size:
+        try:
+            n = copy(src_fd, dst_fd, size - copied)
+        except OSError:
+            if copied == 0:
+                return False
+            raise
+        if n == 0:
+            # The file shrank while it was being copied
+            break
+        copied += n
+    return True
+
+
+def _sendfile(src_fd, dst_fd, count):
+    """
+    Wraps os.sendfile() to take the same arguments as os.copy_file_range(),
+    copying from the current offset of src_fd.
+
+    :param src_fd: file descriptor to copy from
+    :param dst_fd: file descriptor to copy to
+    :param count: maximum number of bytes to copy
+    :return: number of bytes copied
+    """
+    return os.sendfile(dst_fd, src_fd, None, count)
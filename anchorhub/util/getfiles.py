@@ -1,14 +1,26 @@
 """
-
+Functions for finding files with given extensions inside of directories
 """
 import os
-import glob
 
 from anchorhub.compatibility import get_path_separator
+from anchorhub.lib.gitignore import IgnoreRules, get_parent_rules, \
+    is_ignored
+from anchorhub.lib.globmatcher import GlobMatcher
 from anchorhub.util.addsuffix import add_suffix
 
+try:
+    from os import scandir
+except ImportError:
+    try:
+        # Backport of os.scandir() for Python versions before 3.5
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 
-def get_files(dir, exts, exclude=None, recursive=False):
+def get_files(dir, exts, exclude=None, recursive=False,
+              exclude_patterns=None, gitignore=False):
     """
     Get a list of files within a directory with given extensions.
     Exclude/black list directories from the list if specified. By default,
@@ -25,20 +37,87 @@ def get_files(dir, exts, exclude=None, recursive=False):
         included in the output list
     :param recursive: When True, search in all subdirectories, otherwise just
         look in the current directory
+    :param exclude_patterns: List of glob-style patterns. Files and
+        directories matching any of them are skipped. See GlobMatcher
+    :param gitignore: When True, skip files and directories ignored by
+        .gitignore and .ignore files. See IgnoreRules
     :return: List of string directories
     """
-    file_paths =[]
-    if recursive:
-        for root, _, _ in os.walk(dir):
-            # os.walk() does not add path separator by default to end of path
-            root = add_suffix(root, get_path_separator())
-            if exclude is not None and is_dir_inside(root, exclude):
-                # Skip directories that are in the exclude list
+    return list(iter_files(dir, exts, exclude=exclude, recursive=recursive,
+                           exclude_patterns=exclude_patterns,
+                           gitignore=gitignore))
+
+
+def iter_files(dir, exts, exclude=None, recursive=False,
+               exclude_patterns=None, gitignore=False):
+    """
+    Generator version of get_files(). Yields the path of each file as it is
+    found, so that files can be used before the whole tree has been listed.
+
+    Each directory is listed once. Files are yielded in name order, before
+    the files in any subdirectories. Hidden files (names starting with a '.'
+    dot) are skipped, and symbolic links to directories are not followed.
+    Excluded directories are pruned from the search before they are listed.
+
+    :param dir: String root directory to search under
+    :param exts: List of string file name suffixes to look for
+    :param exclude: List of strings specifying directories that should not be
+        searched. Only used when recursive is True
+    :param recursive: When True, search in all subdirectories, otherwise just
+        look in the current directory
+    :param exclude_patterns: List of glob-style patterns, matched against
+        names and paths relative to dir. Files and directories matching any
+        of them are skipped
+    :param gitignore: When True, skip files and directories ignored by the
+        .gitignore and .ignore files in each directory, as well as those in
+        the directories above dir up to the root of its git repository.
+        The rules of each directory are read once, when it is listed, and
+        '.git' directories are never searched
+    :return: Generator of string file paths
+    """
+    sep = get_path_separator()
+    suffixes = tuple(exts)
+    top = add_suffix(dir, sep)
+    if recursive and exclude and is_dir_inside(top, exclude):
+        # The whole search is inside of an excluded directory
+        return
+    # Since excluded directories are never entered, any directory found
+    # below top can only be excluded by matching an exclude path exactly
+    excluded_dirs = set(add_suffix(d, sep) for d in exclude or [])
+    matcher = GlobMatcher(exclude_patterns) if exclude_patterns else None
+
+    # Ignore rules are checked against paths relative to the git repository
+    ignore_prefix, chain = get_parent_rules(top) if gitignore else ('', ())
+
+    # (directory path, '/' separated path from top, ignore rules above it)
+    stack = [(top, '', chain)]
+    while stack:
+        root, rel, chain = stack.pop()
+        file_names, dir_names = _list_dir(root)
+        if gitignore:
+            rules = IgnoreRules.from_dir(root, file_names)
+            if rules is not None:
+                chain = chain + ((ignore_prefix + rel, rules),)
+        for name in file_names:
+            if name.endswith(suffixes) and not name.startswith('.') and \
+                    (matcher is None or not matcher.match(rel + name, name)) \
+                    and not (chain and is_ignored(
+                        chain, ignore_prefix + rel + name, False)):
+                yield root + name
+        if not recursive:
+            continue
+        # Reversed, so that the first directory is searched first
+        for name in reversed(dir_names):
+            path = root + name + sep
+            if path in excluded_dirs or \
+                    (matcher is not None and matcher.match(rel + name, name)):
+                # Prune the excluded directory
                 continue
-            file_paths.extend(get_files_in_dir(root, *exts))
-    else:
-        file_paths.extend(get_files_in_dir(dir, *exts))
-    return file_paths
+            if gitignore and (name == '.git' or (chain and is_ignored(
+                    chain, ignore_prefix + rel + name, True))):
+                # Prune the ignored directory
+                continue
+            stack.append((path, rel + name + '/', chain))
 
 
 def get_files_in_dir(dir, *exts):
@@ -51,12 +130,9 @@ def get_files_in_dir(dir, *exts):
         every file in the directory
     :return: A list of string paths to each desired file in the directory.
     """
-    file_paths = []
-    if exts is None:
-        exts = ['']
-    for ext in exts:
-        file_paths.extend(glob.glob(dir + '*' + ext))
-    return file_paths
+    if not exts:
+        exts = ('',)
+    return list(iter_files(dir, exts))
 
 
 def is_dir_inside(dir, check_dirs):
@@ -76,3 +152,37 @@ def is_dir_inside(dir, check_dirs):
         if os.path.commonprefix([dir, check_dir]) == check_dir:
             return True
     return False
+
+
+def _list_dir(dir):
+    """
+    Lists the files and subdirectories of dir with a single directory read,
+    using the type information returned with each entry where possible.
+    Directories that can't be read are treated as empty.
+
+    :param dir: String path of the directory to list
+    :return: A tuple of two sorted lists: the names of the files in dir
+        (including symbolic links to files), and the names of the
+        subdirectories in dir (not including symbolic links)
+    """
+    file_names = []
+    dir_names = []
+    try:
+        if scandir is not None:
+            for entry in scandir(dir):
+                if entry.is_dir(follow_symlinks=False):
+                    dir_names.append(entry.name)
+                elif entry.is_file():
+                    file_names.append(entry.name)
+        else:
+            for name in os.listdir(dir):
+                path = os.path.join(dir, name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    dir_names.append(name)
+                elif os.path.isfile(path):
+                    file_names.append(name)
+    except OSError:
+        return [], []
+    file_names.sort()
+    dir_names.sort()
+    return file_names, dir_names
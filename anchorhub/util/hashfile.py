@@ -0,0 +1,29 @@
+"""
+File for helper functions hash_file() and new_hash()
+"""
+import hashlib
+
+
+def new_hash():
+    """
+    Returns a new hash object using the same algorithm as hash_file(), so
+    that data can be hashed as it is produced and compared with the digest
+    of a file.
+
+    :return: A hashlib hash object
+    """
+    return hashlib.sha1()
+
+
+def hash_file(file_path):
+    """
+    Returns a hex digest of the contents of file_path.
+
+    :param file_path: string file path of the file to hash
+    :return: String SHA-1 hex digest of the file's contents
+    """
+    h = new_hash()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
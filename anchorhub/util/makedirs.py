@@ -0,0 +1,22 @@
+"""
+File for helper function make_dirs()
+"""
+import os
+import os.path
+
+
+def make_dirs(dir):
+    """
+    Creates dir, along with any missing parent directories. Unlike
+    os.makedirs(), it is not an error if dir already exists, even if another
+    process creates it at the same time.
+
+    :param dir: String path of the directory to create
+    """
+    if os.path.isdir(dir):
+        return
+    try:
+        os.makedirs(dir)
+    except OSError:
+        if not os.path.isdir(dir):
+            raise
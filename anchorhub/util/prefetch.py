@@ -0,0 +1,61 @@
+"""
+File for helper function prefetch()
+"""
+import threading
+
+try:
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
+
+# Marks the end of the prefetched items
+_DONE = object()
+
+
+def prefetch(iterable, max_size):
+    """
+    Iterates over iterable in a background thread, and yields its items in
+    the same order. Up to max_size items are fetched ahead of the consumer,
+    so that slow work done by iterable (such as listing directories) can
+    overlap with the work done on each item. If iterable raises an
+    exception, it is raised again from this generator.
+
+    :param iterable: Iterable to fetch items from
+    :param max_size: Maximum number of items to hold in the queue between
+        the background thread and the consumer
+    :return: Generator of the items in iterable
+    """
+    items = queue.Queue(max_size)
+    stop = threading.Event()
+
+    def fill():
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                items.put((item, None))
+        except Exception as e:
+            items.put((_DONE, e))
+        else:
+            items.put((_DONE, None))
+
+    thread = threading.Thread(target=fill)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Let the thread finish if the consumer stopped early
+        stop.set()
+        while thread.is_alive():
+            try:
+                items.get_nowait()
+            except queue.Empty:
+                thread.join(0.01)
+    if error is not None:
+        raise error
@@ -0,0 +1,21 @@
+"""
+File for helper function replace_file()
+"""
+import os
+import os.path
+
+
+def replace_file(source, destination):
+    """
+    Renames source to destination, replacing destination if it exists.
+
+    :param source: string path of the file to move
+    :param destination: string path to move it to
+    """
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        # Python 2, where os.rename() can't replace a file on Windows
+        if os.name == 'nt' and os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
@@ -0,0 +1,69 @@
+"""
+Tests for copyfile.py
+
+copyfile.py:
+http://www.github.com/samjabrahams/anchorhub/util/copyfile.py
+"""
+import os
+import shutil
+import tempfile
+
+import anchorhub.util.copyfile as c
+
+
+def _read_bytes(path):
+    """
+    Reads the raw contents of the file at path
+
+    :param path: string file path to read
+    :return: bytes contents of the file
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_copy_file():
+    """
+    copyfile.py: Test that copy_file() copies empty and larger files
+    """
+    d = tempfile.mkdtemp()
+    try:
+        for name, data in (('empty', b''), ('big', os.urandom(300000))):
+            source = os.path.join(d, name)
+            destination = os.path.join(d, name + '.copy')
+            with open(source, 'wb') as f:
+                f.write(data)
+            with open(destination, 'wb') as f:
+                f.write(b'Old contents that are longer than nothing')
+            assert c.copy_file(source, destination) in \
+                ('reflink', 'copy_file_range', 'sendfile', 'copy')
+            assert _read_bytes(destination) == data
+    finally:
+        shutil.rmtree(d)
+
+
+def test_copy_file_buffered_fallback():
+    """
+    copyfile.py: Test copying when no copy in the kernel is supported
+    """
+    d = tempfile.mkdtemp()
+
+    def unsupported(*args):
+        raise OSError("Not supported")
+
+    reflink = c._reflink
+    copy_in_kernel = c._copy_in_kernel
+    c._reflink = lambda src, dst: False
+    c._copy_in_kernel = lambda copy, src, dst, size: copy_in_kernel(
+        unsupported, src, dst, size)
+    try:
+        source = os.path.join(d, 'a.md')
+        destination = os.path.join(d, 'b.md')
+        with open(source, 'wb') as f:
+            f.write(b'Some text\n' * 1000)
+        assert c.copy_file(source, destination) == 'copy'
+        assert _read_bytes(destination) == b'Some text\n' * 1000
+    finally:
+        c._reflink = reflink
+        c._copy_in_kernel = copy_in_kernel
+        shutil.rmtree(d)
@@ -5,6 +5,8 @@ getfileslist.py:
 http://www.github.com/samjabrahams/anchorhub/util/getfiles.py
 """
 import os
+import shutil
+import tempfile
 
 import anchorhub.util.getfiles as g
 
@@ -18,4 +20,125 @@ def test_is_dir_inside():
     assert g.is_dir_inside('/home/fake', ['/home/fake'])
 
 
-# NEED TO FIGURE OUT HOW TO PROPERLY WRITE TESTS FOR THE GLOB MODULE
+def _make_tree(root, paths):
+    """
+    Creates empty files (and any missing directories) underneath root
+
+    :param root: string path of the directory to create files in
+    :param paths: List of '/' separated file paths, relative to root
+    """
+    for path in paths:
+        full_path = os.path.join(root, *path.split('/'))
+        if not os.path.isdir(os.path.dirname(full_path)):
+            os.makedirs(os.path.dirname(full_path))
+        open(full_path, 'w').close()
+
+
+def test_get_files():
+    """
+    getfiles.py: Test get_files() with and without recursion
+    """
+    d = tempfile.mkdtemp()
+    try:
+        _make_tree(d, ['b.md', 'a.markdown', 'c.txt', '.hidden.md',
+                       'sub/x.md', 'sub/deeper/y.md', 'out/z.md'])
+        os.mkdir(os.path.join(d, 'dir.md'))
+        root = d + os.sep
+
+        assert g.get_files(root, ['.md', '.markdown']) == \
+            [root + 'a.markdown', root + 'b.md']
+        assert g.get_files(d, ['.md'], exclude=[root + 'out' + os.sep],
+                           recursive=True) == \
+            [root + 'b.md', root + 'sub' + os.sep + 'x.md',
+             root + 'sub' + os.sep + 'deeper' + os.sep + 'y.md']
+        # Lists the files, even if an extension is given twice
+        assert g.get_files_in_dir(root, '.md', 'md') == [root + 'b.md']
+        assert g.get_files_in_dir(root + 'missing' + os.sep, '.md') == []
+    finally:
+        shutil.rmtree(d)
+
+
+def test_iter_files_is_lazy():
+    """
+    getfiles.py: Test that iter_files() yields files before listing every
+    directory
+    """
+    d = tempfile.mkdtemp()
+    try:
+        _make_tree(d, ['a.md', 'sub/b.md'])
+        files = g.iter_files(d, ['.md'], recursive=True)
+        assert next(files) == d + os.sep + 'a.md'
+        # Directories are listed as they are reached
+        shutil.rmtree(os.path.join(d, 'sub'))
+        assert list(files) == []
+    finally:
+        shutil.rmtree(d)
+
+
+def test_get_files_exclude_patterns():
+    """
+    getfiles.py: Test that directories matching exclude patterns are never
+    listed
+    """
+    d = tempfile.mkdtemp()
+    try:
+        _make_tree(d, ['a.md', 'skip.md', 'node_modules/n.md',
+                       'docs/vendor/v.md', 'docs/keep.md',
+                       'lib/node_modules/m.md'])
+        root = d + os.sep
+        listed = []
+        list_dir = g._list_dir
+
+        def recording_list_dir(path):
+            listed.append(path)
+            return list_dir(path)
+
+        g._list_dir = recording_list_dir
+        try:
+            files = g.get_files(d, ['.md'], recursive=True,
+                                exclude_patterns=['node_modules',
+                                                  'docs/vendor', 'skip.*'])
+        finally:
+            g._list_dir = list_dir
+        assert files == [root + 'a.md', root + 'docs' + os.sep + 'keep.md']
+        assert not any('node_modules' in p or 'vendor' in p for p in listed)
+    finally:
+        shutil.rmtree(d)
+
+
+def test_get_files_gitignore():
+    """
+    getfiles.py: Test that .gitignore rules, including those of parent
+    directories in the repository, are followed
+    """
+    d = tempfile.mkdtemp()
+    try:
+        _make_tree(d, ['.git/config', '.gitignore', 'top/.ignore',
+                       'top/a.md', 'top/draft.md', 'top/gen/g.md',
+                       'top/sub/.gitignore', 'top/sub/b.md',
+                       'top/sub/keep.md', 'top/sub/draft.md'])
+        with open(os.path.join(d, '.gitignore'), 'w') as f:
+            f.write('*.md\n!top/a.md\n')
+        with open(os.path.join(d, 'top', '.ignore'), 'w') as f:
+            f.write('gen/\n!sub/*.md\ndraft.md\n')
+        with open(os.path.join(d, 'top', 'sub', '.gitignore'), 'w') as f:
+            f.write('b.md\n')
+        top = os.path.join(d, 'top') + os.sep
+        listed = []
+        list_dir = g._list_dir
+
+        def recording_list_dir(path):
+            listed.append(path)
+            return list_dir(path)
+
+        g._list_dir = recording_list_dir
+        try:
+            files = g.get_files(top, ['.md'], recursive=True, gitignore=True)
+        finally:
+            g._list_dir = list_dir
+        assert files == [top + 'a.md', top + 'sub' + os.sep + 'keep.md']
+        assert top + 'gen' + os.sep not in listed
+        # Without the option, every file is found
+        assert len(g.get_files(top, ['.md'], recursive=True)) == 6
+    finally:
+        shutil.rmtree(d)
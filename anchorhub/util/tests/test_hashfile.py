@@ -0,0 +1,29 @@
+"""
+Tests for hashfile.py
+
+hashfile.py:
+http://www.github.com/samjabrahams/anchorhub/util/hashfile.py
+"""
+import os
+import shutil
+import tempfile
+
+from anchorhub.util.hashfile import hash_file, new_hash
+
+
+def test_hash_file():
+    """
+    hashfile.py: Test that hash_file() matches data hashed with new_hash()
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a.md')
+        with open(path, 'wb') as f:
+            f.write(b'Some text\n' * 10000)
+        h = new_hash()
+        h.update(b'Some text\n' * 10000)
+        assert hash_file(path) == h.hexdigest()
+        h.update(b'More')
+        assert hash_file(path) != h.hexdigest()
+    finally:
+        shutil.rmtree(d)
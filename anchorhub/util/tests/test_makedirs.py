@@ -0,0 +1,26 @@
+"""
+Tests for makedirs.py
+
+makedirs.py:
+http://www.github.com/samjabrahams/anchorhub/util/makedirs.py
+"""
+import os
+import shutil
+import tempfile
+
+from anchorhub.util.makedirs import make_dirs
+
+
+def test_make_dirs():
+    """
+    makedirs.py: Test creating new and existing directories
+    """
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'a', 'b')
+        make_dirs(path)
+        assert os.path.isdir(path)
+        make_dirs(path)
+        assert os.path.isdir(path)
+    finally:
+        shutil.rmtree(d)
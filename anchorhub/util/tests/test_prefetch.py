@@ -0,0 +1,51 @@
+"""
+Tests for prefetch.py
+
+prefetch.py:
+http://www.github.com/samjabrahams/anchorhub/util/prefetch.py
+"""
+from anchorhub.util.prefetch import prefetch
+
+
+def test_prefetch():
+    """
+    prefetch.py: Test that prefetch() yields every item in order
+    """
+    assert list(prefetch(range(100), 4)) == list(range(100))
+    assert list(prefetch([], 4)) == []
+
+
+def test_prefetch_error():
+    """
+    prefetch.py: Test that errors raised while fetching reach the consumer
+    """
+    def failing():
+        yield 1
+        raise ValueError("fetch failed")
+
+    items = prefetch(failing(), 4)
+    assert next(items) == 1
+    try:
+        next(items)
+    except ValueError as e:
+        assert str(e) == "fetch failed"
+    else:
+        assert False, "ValueError was not raised"
+
+
+def test_prefetch_stops_early():
+    """
+    prefetch.py: Test that the background thread stops when the consumer
+    stops early
+    """
+    fetched = []
+
+    def counting():
+        for n in range(1000):
+            fetched.append(n)
+            yield n
+
+    items = prefetch(counting(), 2)
+    assert next(items) == 0
+    items.close()
+    assert len(fetched) < 1000
@@ -0,0 +1,46 @@
+"""
+Tests for validate_encoding.py
+
+validate_encoding.py:
+http://www.github.com/samjabrahams/anchorhub/validation/validate_encoding.py
+"""
+
+from nose.tools import *
+
+import anchorhub.validation.validate_encoding as v
+from anchorhub.exceptions.validationexception import ValidationException
+
+
+class EncodingSpace(object):
+    """
+    Simple class to test out namespace implementations of
+    validate_encoding()
+    """
+    def __init__(self, e=None):
+        self.encoding = e
+
+
+def test_validate_correct():
+    """
+    validate_encoding.py: Test validate() on known encodings
+    """
+    assert v.validate('utf-8')
+    assert v.validate('latin-1')
+    assert v.validate(EncodingSpace('utf-16'))
+
+
+def test_validate_no_encoding():
+    """
+    validate_encoding.py: Test validate() on a namespace without an encoding
+    """
+    assert v.validate(EncodingSpace())
+
+
+@raises(ValidationException)
+def test_validate_unknown():
+    """
+    validate_encoding.py: Test validate() with an unknown encoding
+
+    :raises ValidationException: always, if the test is working
+    """
+    assert v.validate(EncodingSpace('not-an-encoding'))
@@ -0,0 +1,56 @@
+"""
+Tests for validate_jobs.py
+
+validate_jobs.py:
+http://www.github.com/samjabrahams/anchorhub/validation/validate_jobs.py
+"""
+
+from nose.tools import *
+
+import anchorhub.validation.validate_jobs as v
+from anchorhub.exceptions.validationexception import ValidationException
+
+
+class JobsSpace(object):
+    """
+    Simple class to test out namespace implementations of validate_jobs()
+    """
+    def __init__(self, j=None):
+        if j is not None:
+            self.jobs = j
+
+
+def test_validate_correct():
+    """
+    validate_jobs.py: Test validate() on correct job counts
+    """
+    assert v.validate(1)
+    assert v.validate(8)
+    assert v.validate(JobsSpace(4))
+
+
+def test_validate_no_jobs_attribute():
+    """
+    validate_jobs.py: Test validate() on a namespace without 'jobs'
+    """
+    assert v.validate(JobsSpace())
+
+
+@raises(ValidationException)
+def test_validate_zero():
+    """
+    validate_jobs.py: Test validate() with zero jobs
+
+    :raises ValidationException: always, if the test is working
+    """
+    assert v.validate(JobsSpace(0))
+
+
+@raises(ValidationException)
+def test_validate_negative():
+    """
+    validate_jobs.py: Test validate() with a negative number of jobs
+
+    :raises ValidationException: always, if the test is working
+    """
+    assert v.validate(-2)
@@ -97,3 +97,15 @@ def test_validate_no_overwrite():
     a = OverObj(input='.', output='.')
     assert v.validate(a)
 
+
+
+@raises(ValidationException)
+def test_validate_overwrite_mirror():
+    """
+    validate_overwrite.py: Test validate() with both overwrite and mirror
+
+    :raises ValidationException: always, if the test is working
+    """
+    a = OverObj('.', 'anchorhub-out', True)
+    a.mirror = 'copy'
+    assert v.validate(a)
@@ -0,0 +1,64 @@
+"""
+Functions for validating the file encoding passed in as an argument to
+AnchorHub
+"""
+import codecs
+
+from anchorhub.exceptions.validationexception import ValidationException
+
+
+def validate(opts):
+    """
+    Client-facing validate method. Checks to see if the passed in opts
+    argument is either a string or a namespace containing the attribute
+    'encoding' and runs validations on it accordingly. Namespaces without an
+    'encoding' attribute, or where it is None, pass, as AnchorHub falls back
+    to its default encodings.
+
+    :param opts: either a string or a namespace with the attribute 'encoding'
+    :raises ValueError: if the value passed in is not a string or a
+        namespace
+    :raises ValidationException: if the encoding fails validations
+    :return: True if the encoding passes the validations
+    """
+    if hasattr(opts, 'encoding'):
+        if opts.encoding is None:
+            return True
+        return _validate(opts.encoding)
+    elif isinstance(opts, str):
+        return _validate(opts)
+    elif hasattr(opts, '__dict__'):
+        return True
+    else:
+        raise ValueError("Value passed into encoding validation must either "
+                         "be a string or a namespace with an attribute of "
+                         "'encoding'")
+
+
+def _validate(encoding):
+    """
+    Perform validations on the encoding. Raises a ValidationException if it
+    finds something wrong.
+
+    :param encoding: string name of an encoding
+    :raises ValidationException: if encoding fails any of the validations
+    :return: True if encoding passes the validations
+    """
+    validate_known_encoding(encoding)
+    return True
+
+
+def validate_known_encoding(encoding):
+    """
+    Returns True if Python knows how to read and write text with encoding.
+
+    :param encoding: string name of an encoding
+    :raises ValidationException: if the encoding is unknown
+    :return: True if the encoding is known. Raises a ValidationException
+        otherwise
+    """
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        raise ValidationException("Unknown encoding: " + encoding)
+    return True
@@ -0,0 +1,57 @@
+"""
+Functions for validating the number of jobs passed in as an argument to
+AnchorHub
+"""
+from anchorhub.exceptions.validationexception import ValidationException
+
+
+def validate(opts):
+    """
+    Client-facing validate method. Checks to see if the passed in opts
+    argument is either an integer or a namespace containing the attribute
+    'jobs' and runs validations on it accordingly. Namespaces without a
+    'jobs' attribute pass, as AnchorHub falls back to a single job.
+
+    :param opts: either an integer or a namespace with the attribute 'jobs'
+    :raises ValueError: if the value passed in is not an integer or a
+        namespace
+    :raises ValidationException: if the number of jobs fails validations
+    :return: True if the number of jobs passes the validations
+    """
+    if hasattr(opts, 'jobs'):
+        return _validate(opts.jobs)
+    elif isinstance(opts, int):
+        return _validate(opts)
+    elif hasattr(opts, '__dict__'):
+        return True
+    else:
+        raise ValueError("Value passed into jobs validation must either be "
+                         "an integer or a namespace with an attribute of "
+                         "'jobs'")
+
+
+def _validate(jobs):
+    """
+    Perform validations on the number of jobs. Raises a ValidationException
+    if it finds something wrong.
+
+    :param jobs: integer number of worker processes requested
+    :raises ValidationException: if jobs fails any of the validations
+    :return: True if jobs passes the validations
+    """
+    validate_at_least_one(jobs)
+    return True
+
+
+def validate_at_least_one(jobs):
+    """
+    Returns True if at least one job was requested.
+
+    :param jobs: integer number of worker processes requested
+    :raises ValidationException: if jobs is less than 1
+    :return: True if jobs is 1 or more. Raises a ValidationException otherwise
+    """
+    if jobs >= 1:
+        return True
+    else:
+        raise ValidationException("Number of jobs must be at least 1.")
@@ -7,6 +7,8 @@ import anchorhub.validation.validate_input as vi
 import anchorhub.validation.validate_extensions as ve
 import anchorhub.validation.validate_overwrite as vo
 import anchorhub.validation.validate_wrapper as vw
+import anchorhub.validation.validate_jobs as vj
+import anchorhub.validation.validate_encoding as vc
 from anchorhub.exceptions.validationexception import ValidationException
 
 
@@ -48,7 +50,8 @@ def _validate(opts):
     command-line arguments. Returns True if all validation tests are successful.
 
     Runs validation() methods in validate_input.py, validate_extensions.py,
-    validate_overwrite.py, and validate_wrapper.py
+    validate_overwrite.py, validate_wrapper.py, validate_jobs.py, and
+    validate_encoding.py
 
     Required attributes on opts:
     * input: String giving the path to input files
@@ -66,7 +69,9 @@ def _validate(opts):
     if all([vi.validate(opts),
             ve.validate(opts),
             vw.validate(opts),
-            vo.validate(opts)]):
+            vo.validate(opts),
+            vj.validate(opts),
+            vc.validate(opts)]):
         return True
     else:
         raise ValidationException("Arguments did not pass validation. Check "
@@ -38,6 +38,7 @@ def _validate(opts):
     :return: True if opts passes the validations
     """
     validate_overwrite_different_input_output(opts)
+    validate_overwrite_no_mirror(opts)
     return True
 
 
@@ -61,3 +62,22 @@ def validate_overwrite_different_input_output(opts):
                                   "Do you want to overwrite your input files? "
                                   "If so, use the following command:\n"
                                   "\tanchorhub -X " + opts.input)
+
+
+def validate_overwrite_no_mirror(opts):
+    """
+    Make sure that the output directory is not mirrored when overwriting
+    the input files, as there is no separate output directory to mirror
+    into.
+
+    :param opts: a namespace containing the attribute 'overwrite', and
+        optionally 'mirror'
+    :raises ValidationException: if both 'overwrite' and 'mirror' are set
+    :return: True if 'overwrite' or 'mirror' is not set
+    """
+    if not (opts.overwrite and getattr(opts, 'mirror', None)):
+        return True
+    else:
+        raise ValidationException("--mirror can't be used with --overwrite / "
+                                  "-X, as there is no output directory to "
+                                  "mirror into.")
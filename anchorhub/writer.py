@@ -1,12 +1,23 @@
 """
 Class file for the AnchorHub Writer
 """
+import multiprocessing
 import os
 import os.path
-import sys
 from abc import ABCMeta, abstractmethod
+from itertools import islice, repeat
 
+try:
+    from itertools import izip as zip
+except ImportError:
+    # Python 3, where zip() is already lazy
+    pass
+
+from anchorhub.lib.armedcheckswitch import get_switch_prefixes
 from anchorhub.lib.filetolist import FileToList
+from anchorhub.lib.linewindow import LineWindow
+from anchorhub.lib.outputfile import OutputFile, sync_directories
+from anchorhub.util.makedirs import make_dirs
 from anchorhub.util.stripprefix import strip_prefix
 
 
@@ -17,107 +28,478 @@ class Writer(object):
     method is its write() function, which takes in a list of file_paths,
     a dictionary of AnchorHub tag to anchor key-value pairs.
     """
-    def __init__(self, strategies, switches=None):
+    def __init__(self, strategies, switches=None, scanner=None):
         """
         The initializer for the Collector.
 
         :param strategies: Concrete WriterStrategies
         :param switches:
+        :param scanner: Optional region scanner. See Collector
         """
         self._strategies = strategies  # List of concrete WriterStrategy objs
-        self._switches = switches  # List of ArmedTestSwitch objects
-        self._counter = []
-        for s in self._strategies:
-            self._counter.append([0, s.get_label()])
-
-    def write(self, file_paths, anchors, opts):
+        # List of ArmedCheckSwitch objects
+        self._switches = switches if switches is not None else []
+        self._scanner = scanner
+        self._record_links = False
+        self._reset_results()
+
+        # Substrings a line must contain for each strategy to match it
+        self._prefilters = [s.get_prefilter() for s in strategies]
+        self._literals = tuple(set(p for p in self._prefilters
+                                   if p is not None))
+        # If every strategy has a prefilter, lines containing none of them
+        # can skip the strategies entirely
+        self._all_prefiltered = None not in self._prefilters
+
+        # Strategies that only modify the lines the Collector found tags on.
+        # When writing from a Document, they are only tested on those lines,
+        # so their prefilters don't need to be checked
+        self._collected_only = [s.collected_lines_only for s in strategies]
+        self._document_literals = tuple(set(
+            p for p, c in zip(self._prefilters, self._collected_only)
+            if p is not None and not c))
+
+        # Prefixes a line must start with to change any switch
+        self._switch_prefixes = get_switch_prefixes(self._switches)
+
+    def write(self, file_paths, anchors, opts, workers=1, documents=None,
+              record_links=False, ignored=None):
         """
-
-        :param file_paths:
-        :param anchors:
-        :param opts:
+        Parses each file in file_paths, modifies them using the Writer's
+        strategies, and writes out any file that was modified.
+
+        If documents is provided, files that have a Document (created by
+        Collector.collect(keep_documents=True)) are written from it, instead
+        of being read and checked against the scanner and switches again.
+        Similarly, if ignored is provided (see Collector.get_ignored_ranges()),
+        the lines it holds for a file are skipped without running the
+        scanner or switches.
+
+        If workers is greater than 1, the files are spread across a pool of
+        worker processes. Each worker has its own copy of the strategies
+        and switches, and the per-file counts are merged back in the same
+        order as file_paths.
+
+        If record_links is True, the Writer also records which files and
+        tags each written file links to. See get_links().
+
+        Every file is written to a temporary file and then moved into place,
+        so an interrupted run never leaves a half-written file. If
+        opts.fsync is set, each file is flushed to disk before it is moved,
+        and each output directory is synced once after all of the files
+        have been written.
+
+        If opts.skip_unchanged is set, modified files whose output already
+        has identical contents are not replaced. See get_skipped_files().
+
+        Each call starts with a new counter, and forgets the modified files
+        and links of earlier calls. As with the Collector, two threads must
+        not use the same Writer at the same time, but separate Writers share
+        nothing and can run concurrently.
+
+        :param file_paths: List of string file paths to write
+        :param anchors: Dictionary mapping string file paths to inner
+            dictionaries. These inner dictionaries map string AnchorHub tags
+            to string generated anchors
+        :param opts: Namespace containing AnchorHub options, usually created
+            from command line arguments
+        :param workers: Number of worker processes to use. Defaults to 1,
+            which writes every file in the current process
+        :param documents: Optional dictionary mapping string file paths to
+            Document objects
+        :param record_links: If True, record the links used by each file
+        :param ignored: Optional dictionary mapping string file paths to
+            RangeSets of the ignored line indices
         :return: A list of numbers, counting the number of times each
             strategy was used
         """
-        for file_path in file_paths:
-            self.write_single_file(file_path, anchors, opts)
-            self._reset_switches()
+        if documents is None:
+            documents = {}
+        if ignored is None:
+            ignored = {}
+        self._reset_results()
+        self._record_links = record_links
+        tasks = [(f, documents.get(f), ignored.get(f)) for f in file_paths]
+        workers = min(workers, len(file_paths))
+        if workers > 1:
+            results = self._write_parallel(tasks, anchors, opts, workers)
+        else:
+            results = [self._write_and_reset(f, anchors, opts, doc, rs)
+                       for f, doc, rs in tasks]
+        written_paths = []
+        for file_path, (counts, links, written) in zip(file_paths, results):
+            self._add_counts(file_path, counts, written)
+            if links is not None:
+                self._links[file_path] = links
+            if written is not None:
+                written_paths.append(self.get_output_path(file_path, opts))
+        if getattr(opts, 'fsync', False):
+            sync_directories(written_paths)
         return self._counter
 
     def write_single_file(self, file_path, anchors, opts):
         """
-
-        :param file_path:
-        :param anchors:
-        :param opts:
+        Parses a single file, modifies it using the Writer's strategies,
+        and writes it out if it was modified.
+
+        :param file_path: string file path of the file to write
+        :param anchors: Dictionary mapping string file paths to inner
+            dictionaries. These inner dictionaries map string AnchorHub tags
+            to string generated anchors
+        :param opts: Namespace containing AnchorHub options, usually created
+            from command line arguments
         :return: A list of numbers, counting the number of times each
             strategy was used
         """
-        lines = FileToList.to_list(file_path)
-        new_text = []
-        file_is_modified = False  # Will only rewrite file when True
-        for i in range(len(lines)):
-            modified_line = lines[i]
-            # Flip any switches that are triggered by this line
-            self._try_switches(lines, i)
-            if self._no_switches_on():
-                for n, s in enumerate(self._strategies):
-                    if s.test(modified_line, lines, i):
-                        # Strategy detected that it may modify this line
-                        mod = s.modify(modified_line, anchors, file_path)
-                        if modified_line != mod:
-                            # Strategy modified the line
-                            modified_line = mod
-                            self._counter[n][0] += 1  # Strategy counter +1
-                            file_is_modified = True  # Must rewrite this file
-            new_text.append(modified_line)
-            self._arm_switches()
-        if file_is_modified:
-            self._write_with_opts(file_path, new_text, opts)
+        counts, links, written = self._write_and_reset(file_path, anchors,
+                                                       opts)
+        self._add_counts(file_path, counts, written)
+        if written is not None and getattr(opts, 'fsync', False):
+            sync_directories([self.get_output_path(file_path, opts)])
         return self._counter
 
-    def _write_with_opts(self, file_path, lines, opts):
+    def get_modified_files(self):
         """
+        Returns the file paths that were modified and written by this Writer,
+        in the order they were given to write()
 
-        :param file_path:
-        :param lines:
-        :param opts
+        :return: List of string file paths
+        """
+        return self._modified_files
+
+    def get_bytes_written(self):
+        """
+        Returns the number of bytes written for each modified file. Files
+        whose output was skipped because it was unchanged are not included.
+
+        :return: Dictionary mapping string file paths to the size of their
+            output files, in bytes
+        """
+        return self._bytes_written
+
+    def get_skipped_files(self):
+        """
+        Returns the modified files that were not written, because their
+        output files already had identical contents. Only used when
+        opts.skip_unchanged is set.
+
+        :return: List of string file paths, in the order they were given to
+            write()
+        """
+        return self._skipped_files
+
+    def get_links(self):
+        """
+        Returns the links recorded by write(record_links=True). Each written
+        file maps to a list of [file_key, tag] pairs, one for each link in
+        the file that points at an anchor, where file_key is the absolute
+        path of the file the link points to.
+
+        :return: Dictionary mapping string file paths to lists of
+            [file_key, tag] pairs
+        """
+        return self._links
+
+    def get_output_path(self, file_path, opts):
+        """
+        Returns the path that file_path is written to when it is modified.
+
+        :param file_path: string file path of an input file
+        :param opts: Namespace containing AnchorHub options
+        :return: string file path of the output file
         """
         if opts.overwrite:
-            self._write_file_with_list(file_path, lines)
+            return file_path
+        elif opts.is_dir:
+            # Directory style output
+            return opts.abs_output + strip_prefix(file_path, opts.abs_input)
         else:
-            if opts.is_dir:
-                # Directory style output
-                write_path = opts.abs_output + strip_prefix(file_path,
-                                                            opts.abs_input)
-            else:
-                write_path = opts.abs_output + opts.input  # single file output
-            self._create_dirs_if_necessary(write_path)
-            self._write_file_with_list(write_path, lines)
+            return opts.abs_output + opts.input  # single file output
 
-    def _write_file_with_list(self, file_path, lines):
+    def _write_parallel(self, tasks, anchors, opts, workers):
+        """
+        Writes each file in tasks using a pool of worker processes.
+
+        :param tasks: List of (file_path, document, ignored) tuples.
+            document may be None, in which case the file is read from disk.
+            ignored may be None, in which case the scanner and switches
+            are run
+        :param anchors: Dictionary mapping file paths to tag/anchor
+            dictionaries. Must not change while the workers are running
+        :param opts: Namespace containing AnchorHub options
+        :param workers: Number of worker processes to start
+        :return: A list of per-file (counts, links, bytes_written) tuples, in
+            the same order as tasks
         """
+        pool = multiprocessing.Pool(workers, _init_worker,
+                                    (self, anchors, opts))
+        try:
+            return pool.map(_write_worker, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _write_and_reset(self, file_path, anchors, opts, document=None,
+                         ignored=None):
+        """
+        Writes a single file and resets the switches afterwards, so that
+        the next file starts from a clean state.
+
+        :param file_path: string file path of the file to write
+        :param anchors: Dictionary mapping file paths to tag/anchor
+            dictionaries
+        :param opts: Namespace containing AnchorHub options
+        :param document: Optional Document previously created for file_path
+        :param ignored: Optional RangeSet of the lines to ignore
+        :return: The (counts, links, bytes_written) tuple from _write_file()
+        """
+        try:
+            return self._write_file(file_path, anchors, opts, document,
+                                    ignored)
+        finally:
+            self._reset_switches()
 
-        :param file_path:
-        :param lines:
-        :return:
+    def _write_file(self, file_path, anchors, opts, document=None,
+                    ignored=None):
+        """
+        Parses, modifies, and (if necessary) writes a single file without
+        touching the Writer's counter.
+
+        Without a Document, the file is streamed through a LineWindow
+        instead of being read into memory all at once. Nothing is written
+        until a line is modified. From then on, lines are written in
+        batches to a temporary OutputFile, which replaces the output file
+        once the whole file has been parsed. Files are read and written with
+        opts.encoding, if it is set.
+
+        Each line is checked once for the strategies' prefilter substrings
+        (see WriterStrategy.get_prefilter()), and only the strategies that
+        could match it are tested. With a Document, strategies that set
+        collected_lines_only are only tested on the Document's header_lines,
+        instead of checking their prefilters.
+
+        :param file_path: string file path of the file to write
+        :param anchors: Dictionary mapping file paths to tag/anchor
+            dictionaries
+        :param opts: Namespace containing AnchorHub options
+        :param document: Optional Document previously created for
+            file_path. When provided, its lines, ignored ranges, and header
+            lines are used instead of reading the file, running the scanner
+            and switches, and searching every line for headers
+        :param ignored: Optional RangeSet of the line indices to ignore. When
+            provided, it is used instead of running the scanner and switches
+        :return: A tuple (counts, links, bytes_written). counts is a list
+            with one number per strategy, counting the lines in this file
+            that each strategy modified. links is a list of [file_key, tag]
+            pairs if the Writer is recording links, and None otherwise.
+            bytes_written is the size of the output file, or None if it
+            wasn't written because the file wasn't modified (or, with
+            opts.skip_unchanged, because its output was unchanged)
+        """
+        encoding = getattr(opts, 'encoding', None)
+        literals = self._literals
+        header_lines = None
+        if document is None:
+            lines = LineWindow(FileToList.iter_lines(file_path, encoding))
+        else:
+            lines = document.lines
+            ignored = document.ignored
+            literals = self._document_literals
+            header_lines = document.header_lines
+        if ignored is not None:
+            # The ignored lines are already known
+            pairs = zip(lines, ignored.iter_mask())
+        else:
+            pairs = self._iter_regions(lines)
+        counts = [0] * len(self._strategies)
+        links = [] if self._record_links else None
+        file_is_modified = False  # Will only rewrite file when True
+        output = None  # Opened when the first line is modified
+        try:
+            for i, (line, is_ignored) in enumerate(pairs):
+                modified_line = line
+                if not is_ignored:
+                    present = self._find_literals(modified_line, literals)
+                    is_header = header_lines is not None and i in header_lines
+                    if not present and self._all_prefiltered and \
+                            not is_header:
+                        # No strategy can match this line
+                        if output is not None:
+                            output.write(modified_line)
+                        continue
+                    for n, s in enumerate(self._strategies):
+                        if header_lines is not None and \
+                                self._collected_only[n]:
+                            if not is_header:
+                                continue
+                        else:
+                            p = self._prefilters[n]
+                            if p is not None and p not in present:
+                                continue
+                        result = s.test(modified_line, lines, i)
+                        if result:
+                            # Strategy detected that it may modify this line
+                            kwargs = ({'match': result} if s.accepts_match
+                                      else {})
+                            if links is not None:
+                                links.extend(s.get_links(
+                                    modified_line, file_path, **kwargs))
+                            mod = s.modify(modified_line, anchors, file_path,
+                                           **kwargs)
+                            if modified_line != mod:
+                                # Strategy modified the line
+                                modified_line = mod
+                                present = self._find_literals(modified_line,
+                                                              literals)
+                                counts[n] += 1  # Strategy counter +1
+                                file_is_modified = True  # Must rewrite file
+                if file_is_modified and output is None:
+                    # First modified line: start the output file with the
+                    # unmodified lines before it
+                    output = self._open_output(file_path, opts, document, i)
+                if output is not None:
+                    output.write(modified_line)
+        except BaseException:
+            # Includes KeyboardInterrupt, so that no temporary file is left
+            if output is not None:
+                output.discard()
+            raise
+        if output is None or not output.commit():
+            return counts, links, None
+        return counts, links, output.bytes_written
+
+    def _reset_results(self):
+        """
+        Starts a new counter, and clears the files and links recorded by
+        earlier calls to write(). Lists and dictionaries returned by
+        earlier calls are left untouched.
+        """
+        self._counter = [[0, s.get_label()] for s in self._strategies]
+        self._modified_files = []  # Files rewritten, in input order
+        self._links = {}  # Maps file paths to the (file, tag) links they use
+        self._bytes_written = {}  # Maps modified files to their output size
+        self._skipped_files = []  # Modified files whose output was unchanged
+
+    def _find_literals(self, line, literals):
+        """
+        Returns the strategy prefilter substrings that appear in line.
+
+        :param line: string line of text to check
+        :param literals: Tuple of the prefilter substrings to look for
+        :return: List of the prefilter substrings found in line
+        """
+        return [l for l in literals if l in line]
+
+    def _add_counts(self, file_path, counts, bytes_written=None):
         """
-        f = open(file_path, 'wb')
-        for i in range(len(lines)):
-            if sys.version_info >= (3,1):
-                f.write(bytes(lines[i], "UTF-8"))
+        Adds the per-file strategy counts for file_path to the Writer's
+        counter, and records the file if it was modified. A modified file
+        without a bytes_written size was skipped, as its output was
+        unchanged.
+
+        :param file_path: string file path the counts belong to
+        :param counts: A list with one number per strategy
+        :param bytes_written: Size of the file's output, if it was written
+        """
+        for n, count in enumerate(counts):
+            self._counter[n][0] += count
+        if any(counts):
+            self._modified_files.append(file_path)
+            if bytes_written is None:
+                self._skipped_files.append(file_path)
             else:
-                f.write(lines[i])
-        f.close()
+                self._bytes_written[file_path] = bytes_written
+
+    def _open_output(self, file_path, opts, document, count):
+        """
+        Opens an OutputFile for the output path of file_path, and writes the
+        first count lines of the input file to it. The input file is read
+        again for these lines (unless they are in document), so they never
+        need to be held in memory.
+
+        :param file_path: string file path of the input file
+        :param opts: Namespace containing AnchorHub options
+        :param document: Optional Document holding the lines of file_path
+        :param count: Number of lines to copy from the start of the file
+        :return: The OutputFile
+        """
+        encoding = getattr(opts, 'encoding', None)
+        write_path = self.get_output_path(file_path, opts)
+        self._create_dirs_if_necessary(write_path)
+        output = OutputFile(write_path, encoding,
+                            fsync=getattr(opts, 'fsync', False),
+                            skip_unchanged=getattr(opts, 'skip_unchanged',
+                                                   False))
+        if document is None:
+            previous = FileToList.iter_lines(file_path, encoding)
+        else:
+            previous = iter(document.lines)
+        try:
+            output.writelines(islice(previous, count))
+        except BaseException:
+            output.discard()
+            raise
+        finally:
+            if hasattr(previous, 'close'):
+                previous.close()
+        return output
 
     def _create_dirs_if_necessary(self, path):
         """
+        Creates the directory that will contain path, if it doesn't exist.
+        Worker processes may race to create the same directory.
+
+        :param path: string path of a file that will be written
+        """
+        make_dirs(os.path.dirname(path))
+
+    def _iter_regions(self, lines):
+        """
+        Pairs each line with whether it is ignored by the scanner or the
+        switches. The switches are only tried on lines that start with one
+        of their prefixes (see ArmedCheckSwitch.get_prefix()).
+
+        :param lines: List of strings (or a LineWindow), usually the lines
+            in a text file
+        :return: An iterator of (line, is_ignored) tuples
+        """
+        if self._scanner is not None:
+            pairs = self._scanner.scan(lines)
+        else:
+            pairs = zip(lines, repeat(False))
+        if not self._switches:
+            return pairs
+        return self._iter_switched(lines, pairs)
+
+    def _iter_switched(self, lines, pairs):
+        """
+        Runs the switches on each line of pairs.
 
-        :param path:
-        :return:
+        :param lines: List of strings (or a LineWindow) that pairs comes from
+        :param pairs: Iterator of (line, is_ignored) tuples
+        :return: A generator of (line, is_ignored) tuples, where lines are
+            also ignored while any switch is on
         """
-        if not os.path.exists(os.path.dirname(path)):
-            os.makedirs(os.path.dirname(path))
+        prefixes = self._switch_prefixes
+        is_switched = not self._no_switches_on()
+        for i, (line, is_ignored) in enumerate(pairs):
+            if prefixes is None or line.startswith(prefixes):
+                # Flip any switches that are triggered by this line
+                is_switched = self._update_switches(lines, i)
+            yield line, is_ignored or is_switched
+
+    def _update_switches(self, lines, index):
+        """
+        Tries to flip the switches on the line at index, then re-arms them
+        for the next line.
+
+        :param lines: List of strings, usually the lines in a text file
+        :param index: Number index pointing to the current line
+        :return: True if any switch is on, meaning the line is ignored
+        """
+        self._try_switches(lines, index)
+        self._arm_switches()
+        return not self._no_switches_on()
 
     def _try_switches(self, lines, index):
         """
@@ -157,9 +539,51 @@ class Writer(object):
             s.force(False)
 
 
+# Writer, anchors, and opts used by a worker process during
+# Writer._write_parallel()
+_worker_state = None
+
+
+def _init_worker(writer, anchors, opts):
+    """
+    Initializer for worker processes. Stores the Writer, anchors, and opts
+    that the worker should use for all of the files it is handed.
+
+    :param writer: The Writer object to write files with
+    :param anchors: Dictionary mapping file paths to tag/anchor dictionaries
+    :param opts: Namespace containing AnchorHub options
+    """
+    global _worker_state
+    _worker_state = (writer, anchors, opts)
+
+
+def _write_worker(task):
+    """
+    Writes a single file inside of a worker process.
+
+    :param task: A (file_path, document, ignored) tuple. document and
+        ignored may be None
+    :return: A (counts, links, bytes_written) tuple for the file
+    """
+    writer, anchors, opts = _worker_state
+    file_path, document, ignored = task
+    return writer._write_and_reset(file_path, anchors, opts, document,
+                                   ignored)
+
+
 class WriterStrategy(object):
     __metaclass__ = ABCMeta
 
+    # If True, the Writer passes whatever test() returned for a line to
+    # modify() and get_links() as the 'match' keyword argument, so that the
+    # strategy doesn't need to search the line again
+    accepts_match = False
+
+    # If True, the strategy only modifies lines that a CollectorStrategy
+    # found an AnchorHub tag on. When a file is written from a Document, the
+    # Writer only tests the strategy on the Document's header_lines
+    collected_lines_only = False
+
     def __init__(self, opts, label=None):
         """
         Initializes any necessary parameters for the WriterStrategy using
@@ -179,6 +603,10 @@ class WriterStrategy(object):
         Abstract method. Should return True when the line at file_lines[
         index] is a candidate to be modified with this object's modify() method
 
+        Strategies that set accepts_match may return any truthy object (such
+        as a regular expression match) instead of True, and receive it in
+        modify() as the 'match' keyword argument.
+
         :param current_modified_line:
         :param file_lines: List of strings corresponding to lines in a text file
         :param index: index of file_lines corresponding to the line to be tested
@@ -221,3 +649,32 @@ class WriterStrategy(object):
         :return: string label describing what this WriterStrategy modifies
         """
         return self._label
+
+    def get_prefilter(self):
+        """
+        Returns a substring that current_modified_line must contain for
+        test() to return True, or None if there is no such substring. The
+        Writer checks lines for this substring before calling test(),
+        which is much cheaper than running a regular expression on every
+        line.
+
+        :return: string that every matching line contains, or None
+        """
+        return None
+
+    def get_links(self, current_modified_line, file_path, match=None):
+        """
+        Should return the anchors that current_modified_line links to, as a
+        list of [file_key, tag] pairs, where file_key is the absolute path
+        of the linked file. Only called on lines that pass test(), and only
+        when the Writer is recording links. Strategies that don't modify
+        links return an empty list.
+
+        :param current_modified_line: String that represents the current line
+            after modifications from previous WriterStrategy objects
+        :param file_path: string file path of the file being written
+        :param match: The value returned by test() for this line, if the
+            strategy sets accepts_match
+        :return: List of [file_key, tag] pairs
+        """
+        return []
@@ -0,0 +1,89 @@
+"""
+Benchmark for finding AnchorHub tags in long, pathological header lines.
+
+Builds header lines that are full of opening wrapper patterns, hash '#'
+characters, and white space, at several lengths, then times how long the
+HeaderTagParser used by the GitHub header strategies takes per line. The
+time per character should stay about the same as the lines get longer.
+The wrapper regular expressions that the strategies used before are timed
+alongside it for comparison.
+
+Usage (from the repository root, with anchorhub installed):
+    python benchmarks/bench_headers.py [wrapper]
+"""
+import re
+import sys
+import time
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.builtin.github.headertags import HeaderTagParser
+
+LENGTHS = [1000, 10000, 100000]
+
+
+def make_lines(opts, length):
+    """
+    Creates pathological header lines of about length characters each.
+
+    :param opts: Namespace with the attributes 'open' and 'close'
+    :param length: Approximate number of characters in each line
+    :return: List of (name, line) tuples
+    """
+    opn, close = opts.open, opts.close
+    shapes = [
+        ('openers', opn + '#a'),
+        ('unclosed tags', opn + '#a' + close + ' x'),
+        ('spaced openers', opn + ' # '),
+        ('hashes', '#'),
+    ]
+    lines = []
+    for name, unit in shapes:
+        body = unit * (length // len(unit))
+        lines.append((name, '# ' + body + ' ' + opn + '#tag' + close + '\n'))
+        lines.append((name + ', no tag', '# ' + body + close + '\n'))
+    return lines
+
+
+def best_time(func, line, repeat=5):
+    """
+    :return: The shortest time, in seconds, that func(line) took
+    """
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        func(line)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    """
+    Runs the benchmark and prints the time per line.
+
+    :param argv: list of string command line arguments
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    wrapper = argv[0] if argv else '{ }'
+    opts = normalize_opts.normalize(cmdparse.parse_args(['.', '-w', wrapper]))
+    parser = HeaderTagParser(opts)
+    atx_regex = re.compile(r"^#+ .+(?P<tag>" + opts.wrapper_regex +
+                           r")\s*$", re.UNICODE)
+    setext_regex = re.compile(r"(?P<tag>" + opts.wrapper_regex + r")\s*$",
+                              re.UNICODE)
+
+    print("%-22s %8s %12s %12s %12s %12s" % (
+        "line", "length", "ATX parser", "ATX regex", "Setext parser",
+        "Setext regex"))
+    for length in LENGTHS:
+        for name, line in make_lines(opts, length):
+            times = [best_time(parser.find_atx_tag, line),
+                     best_time(atx_regex.match, line),
+                     best_time(parser.find_tag, line),
+                     best_time(setext_regex.search, line)]
+            print("%-22s %8d" % (name, len(line)) +
+                  "".join(" %10.3fms" % (t * 1000) for t in times))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark for finding the regions of Markdown files that AnchorHub ignores.
+
+Generates a corpus of Markdown files with prose, headers, links, lists,
+fenced and indented code blocks, and HTML comments, then times collecting
+and writing it with the GitHub strategies, once with the
+MarkdownRegionScanner that the GitHub Collector and Writer use, and once
+with only the fenced code block switch they used before it. Both
+configurations read the same files with the same strategies, so the
+difference is the cost of classifying each line.
+
+The scanner recognizes more kinds of regions than the switch, so it does
+more work on the lines that may start one (see
+anchorhub.builtin.github.regions). Runs of plain text lines only have
+their first character checked, and cost about the same as with the
+switch, but each list item costs around twice as much. The scanner also
+ignores indented code blocks and HTML comments, which the switch hands to
+the strategies, so writing can come out faster with the scanner for
+reasons that have nothing to do with the cost of classifying lines. Which
+configuration is faster depends on the mix of lines in the corpus.
+
+Usage (from the repository root, with anchorhub installed):
+    python benchmarks/bench_regions.py [files] [lines per file]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import anchorhub.builtin.github.converter as converter
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+import anchorhub.settings.default_settings as ds
+from anchorhub.builtin.github.cstrategies import \
+    MarkdownATXCollectorStrategy, MarkdownSetextCollectorStrategy
+from anchorhub.builtin.github.regions import MarkdownRegionScanner
+from anchorhub.builtin.github.switches import make_code_block_switch
+from anchorhub.builtin.github.wstrategies import MarkdownATXWriterStrategy, \
+    MarkdownSetextWriterStrategy, MarkdownInlineLinkWriterStrategy, \
+    MarkdownReferenceLinkWriterStrategy
+from anchorhub.collector import Collector
+from anchorhub.lib.linkresolver import LinkResolver
+from anchorhub.writer import Writer
+
+# Blocks of Markdown that the corpus is made of, repeated in order
+BLOCKS = [
+    "# Section {n} {{#section-{n}}}\n\n",
+    "Some prose for section {n}, with plain words and no links at all.\n"
+    "It goes on for another line, and then a third one, before it\n"
+    "ends with a [link to the top](#section-0) and a full stop.\n\n",
+    "* A list item with a [link](#section-{n})\n"
+    "* Another list item\n"
+    "    * A nested item, which is not an indented code block\n\n",
+    "```python\n# A comment, not a header {{#not-a-tag}}\nx = {n}\n```\n\n",
+    "    indented code, with a [link](#section-{n}) that isn't changed\n\n",
+    "<!-- A comment with a [link](#section-{n})\n"
+    "that runs onto a second line -->\n\n",
+    "1. A numbered item\n2. Another numbered item\n\n",
+]
+
+
+def make_corpus(directory, files, lines):
+    """
+    Writes the Markdown files of the corpus.
+
+    :param directory: string path of the directory to write the files to
+    :param files: Number of files to write
+    :param lines: Approximate number of lines in each file
+    :return: List of the string file paths written
+    """
+    paths = []
+    for f in range(files):
+        path = os.path.join(directory, 'file%d.md' % f)
+        count = 0
+        n = 0
+        with open(path, 'w') as out:
+            while count < lines:
+                block = BLOCKS[n % len(BLOCKS)].format(n=n)
+                out.write(block)
+                count += block.count('\n')
+                n += 1
+        paths.append(path)
+    return paths
+
+
+def make_pipelines(opts, use_scanner):
+    """
+    Creates a Collector and a Writer with the same strategies as
+    make_github_markdown_collector() and make_github_markdown_writer().
+
+    :param opts: Normalized AnchorHub options
+    :param use_scanner: If True, find ignored regions with the
+        MarkdownRegionScanner. Otherwise, use the code block switch
+    :return: A (Collector, Writer) tuple
+    """
+    cstrategies = [MarkdownATXCollectorStrategy(opts),
+                   MarkdownSetextCollectorStrategy(opts)]
+    resolver = LinkResolver()
+    wstrategies = [MarkdownATXWriterStrategy(opts, 'ATX headers'),
+                   MarkdownSetextWriterStrategy(opts, 'Setext headers'),
+                   MarkdownInlineLinkWriterStrategy(opts, 'inline links',
+                                                    resolver=resolver),
+                   MarkdownReferenceLinkWriterStrategy(opts,
+                                                       'reference links',
+                                                       resolver=resolver)]
+    convert = converter.SlugConverter(ds.SLUG_CACHE_SIZE)
+    if use_scanner:
+        return (Collector(convert, cstrategies,
+                          scanner=MarkdownRegionScanner()),
+                Writer(wstrategies, scanner=MarkdownRegionScanner()))
+    return (Collector(convert, cstrategies,
+                      switches=[make_code_block_switch()]),
+            Writer(wstrategies, switches=[make_code_block_switch()]))
+
+
+def best_times(opts, paths, use_scanner, repeat=10):
+    """
+    :return: The shortest (collect, write) times, in seconds, over repeat
+        runs
+    """
+    best_collect = best_write = None
+    for i in range(repeat):
+        collector, writer = make_pipelines(opts, use_scanner)
+        start = time.time()
+        anchors, duplicates = collector.collect(paths)
+        collect = time.time() - start
+        start = time.time()
+        writer.write(paths, anchors, opts)
+        write = time.time() - start
+        if best_collect is None:
+            best_collect, best_write = collect, write
+        else:
+            best_collect = min(best_collect, collect)
+            best_write = min(best_write, write)
+    return best_collect, best_write
+
+
+def main(argv=None):
+    """
+    Runs the benchmark and prints the collect and write times.
+
+    :param argv: list of string command line arguments
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    files = int(argv[0]) if argv else 20
+    lines = int(argv[1]) if len(argv) > 1 else 5000
+    directory = tempfile.mkdtemp()
+    try:
+        input_dir = os.path.join(directory, 'input')
+        os.mkdir(input_dir)
+        paths = make_corpus(input_dir, files, lines)
+        opts = normalize_opts.normalize(cmdparse.parse_args(
+            [input_dir, os.path.join(directory, 'output')]))
+        print("%d files, %d lines each" % (files, lines))
+        print("%-22s %10s %10s" % ("regions", "collect", "write"))
+        for name, use_scanner in [('code block switch', False),
+                                  ('MarkdownRegionScanner', True)]:
+            collect, write = best_times(opts, paths, use_scanner)
+            print("%-22s %9.3fs %9.3fs" % (name, collect, write))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
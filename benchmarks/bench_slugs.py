@@ -0,0 +1,65 @@
+"""
+Benchmark for anchor generation in files with many headers.
+
+Writes a Markdown file with 50,000 tagged headers (a mix of unique and
+repeated header text, like a generated API reference), then times how long
+the GitHub Collector takes to collect its tags and anchors.
+
+Usage (from the repository root, with anchorhub installed):
+    python benchmarks/bench_slugs.py [number_of_headers]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import anchorhub.cmdparse as cmdparse
+import anchorhub.normalization.normalize_opts as normalize_opts
+from anchorhub.builtin.github.collector import make_github_markdown_collector
+
+
+def write_headers(file_path, count):
+    """
+    Writes a Markdown file with count tagged ATX headers. Every fourth
+    header repeats one of a small set of header texts.
+
+    :param file_path: string file path to write to
+    :param count: number of headers to write
+    """
+    with open(file_path, 'w') as f:
+        for i in range(count):
+            if i % 4 == 0:
+                text = "Parameters " + str(i % 10)
+            else:
+                text = "Function number " + str(i)
+            f.write("## " + text + " {#tag" + str(i) + "}\n\n")
+
+
+def main(argv=None):
+    """
+    Runs the benchmark and prints the elapsed time.
+
+    :param argv: list of string command line arguments
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 50000
+    d = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(d, 'headers.md')
+        write_headers(file_path, count)
+        opts = normalize_opts.normalize(cmdparse.parse_args([d]))
+        collector = make_github_markdown_collector(opts)
+
+        start = time.time()
+        anchors, duplicates = collector.collect([file_path])
+        elapsed = time.time() - start
+
+        assert len(set(anchors[file_path].values())) == count
+        print("Collected " + str(count) + " headers in " +
+              "%.3f" % elapsed + " seconds")
+    finally:
+        shutil.rmtree(d)
+
+if __name__ == '__main__':
+    main()